@@ -70,6 +70,7 @@ import studioqt
 
 from studiolibrary.cmds import *
 from studiolibrary.database import Database
+from studiolibrary.filequeue import FileQueue
 from studiolibrary.libraryitem import LibraryItem
 from studiolibrary.librarywidget import LibraryWidget
 from studiolibrary.main import main
@@ -78,3 +79,6 @@ import studiolibrary.folderitem
 
 # Wrapping the following functions for convenience
 app = studioqt.app
+
+# Cache the downscaled thumbnails on the local disc
+studioqt.thumbnailCache().setDirname(localPath("ThumbnailCache"))
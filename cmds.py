@@ -13,7 +13,9 @@
 
 import os
 import json
+import errno
 import ctypes
+import fnmatch
 import shutil
 import urllib2
 import locale
@@ -39,21 +41,33 @@ __all__ = [
     "readJson",
     "updateJson",
     "replaceJson",
+    "replaceJsonMultiple",
     "relPath",
     "absPath",
     "realPath",
     "normPath",
     "copyPath",
+    "linkFile",
+    "reflinkFile",
+    "hardlinkFile",
+    "isHardlinkPath",
     "movePath",
     "movePaths",
+    "moveStats",
+    "resetMoveStats",
+    "recordMoveStrategy",
+    "isSameDevice",
     "listPaths",
     "splitPath",
     "localPath",
     "removePath",
+    "pathSize",
     "renamePath",
     "formatPath",
     "walkup",
     "generateUniquePath",
+    "createUniquePath",
+    "uniqueName",
     "MovePathError",
     "RenamePathError",
     "timeAgo",
@@ -72,6 +86,11 @@ __all__ = [
     "ANALYTICS_ID",
     "ANALYTICS_ENABLED",
     "SHOW_IN_FOLDER_CMD",
+    "MOVE_RENAME",
+    "MOVE_COPY",
+    "LINK_REFLINK",
+    "LINK_HARDLINK",
+    "LINK_COPY",
 ]
 
 
@@ -86,6 +105,47 @@ ANALYTICS_ID = "UA-50172384-1"
 ANALYTICS_ENABLED = True
 SHOW_IN_FOLDER_CMD = None
 
+# The strategies used for moving a path
+MOVE_RENAME = "rename"
+MOVE_COPY = "copy"
+
+# The strategies used for duplicating a file
+LINK_REFLINK = "reflink"
+LINK_HARDLINK = "hardlink"
+LINK_COPY = "copy"
+
+# A hardlinked file shares its contents with the original, so a file that
+# is later written in place changes both items. Hardlinks are disabled by
+# default and only files matching the patterns are hardlinked when enabled.
+# These are not exported by studiolibrary, so set them on studiolibrary.cmds.
+HARDLINK_ENABLED = False
+
+# The files that are never written in place after an item has been saved.
+# Only these files are hardlinked when reflinks are not supported.
+HARDLINK_PATTERNS = ["sequence/*", "*.pack"]
+
+# The ioctl request for cloning a file on Linux (Btrfs, XFS)
+_FICLONE = 0x40049409
+
+# The errors that mean the file system cannot clone files at all
+_REFLINK_UNSUPPORTED_ERRORS = (
+    errno.ENOTSUP,
+    errno.EOPNOTSUPP,
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOTTY,
+    errno.ENOSYS,
+)
+
+# If reflinks are supported for each (src device, dst device) pair
+_reflinkDevices = {}
+
+_moveStats = {
+    "renameCount": 0,
+    "copyCount": 0,
+    "fallbackCount": 0,
+}
+
 
 class PathError(IOError):
     """
@@ -387,22 +447,333 @@ def formatPath(formatString, path="", **kwargs):
     return unicode(formatString).format(**kwargs)
 
 
-def copyPath(src, dst):
+def copyPath(src, dst, link=False):
     """
     Make a copy of the given src path to the given destination path.
 
+    When link is True the files are duplicated with linkFile. Unchanged
+    files then share their data with the source when the file system
+    supports it, which makes duplicating large items nearly instant.
+
     :type src: str
     :type dst: str
+    :type link: bool
     :rtype: str
     """
+    if not link:
+        if os.path.isfile(src):
+            shutil.copy(src, dst)
+        else:
+            shutil.copytree(src, dst)
+
+        return dst
+
     if os.path.isfile(src):
-        shutil.copy(src, dst)
-    else:
-        shutil.copytree(src, dst)
+        linkFile(src, dst, hardlink=isHardlinkPath(os.path.basename(src)))
+        return dst
+
+    strategies = collections.Counter()
+
+    for root, dirs, files in os.walk(src):
+        relRoot = os.path.relpath(root, src)
+        dstRoot = os.path.normpath(os.path.join(dst, relRoot))
+
+        os.makedirs(dstRoot)
+
+        for filename in files:
+            relPath_ = normPath(os.path.join(relRoot, filename))
+
+            strategy = linkFile(
+                os.path.join(root, filename),
+                os.path.join(dstRoot, filename),
+                hardlink=isHardlinkPath(relPath_),
+            )
+
+            strategies[strategy] += 1
+
+    logger.debug(u'Duplicated {0} => {1} {2}'.format(
+        src,
+        dst,
+        dict(strategies)
+    ))
 
     return dst
 
 
+def isHardlinkPath(path):
+    """
+    Return True if the given relative path can be hardlinked.
+
+    Always returns False when studiolibrary.cmds.HARDLINK_ENABLED is False.
+
+    :type path: str
+    :rtype: bool
+    """
+    if not HARDLINK_ENABLED:
+        return False
+
+    path = normPath(path)
+
+    if path.startswith("./"):
+        path = path[2:]
+
+    for pattern in HARDLINK_PATTERNS:
+        if fnmatch.fnmatch(path, pattern):
+            return True
+
+    return False
+
+
+def reflinkFile(src, dst):
+    """
+    Create a copy-on-write clone of the given src file.
+
+    An OSError or IOError is raised if the file system does not support
+    cloning files.
+
+    :type src: str
+    :type dst: str
+    :rtype: None
+    """
+    if isMac():
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+
+        if not hasattr(libc, "clonefile"):
+            raise OSError(errno.ENOTSUP, "clonefile is not supported", src)
+
+        if isinstance(src, unicode):
+            src = src.encode("utf-8")
+
+        if isinstance(dst, unicode):
+            dst = dst.encode("utf-8")
+
+        if libc.clonefile(src, dst, 0):
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), src)
+
+        return
+
+    if not isLinux():
+        raise OSError(errno.ENOTSUP, "Reflinks are not supported", src)
+
+    import fcntl
+
+    with open(src, "rb") as srcFile:
+        try:
+            with open(dst, "wb") as dstFile:
+                fcntl.ioctl(dstFile.fileno(), _FICLONE, srcFile.fileno())
+        except (IOError, OSError):
+            if os.path.exists(dst):
+                os.remove(dst)
+            raise
+
+    shutil.copystat(src, dst)
+
+
+def hardlinkFile(src, dst):
+    """
+    Create a hardlink to the given src file.
+
+    An OSError is raised if the file system does not support hardlinks.
+
+    :type src: str
+    :type dst: str
+    :rtype: None
+    """
+    if isWindows():
+        createHardLink = ctypes.windll.kernel32.CreateHardLinkW
+
+        if not createHardLink(unicode(dst), unicode(src), None):
+            raise OSError(errno.EPERM, "Cannot create hardlink", src)
+    else:
+        os.link(src, dst)
+
+
+def _linkDevices(src, dst):
+    """
+    Return the devices of the given src file and the dst file's folder.
+
+    :type src: str
+    :type dst: str
+    :rtype: (int, int) or None
+    """
+    try:
+        return os.stat(src).st_dev, os.stat(os.path.dirname(dst)).st_dev
+    except OSError:
+        return None
+
+
+def linkFile(src, dst, hardlink=False):
+    """
+    Duplicate the given src file and return the strategy that was used.
+
+    The file is cloned with a copy-on-write reflink when supported. When
+    hardlink is True it is hardlinked instead. A plain copy is used if
+    neither is supported.
+
+    Reflinks are only tried once for each pair of devices that does not
+    support them. This avoids creating and removing a file for every
+    copied file on network drives.
+
+    An empty placeholder at the destination, such as the file created by
+    createUniquePath, is replaced as clonefile and hardlinks cannot write
+    over an existing file.
+
+    :type src: str
+    :type dst: str
+    :type hardlink: bool
+    :rtype: str
+    """
+    if os.path.isfile(dst) and not os.path.getsize(dst):
+        os.remove(dst)
+
+    devices = _linkDevices(src, dst)
+
+    if _reflinkDevices.get(devices, True):
+        try:
+            reflinkFile(src, dst)
+            _reflinkDevices[devices] = True
+            return LINK_REFLINK
+        except (IOError, OSError), e:
+            logger.debug(u'Cannot reflink {0}: {1}'.format(src, e))
+
+            unsupported = e.errno in _REFLINK_UNSUPPORTED_ERRORS
+
+            if devices and unsupported:
+                _reflinkDevices[devices] = False
+
+    if hardlink:
+        try:
+            hardlinkFile(src, dst)
+            return LINK_HARDLINK
+        except (IOError, OSError, AttributeError), e:
+            logger.debug(u'Cannot hardlink {0}: {1}'.format(src, e))
+
+    shutil.copy2(src, dst)
+
+    return LINK_COPY
+
+
+def isSameDevice(src, dst):
+    """
+    Return True if the given paths are on the same device.
+
+    The destination does not need to exist. Its closest existing parent
+    is used instead.
+
+    :type src: str
+    :type dst: str
+    :rtype: bool
+    """
+    while dst and not os.path.exists(dst):
+        dirname = os.path.dirname(dst)
+
+        if dirname == dst:
+            return False
+
+        dst = dirname
+
+    if isWindows():
+        # The st_dev value is always zero on Windows
+        srcDrive = os.path.splitdrive(os.path.abspath(src))[0]
+        dstDrive = os.path.splitdrive(os.path.abspath(dst))[0]
+        return srcDrive.lower() == dstDrive.lower()
+
+    try:
+        return os.stat(src).st_dev == os.stat(dst).st_dev
+    except OSError:
+        return False
+
+
+def moveStats():
+    """
+    Return how many paths have been moved with each strategy.
+
+    The fallback count is the number of renames that failed because the
+    paths were on different devices and were copied instead.
+
+    :rtype: dict
+    """
+    return dict(_moveStats)
+
+
+def resetMoveStats():
+    """
+    Reset the move strategy counters.
+
+    :rtype: None
+    """
+    for key in _moveStats:
+        _moveStats[key] = 0
+
+
+def recordMoveStrategy(src, dst, strategy, fallback=False):
+    """
+    Record the strategy that was used for moving the given path.
+
+    :type src: str
+    :type dst: str
+    :type strategy: str
+    :type fallback: bool
+    :rtype: None
+    """
+    if strategy == MOVE_RENAME:
+        _moveStats["renameCount"] += 1
+        logger.debug(u'Moved by rename: {0} => {1}'.format(src, dst))
+    else:
+        _moveStats["copyCount"] += 1
+        logger.info(u'Moved by copy: {0} => {1}'.format(src, dst))
+
+    if fallback:
+        _moveStats["fallbackCount"] += 1
+        logger.warning(u'Cannot rename {0}, it was copied'.format(src))
+
+
+def _movePath(src, dst, sameDevice):
+    """
+    Move the given source path and return the path and the strategy used.
+
+    Paths on the same device are always renamed. A copy is only used if
+    the paths are on different devices. A rename that fails for any other
+    reason, such as a locked file, raises a MovePathError.
+
+    :type src: str
+    :type dst: str
+    :type sameDevice: bool
+    :raises: MovePathError
+    :rtype: (str, str)
+    """
+    fallback = False
+
+    # Move into an existing directory the same way as shutil.move
+    if os.path.isdir(dst):
+        dst = normPath(os.path.join(dst, os.path.basename(src)))
+
+        if os.path.exists(dst):
+            msg = u'Cannot save over an existing path: "{0}"'
+            raise MovePathError(msg.format(dst))
+
+    if sameDevice:
+        try:
+            os.rename(src, dst)
+            recordMoveStrategy(src, dst, MOVE_RENAME)
+            return dst, MOVE_RENAME
+        except OSError, e:
+            if e.errno != errno.EXDEV:
+                msg = u'Cannot move the path "{0}": {1}'
+                raise MovePathError(msg.format(src, e))
+
+            logger.debug(u'Cannot rename {0}: {1}'.format(src, e))
+            fallback = True
+
+    shutil.move(src, dst)
+    recordMoveStrategy(src, dst, MOVE_COPY, fallback=fallback)
+
+    return dst, MOVE_COPY
+
+
 def movePath(src, dst):
     """
     Move the given source path to the given destination path.
@@ -421,7 +792,8 @@ def movePath(src, dst):
         dst = u'{0}/{1}{2}'.format(dst, name, extension)
         dst = generateUniquePath(dst)
 
-    shutil.move(src, dst)
+    dst, strategy = _movePath(src, dst, isSameDevice(src, dst))
+
     return dst
 
 
@@ -429,20 +801,36 @@ def movePaths(srcPaths, dst):
     """
     Move the given src paths to the given dst path.
 
+    The device is only checked once for all the paths in the same
+    directory.
+
     :type srcPaths: list[str]
     :type dst: str
+    :rtype: list[(str, str, str)]
     """
     if not os.path.exists(dst):
         os.makedirs(dst)
 
+    results = []
+    sameDevices = {}
+
     for src in srcPaths or []:
         basename = os.path.basename(src)
 
         dst_ = os.path.join(dst, basename)
         dst_ = normPath(dst_)
 
+        dirname = os.path.dirname(src)
+
+        if dirname not in sameDevices:
+            sameDevices[dirname] = isSameDevice(src, dst)
+
         logger.info(u'Moving Content: {0} => {1}'.format(src, dst_))
-        shutil.move(src, dst_)
+        dst_, strategy = _movePath(src, dst_, sameDevices[dirname])
+
+        results.append((src, dst_, strategy))
+
+    return results
 
 
 def removePath(path):
@@ -458,6 +846,28 @@ def removePath(path):
         shutil.rmtree(path)
 
 
+def pathSize(path):
+    """
+    Return the number of bytes used by the given file or directory.
+
+    :type path: str
+    :rtype: int
+    """
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+
+    size = 0
+
+    for root, dirs, files in os.walk(path):
+        for filename in files:
+            try:
+                size += os.path.getsize(os.path.join(root, filename))
+            except OSError:
+                pass
+
+    return size
+
+
 def renamePath(src, dst, extension=None, force=False):
     """
     Rename the given source path to the given destination path.
@@ -656,11 +1066,28 @@ def replaceJson(path, old, new, count=-1):
     :type count: int
     :rtype: dict
     """
-    old = old.encode("unicode_escape")
-    new = new.encode("unicode_escape")
+    return replaceJsonMultiple(path, [(old, new)], count)
+
+
+def replaceJsonMultiple(path, replacements, count=-1):
+    """
+    Replace the old values with the new values in the given json file.
+
+    The file is only read and written once for all the replacements.
 
+    :type path: str
+    :type replacements: list[(str, str)]
+    :type count: int
+    :rtype: dict
+    """
     data = read(path) or "{}"
-    data = data.replace(old, new, count)
+
+    for old, new in replacements:
+        old = old.encode("unicode_escape")
+        new = new.encode("unicode_escape")
+
+        data = data.replace(old, new, count)
+
     data = json.loads(data)
 
     saveJson(path, data)
@@ -811,10 +1238,52 @@ def listPaths(path):
         yield value
 
 
-def generateUniquePath(path, attempts=1000):
+def uniqueName(name, extension, names, attempts=1000, ignoreCase=False):
+    """
+    Return the first numbered file name that is not in the given names.
+
+    Example:
+        names = ["file.text", "file (2).text", "file (4).text"]
+        print uniqueName("file", ".text", names)
+        # file (3).text
+
+    :type name: str
+    :type extension: str
+    :type names: list[str]
+    :type attempts: int
+    :type ignoreCase: bool
+    :rtype: str
+    """
+    if ignoreCase:
+        names = set(n.lower() for n in names)
+    else:
+        names = set(names)
+
+    # We start at two so that the first unique name is "name (2)"
+    for number in range(2, attempts):
+        filename = u'{name} ({number}){extension}'.format(
+            name=name,
+            number=number,
+            extension=extension
+        )
+
+        key = filename.lower() if ignoreCase else filename
+
+        if key not in names:
+            return filename
+
+    msg = u'Cannot generate unique name for {name}{extension}'
+    msg = msg.format(name=name, extension=extension)
+    raise ValueError(msg)
+
+
+def generateUniquePath(path, attempts=1000, exclude=None):
     """
     Generate a unique path on disc.
 
+    The directory is only listed once when the path already exists. The
+    paths in exclude are also treated as existing paths.
+
     Example:
         # If the following files exist then the next unique path will be 3.
         # C:/tmp/file.text
@@ -825,28 +1294,65 @@ def generateUniquePath(path, attempts=1000):
 
     :type path:  str
     :type attempts: int
+    :type exclude: list[str] or None
     :rtype: str
     """
-    attempt = 1  # We start at one so that the first unique name is actually 2.
+    exclude = [normPath(p) for p in exclude or []]
+
+    if not os.path.exists(path) and normPath(path) not in exclude:
+        return path
+
     dirname, name, extension = splitPath(path)
-    path_ = u'{dirname}/{name} ({number}){extension}'
 
-    while os.path.exists(path):
-        attempt += 1
+    names = []
 
-        path = path_.format(
-            name=name,
-            number=attempt,
-            dirname=dirname,
-            extension=extension
-        )
+    for path_ in exclude:
+        if os.path.dirname(path_) == dirname:
+            names.append(os.path.basename(path_))
 
-        if attempt >= attempts:
-            msg = u'Cannot generate unique name for path {path}'
-            msg = msg.format(path=path)
-            raise ValueError(msg)
+    if os.path.isdir(dirname):
+        names.extend(os.listdir(dirname))
 
-    return path
+    ignoreCase = isWindows() or isMac()
+    filename = uniqueName(name, extension, names, attempts, ignoreCase)
+
+    return u'{dirname}/{filename}'.format(dirname=dirname, filename=filename)
+
+
+def createUniquePath(path, directory=False, attempts=1000, exclude=None):
+    """
+    Generate a unique path and create it on disc.
+
+    The path is created with an atomic create so that two processes can
+    never be given the same path. An empty file is created unless
+    directory is True.
+
+    :type path: str
+    :type directory: bool
+    :type attempts: int
+    :type exclude: list[str] or None
+    :rtype: str
+    """
+    exclude = list(exclude or [])
+
+    while True:
+        path_ = generateUniquePath(path, attempts, exclude=exclude)
+
+        try:
+            if directory:
+                os.mkdir(path_)
+            else:
+                flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY
+                os.close(os.open(path_, flags))
+
+            return path_
+
+        except OSError, e:
+            if e.errno != errno.EEXIST:
+                raise
+
+            # The path was created by another process since it was listed
+            exclude.append(path_)
 
 
 def walkup(path, match=None, depth=3, sep="/"):
@@ -1152,8 +1658,32 @@ def testRelativePaths():
     assert result == path, msg
 
 
+def testUniqueName():
+    """
+    Test the uniqueName command.
+
+    :rtype: None
+    """
+    names = ["mario.ma", "mario (2).ma", "mario (4).ma", "luigi (3).ma"]
+
+    result = uniqueName("mario", ".ma", names)
+    expected = u"mario (3).ma"
+
+    msg = "Data does not match {} {}".format(expected, result)
+    assert expected == result, msg
+
+    names = ["Mario (2).ma"]
+
+    result = uniqueName("mario", ".ma", names, ignoreCase=True)
+    expected = u"mario (3).ma"
+
+    msg = "Data does not match {} {}".format(expected, result)
+    assert expected == result, msg
+
+
 if __name__ == "__main__":
     testUpdate()
     testSplitPath()
     testFormatPath()
     testRelativePaths()
+    testUniqueName()
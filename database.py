@@ -10,6 +10,7 @@
 # License along with this library. If not, see <http://www.gnu.org/licenses/>.
 
 import os
+import time
 import logging
 
 import studiolibrary
@@ -29,6 +30,10 @@ class Database(QtCore.QObject):
     ENABLE_WATCHER = False
     DEFAULT_WATCHER_REPEAT_RATE = 1  # in seconds
 
+    # The keys used for recording the trashed paths
+    TRASHED_KEY = "Trashed"
+    TRASH_SIZE_KEY = "Trash Size"
+
     databaseChanged = QtCore.Signal()
 
     def __init__(self, path, *args):
@@ -232,6 +237,21 @@ class Database(QtCore.QObject):
         """
         return studiolibrary.replaceJson(self.path(), old, new, count)
 
+    def replaceMultiple(self, replacements, count=-1):
+        """
+        Replace the old values with the new values in the database.
+
+        :type replacements: list[(str, str)]
+        :type count: int
+
+        :rtype: dict
+        """
+        return studiolibrary.replaceJsonMultiple(
+            self.path(),
+            replacements,
+            count
+        )
+
     def updateMultiple(self, keys, data):
         """
         Update the given keys with the given data.
@@ -295,8 +315,91 @@ class Database(QtCore.QObject):
         :type data: dict or None
         :rtype: None 
         """
+        self.addPaths([path], data)
+
+    def addPaths(self, paths, data=None):
+        """
+        Add the given paths and data to the database.
+
+        :type paths: list[str]
+        :type data: dict or None
+        :rtype: None
+        """
         data = data or {}
-        self.updateMultiple([path], data)
+        self.updateMultiple(paths, data)
+
+    def trashPaths(self, paths):
+        """
+        Mark the given paths as trashed in the database.
+
+        :type paths: list[str]
+        :rtype: None
+        """
+        self.updateMultiple(paths, {self.TRASHED_KEY: time.time()})
+
+    def untrashPaths(self, paths):
+        """
+        Remove the trashed mark for the given paths.
+
+        :type paths: list[str]
+        :rtype: None
+        """
+        data = self.read()
+
+        for key in self.normPaths(paths):
+            if key in data:
+                data[key].pop(self.TRASHED_KEY, None)
+                data[key].pop(self.TRASH_SIZE_KEY, None)
+
+        self.save(data)
+
+    def setTrashSizes(self, sizes):
+        """
+        Set the number of bytes used by the given trashed paths.
+
+        Paths that are no longer in the database are ignored.
+
+        :type sizes: dict
+        :rtype: None
+        """
+        data = self.read()
+
+        for path, size in sizes.items():
+            key = self.normPath(path)
+
+            if key in data:
+                data[key][self.TRASH_SIZE_KEY] = size
+
+        self.save(data)
+
+    def trashedPaths(self, data=None):
+        """
+        Return the trashed paths and their data from the database.
+
+        :type data: dict or None
+        :rtype: dict
+        """
+        if data is None:
+            data = self.read()
+
+        results = {}
+
+        for path, value in data.items():
+            if isinstance(value, dict) and value.get(self.TRASHED_KEY):
+                results[path] = value
+
+        return results
+
+    def isTrashed(self, path, data):
+        """
+        Return True if the given path has been marked as trashed.
+
+        :type path: str
+        :type data: dict
+        :rtype: bool
+        """
+        value = data.get(self.normPath(path))
+        return isinstance(value, dict) and bool(value.get(self.TRASHED_KEY))
 
     def removePath(self, path):
         """
@@ -315,24 +418,37 @@ class Database(QtCore.QObject):
         :type dst: str
         :rtype: None
         """
-        src = self.normPath(src)
-        dst = self.normPath(dst)
+        self.renamePaths([(src, dst)])
+
+    def renamePaths(self, paths):
+        """
+        Rename the given source paths in the database to the dst paths.
+
+        The database is only read and written once for all the paths.
+
+        :type paths: list[(str, str)]
+        :rtype: None
+        """
+        replacements = []
+
+        for src, dst in paths:
+            src = self.normPath(src)
+            dst = self.normPath(dst)
 
-        src1 = '"' + src + '"'
-        dst2 = '"' + dst + '"'
+            # Replace paths that match exactly the given src and dst strings
+            replacements.append(('"' + src + '"', '"' + dst + '"'))
 
-        # Replace paths that match exactly the given src and dst strings
-        self.replace(src1, dst2)
+            src2 = '"' + src
+            dst2 = '"' + dst
 
-        src2 = '"' + src
-        dst2 = '"' + dst
+            # Add a slash as a suffix for better directory matching
+            if not src2.endswith("/"):
+                src2 += "/"
 
-        # Add a slash as a suffix for better directory matching
-        if not src2.endswith("/"):
-            src2 += "/"
+            if not dst2.endswith("/"):
+                dst2 += "/"
 
-        if not dst2.endswith("/"):
-            dst2 += "/"
+            # Replace all paths that start with the src path with the dst path
+            replacements.append((src2, dst2))
 
-        # Replace all paths that start with the src path with the dst path
-        self.replace(src2, dst2)
+        self.replaceMultiple(replacements)
@@ -0,0 +1,776 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import errno
+import shutil
+import logging
+import threading
+
+from studioqt import QtCore
+
+import studiolibrary
+
+
+__all__ = [
+    "FileQueue",
+]
+
+logger = logging.getLogger(__name__)
+
+
+class FileQueueThread(QtCore.QThread):
+    """
+    A worker thread that runs the tasks taken from the queue.
+    """
+
+    progressed = QtCore.Signal()
+
+    def __init__(self, queue, *args):
+        QtCore.QThread.__init__(self, *args)
+
+        self._queue = queue
+
+    def run(self):
+        """
+        The starting point for the thread.
+
+        :rtype: None
+        """
+        while True:
+            task = self._queue.takeTask()
+
+            if task is None:
+                break
+
+            try:
+                self._queue.runTask(task, self.progressed.emit)
+            except Exception, e:
+                logger.exception(e)
+                self._queue.setError(e)
+                break
+
+
+class FileQueue(QtCore.QObject):
+    """
+    Copy, move, remove and measure paths in a bounded pool of threads.
+
+    The files of all the queued paths are copied in parallel. A move on
+    the same device is renamed before the queue starts and is only copied
+    when the paths turn out to be on different devices. A rename that
+    fails for any other reason, such as a locked file, stops the queue
+    with a MovePathError. The source of a copied move is removed after
+    all the files have been copied.
+
+    When the queue is cancelled or a file fails to copy, all the files
+    and folders that were created are removed and the renamed paths are
+    renamed back. Removed paths cannot be restored.
+
+    Example:
+        def finished(jobs):
+            for operation, src, dst in jobs:
+                print operation, src, dst
+
+        queue = studiolibrary.FileQueue()
+        queue.add("/tmp/src/pose.pose", "/tmp/dst/pose.pose")
+        queue.finished.connect(finished)
+        queue.start()
+    """
+
+    COPY = "copy"
+    MOVE = "move"
+    REMOVE = "remove"
+    MEASURE = "measure"
+
+    # The tasks used for duplicating a file with studiolibrary.linkFile
+    LINK = "link"
+    HARDLINK = "hardlink"
+
+    CHUNK_SIZE = 1024 * 1024
+    DEFAULT_THREAD_COUNT = 4
+
+    progressChanged = QtCore.Signal(object)
+
+    finished = QtCore.Signal(object)
+    cancelled = QtCore.Signal()
+    failed = QtCore.Signal(object)
+
+    def __init__(self, threadCount=None, parent=None):
+        QtCore.QObject.__init__(self, parent)
+
+        self._jobs = []
+        self._uniqueJobs = set()
+        self._linkJobs = {}
+        self._tasks = []
+        self._threads = []
+        self._threadCount = threadCount or self.DEFAULT_THREAD_COUNT
+        self._activeThreadCount = 0
+
+        self._dirs = []
+        self._files = []
+        self._renamed = []
+        self._removeSources = []
+        self._strategies = {}
+        self._fallbacks = set()
+
+        self._sizes = {}
+
+        self._linkEnabled = False
+        self._linkStats = {}
+
+        self._error = None
+        self._running = False
+        self._cancelled = False
+
+        self._byteCount = 0
+        self._fileCount = 0
+        self._totalByteCount = 0
+        self._totalFileCount = 0
+
+        self._lock = threading.Lock()
+
+    def threadCount(self):
+        """
+        Return the maximum number of threads used for copying.
+
+        :rtype: int
+        """
+        return self._threadCount
+
+    def jobs(self):
+        """
+        Return the operation, source and destination for all the paths.
+
+        :rtype: list[(str, str, str)]
+        """
+        return list(self._jobs)
+
+    def strategies(self):
+        """
+        Return the strategy that was used for each moved source path.
+
+        :rtype: dict
+        """
+        return dict(self._strategies)
+
+    def sizes(self):
+        """
+        Return the number of bytes for each copied, removed or measured path.
+
+        The size of a copied path is keyed by the destination path and
+        the size of a removed or measured path by the source path.
+
+        :rtype: dict
+        """
+        with self._lock:
+            return dict(self._sizes)
+
+    def isLinkEnabled(self):
+        """
+        Return True if the copied files are duplicated with links.
+
+        :rtype: bool
+        """
+        return self._linkEnabled
+
+    def setLinkEnabled(self, value):
+        """
+        Set if the copied files should be duplicated with links.
+
+        The files are cloned with reflinks when the file system supports
+        it. When studiolibrary.cmds.HARDLINK_ENABLED is True the files
+        that match studiolibrary.cmds.HARDLINK_PATTERNS are hardlinked when
+        reflinks are not supported. All other files are copied.
+
+        This is the default for the paths that are added without a link
+        flag.
+
+        :type value: bool
+        :rtype: None
+        """
+        self._linkEnabled = value
+
+    def linkStats(self):
+        """
+        Return the number of files duplicated with each link strategy.
+
+        :rtype: dict
+        """
+        with self._lock:
+            return dict(self._linkStats)
+
+    def isRunning(self):
+        """
+        Return True if the queue has started and has not finished.
+
+        :rtype: bool
+        """
+        return self._running
+
+    def isCancelled(self):
+        """
+        Return True if the queue has been cancelled.
+
+        :rtype: bool
+        """
+        return self._cancelled
+
+    def error(self):
+        """
+        Return the error that stopped the queue.
+
+        :rtype: Exception or None
+        """
+        return self._error
+
+    def setError(self, error):
+        """
+        Stop the queue with the given error.
+
+        This method is called from the worker threads.
+
+        :type error: Exception
+        :rtype: None
+        """
+        with self._lock:
+            if self._error is None:
+                self._error = error
+
+    def progress(self):
+        """
+        Return the number of bytes and files that have been copied.
+
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                "byteCount": self._byteCount,
+                "fileCount": self._fileCount,
+                "totalByteCount": self._totalByteCount,
+                "totalFileCount": self._totalFileCount,
+                "jobCount": len(self._jobs),
+            }
+
+    def add(self, src, dst=None, operation=COPY, unique=False, link=None):
+        """
+        Add the given source path to be copied or moved to the destination.
+
+        The destination is ignored when the source path is removed or
+        measured.
+
+        When unique is True a numbered destination path is used if the
+        destination already exists. The unique path is generated when the
+        queue starts and the destination of a copy is created with an
+        atomic create.
+
+        When link is None the files are duplicated with links if link
+        mode has been enabled for the queue.
+
+        :type src: str
+        :type dst: str
+        :type operation: str
+        :type unique: bool
+        :type link: bool or None
+        :rtype: None
+        """
+        if self._running:
+            raise RuntimeError("Cannot add paths to a running queue.")
+
+        src = studiolibrary.normPath(src)
+
+        if not os.path.exists(src):
+            msg = u'The system cannot find the specified path: "{0}"'
+            raise studiolibrary.MovePathError(msg.format(src))
+
+        if operation in (self.REMOVE, self.MEASURE):
+            self._jobs.append((operation, src, None))
+            return
+
+        dst = studiolibrary.normPath(dst)
+
+        if unique:
+            self._uniqueJobs.add(len(self._jobs))
+        else:
+            queued = [job[2] for job in self._jobs]
+
+            if os.path.exists(dst) or dst in queued:
+                msg = u'Cannot save over an existing path: "{0}"'
+                raise studiolibrary.MovePathError(msg.format(dst))
+
+        if link is not None:
+            self._linkJobs[len(self._jobs)] = link
+
+        self._jobs.append((operation, src, dst))
+
+    def start(self):
+        """
+        Start copying and moving the queued paths.
+
+        The finished signal is emitted before this method returns if
+        there are no files to copy.
+
+        :rtype: None
+        """
+        if self._running:
+            return
+
+        self._running = True
+
+        try:
+            sameDevices = {}
+
+            for index, (operation, src, dst) in enumerate(self._jobs):
+
+                if index in self._uniqueJobs:
+                    dst = self.uniquePath(src, dst, operation)
+                    self._jobs[index] = (operation, src, dst)
+
+                if operation in (self.REMOVE, self.MEASURE):
+                    self._tasks.append((operation, src, None))
+                    self._totalFileCount += 1
+                    continue
+
+                link = self._linkJobs.get(index, self._linkEnabled)
+
+                if operation != self.MOVE:
+                    self.addTasks(src, dst, link)
+                    continue
+
+                # Only check the device once for the paths in a directory
+                dirname = os.path.dirname(src)
+
+                if dirname not in sameDevices:
+                    sameDevices[dirname] = studiolibrary.isSameDevice(
+                        src,
+                        dst
+                    )
+
+                sameDevice = sameDevices[dirname]
+
+                if sameDevice and self.renamePath(src, dst):
+                    self._strategies[src] = studiolibrary.MOVE_RENAME
+                    continue
+
+                if sameDevice:
+                    self._fallbacks.add(src)
+
+                self.addTasks(src, dst, link)
+
+                self._removeSources.append(src)
+                self._strategies[src] = studiolibrary.MOVE_COPY
+
+        except Exception:
+            self._running = False
+            self.rollback()
+            raise
+
+        # The tasks are taken from the end of the list
+        self._tasks.reverse()
+
+        self.progressChanged.emit(self.progress())
+
+        if not self._tasks:
+            self._finish()
+            return
+
+        threadCount = min(self._threadCount, len(self._tasks))
+        self._activeThreadCount = threadCount
+
+        for i in range(threadCount):
+            thread = FileQueueThread(self)
+            thread.progressed.connect(self._progressed)
+            thread.finished.connect(self._threadFinished)
+            thread.start()
+            self._threads.append(thread)
+
+    def cancel(self):
+        """
+        Cancel the queue and undo the changes that have been made.
+
+        The cancelled signal is emitted when the threads have stopped.
+
+        :rtype: None
+        """
+        with self._lock:
+            self._cancelled = True
+
+    def stop(self):
+        """
+        Cancel the queue and wait for the threads to finish.
+
+        :rtype: None
+        """
+        self.cancel()
+        self.wait()
+
+    def wait(self):
+        """
+        Block until the threads have finished and finish the queue.
+
+        The finished, cancelled or failed signal is emitted before this
+        method returns.
+
+        :rtype: None
+        """
+        for thread in self._threads:
+            thread.wait()
+
+        self._finish()
+
+    def makeDirs(self, path):
+        """
+        Create the given directory and the parents that do not exist.
+
+        :type path: str
+        :raises: studiolibrary.MovePathError
+        :rtype: None
+        """
+        if os.path.isdir(path):
+            return
+
+        parent = os.path.dirname(path)
+
+        # The root of a missing drive or an empty path has no parent
+        if not path or parent == path:
+            msg = u'Cannot create the directory: "{0}"'
+            raise studiolibrary.MovePathError(msg.format(path))
+
+        self.makeDirs(parent)
+
+        os.mkdir(path)
+        self._dirs.append(path)
+
+    def uniquePath(self, src, dst, operation):
+        """
+        Return a unique destination path that is not used by another job.
+
+        The destination of a copy is created so that it cannot be taken
+        by another process before the files are copied.
+
+        :type src: str
+        :type dst: str
+        :type operation: str
+        :rtype: str
+        """
+        exclude = [job[2] for job in self._jobs]
+        exclude.remove(dst)
+
+        if operation != self.COPY:
+            dst = studiolibrary.generateUniquePath(dst, exclude=exclude)
+            return studiolibrary.normPath(dst)
+
+        self.makeDirs(os.path.dirname(dst))
+
+        directory = os.path.isdir(src)
+
+        dst = studiolibrary.createUniquePath(
+            dst,
+            directory=directory,
+            exclude=exclude,
+        )
+
+        if directory:
+            self._dirs.append(dst)
+        else:
+            self._files.append(dst)
+
+        return studiolibrary.normPath(dst)
+
+    def renamePath(self, src, dst):
+        """
+        Rename the given source path and return True if it succeeded.
+
+        False is returned when the paths are on different devices and the
+        source must be copied instead.
+
+        :type src: str
+        :type dst: str
+        :raises: studiolibrary.MovePathError
+        :rtype: bool
+        """
+        self.makeDirs(os.path.dirname(dst))
+
+        try:
+            os.rename(src, dst)
+        except OSError, e:
+            if e.errno != errno.EXDEV:
+                msg = u'Cannot move the path "{0}": {1}'
+                raise studiolibrary.MovePathError(msg.format(src, e))
+
+            logger.debug(u'Cannot rename {0}: {1}'.format(src, e))
+            return False
+
+        self._renamed.append((src, dst))
+
+        return True
+
+    def addTasks(self, src, dst, link=False):
+        """
+        Add the files of the given source path to be copied.
+
+        The destination directories are created before the files are
+        copied by the threads.
+
+        :type src: str
+        :type dst: str
+        :type link: bool
+        :rtype: None
+        """
+        self._sizes[dst] = 0
+
+        if os.path.isfile(src):
+            self.makeDirs(os.path.dirname(dst))
+            self.addTask(src, dst, dst, link)
+            return
+
+        for root, dirs, files in os.walk(src):
+            dstRoot = dst + studiolibrary.normPath(root)[len(src):]
+            self.makeDirs(dstRoot)
+
+            for filename in files:
+                path = os.path.join(root, filename)
+                self.addTask(path, os.path.join(dstRoot, filename), dst, link)
+
+    def addTask(self, src, dst, key, link=False):
+        """
+        Add the given source file to be copied.
+
+        The size of the file is added to the size of the given key.
+
+        :type src: str
+        :type dst: str
+        :type key: str
+        :type link: bool
+        :rtype: None
+        """
+        size = os.path.getsize(src)
+
+        action = self.COPY
+
+        if link:
+            action = self.LINK
+
+            relPath = dst[len(key) + 1:] or os.path.basename(dst)
+
+            if studiolibrary.isHardlinkPath(relPath):
+                action = self.HARDLINK
+
+        self._tasks.append((action, src, dst))
+        self._sizes[key] += size
+        self._totalByteCount += size
+        self._totalFileCount += 1
+
+    def takeTask(self):
+        """
+        Take the next file to be copied.
+
+        This method is called from the worker threads. None is returned
+        when there are no files left or the queue has been stopped.
+
+        :rtype: (str, str, str) or None
+        """
+        with self._lock:
+            if self._cancelled or self._error or not self._tasks:
+                return None
+
+            return self._tasks.pop()
+
+    def runTask(self, task, callback=None):
+        """
+        Run the given task that was taken from the queue.
+
+        This method is called from the worker threads.
+
+        :type task: (str, str, str)
+        :type callback: func or None
+        :rtype: None
+        """
+        action, src, dst = task
+
+        if action == self.COPY:
+            self.copyFile(src, dst, callback)
+
+        elif action in (self.LINK, self.HARDLINK):
+            self.linkFile(src, dst, action == self.HARDLINK, callback)
+
+        else:
+            size = studiolibrary.pathSize(src)
+
+            if action == self.REMOVE:
+                studiolibrary.removePath(src)
+
+            with self._lock:
+                self._sizes[src] = size
+                self._fileCount += 1
+
+            if callback:
+                callback()
+
+    def copyFile(self, src, dst, callback=None):
+        """
+        Copy the given source file in chunks to the destination file.
+
+        This method is called from the worker threads. The callback is
+        called after every chunk that has been written.
+
+        :type src: str
+        :type dst: str
+        :type callback: func or None
+        :rtype: None
+        """
+        with self._lock:
+            self._files.append(dst)
+
+        with open(src, "rb") as srcFile, open(dst, "wb") as dstFile:
+            while not self._cancelled:
+                data = srcFile.read(self.CHUNK_SIZE)
+
+                if not data:
+                    break
+
+                dstFile.write(data)
+
+                with self._lock:
+                    self._byteCount += len(data)
+
+                if callback:
+                    callback()
+
+        if self._cancelled:
+            return
+
+        shutil.copystat(src, dst)
+
+        with self._lock:
+            self._fileCount += 1
+
+        if callback:
+            callback()
+
+    def linkFile(self, src, dst, hardlink=False, callback=None):
+        """
+        Duplicate the given source file with studiolibrary.linkFile.
+
+        This method is called from the worker threads.
+
+        :type src: str
+        :type dst: str
+        :type hardlink: bool
+        :type callback: func or None
+        :rtype: None
+        """
+        with self._lock:
+            self._files.append(dst)
+
+        strategy = studiolibrary.linkFile(src, dst, hardlink=hardlink)
+        size = os.path.getsize(dst)
+
+        with self._lock:
+            self._byteCount += size
+            self._fileCount += 1
+            self._linkStats[strategy] = self._linkStats.get(strategy, 0) + 1
+
+        if callback:
+            callback()
+
+    def rollback(self):
+        """
+        Remove the created files and folders and undo the renamed paths.
+
+        :rtype: None
+        """
+        for src, dst in reversed(self._renamed):
+            try:
+                os.rename(dst, src)
+            except OSError, e:
+                logger.exception(e)
+
+        for path in reversed(self._files):
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except OSError, e:
+                logger.exception(e)
+
+        for path in reversed(self._dirs):
+            try:
+                os.rmdir(path)
+            except OSError, e:
+                logger.warning(u'Cannot remove {0}: {1}'.format(path, e))
+
+        self._files = []
+        self._dirs = []
+        self._renamed = []
+
+    def _progressed(self):
+        """
+        Triggered on the GUI thread when a chunk has been copied.
+
+        :rtype: None
+        """
+        if self._running:
+            self.progressChanged.emit(self.progress())
+
+    def _threadFinished(self):
+        """
+        Triggered on the GUI thread when a worker thread has finished.
+
+        :rtype: None
+        """
+        self._activeThreadCount -= 1
+
+        if self._activeThreadCount <= 0:
+            self._finish()
+
+    def _finish(self):
+        """
+        Finish the queue and emit the finished, cancelled or failed signal.
+
+        :rtype: None
+        """
+        if not self._running:
+            return
+
+        self._running = False
+        self._threads = []
+
+        if self._error is None and not self._cancelled:
+            for operation, src, dst in self._jobs:
+                strategy = self._strategies.get(src)
+
+                if strategy:
+                    fallback = src in self._fallbacks
+                    studiolibrary.recordMoveStrategy(
+                        src,
+                        dst,
+                        strategy,
+                        fallback=fallback,
+                    )
+
+            # The copies are kept if a source cannot be removed
+            for src in self._removeSources:
+                try:
+                    studiolibrary.removePath(src)
+                except Exception, e:
+                    logger.exception(e)
+
+        if self._error is not None:
+            self.rollback()
+            self.failed.emit(self._error)
+
+        elif self._cancelled:
+            self.rollback()
+            self.cancelled.emit()
+
+        else:
+            self.finished.emit(self.jobs())
@@ -51,6 +51,9 @@ class LibraryItem(studioqt.CombinedWidgetItem):
     EnableDelete = False
     EnableNestedItems = False
 
+    # Duplicate the files with reflinks or hardlinks when supported
+    EnableLinkedCopy = True
+
     Extensions = []
 
     MenuName = ""
@@ -419,6 +422,10 @@ class LibraryItem(studioqt.CombinedWidgetItem):
 
         self.updateData()
 
+        combinedWidget = self.combinedWidget()
+        if combinedWidget:
+            combinedWidget.updateItemId(self)
+
     def updateData(self):
         """
         Update the data when the item is created or when a new path is set.
@@ -441,7 +448,7 @@ class LibraryItem(studioqt.CombinedWidgetItem):
             timeAgo = studiolibrary.timeAgo(modified)
 
             self.setText("Modified", timeAgo)
-            self.setSortText("Modified", str(modified))
+            self.setModifiedTime(modified)
 
         self.setText("Type", extension)
 
@@ -505,32 +512,66 @@ class LibraryItem(studioqt.CombinedWidgetItem):
         """
         Make a copy/duplicate the current item to the given destination.
 
+        The library widget copies items in a background file queue and
+        does not call this method. Override pathCopied to change what
+        happens after an item has been copied.
+
         :type dst: str
         :rtype: None
         """
         src = self.path()
 
-        path = studiolibrary.copyPath(src, dst)
-        self.setPath(path)
+        path = studiolibrary.copyPath(src, dst, link=self.EnableLinkedCopy)
+        self.pathCopied(src, path)
 
         if self.database():
             self.database().addPath(path)
 
+    def pathCopied(self, src, dst):
+        """
+        Triggered when the files of the item have been copied to dst.
+
+        This is called by copy and when a file queue has copied the
+        item. The database is updated by the caller.
+
+        :type src: str
+        :type dst: str
+        :rtype: None
+        """
+        self.setPath(dst)
+
     def move(self, dst):
         """
         Move the current item to the given destination.
 
+        The library widget moves items in a background file queue and
+        does not call this method. Override pathMoved to change what
+        happens after an item has been moved.
+
         :type dst: str
         :rtype: None
         """
         src = self.path()
 
         dst = studiolibrary.movePath(src, dst)
-        self.setPath(dst)
+        self.pathMoved(src, dst)
 
         if self.database():
             self.database().renamePath(src, dst)
 
+    def pathMoved(self, src, dst):
+        """
+        Triggered when the files of the item have been moved to dst.
+
+        This is called by move and when a file queue has moved the
+        item. The database is updated by the caller.
+
+        :type src: str
+        :type dst: str
+        :rtype: None
+        """
+        self.setPath(dst)
+
     def rename(self, dst, extension=None, force=True):
         """
         Rename the current path to given destination path.
@@ -637,7 +678,13 @@ class LibraryItem(studioqt.CombinedWidgetItem):
 
         if button == QtWidgets.QMessageBox.Yes:
             item = studiolibrary.LibraryItem(path)
-            self.libraryWidget().moveItemsToTrash([item])
+
+            # The existing item must be out of the way before saving
+            try:
+                self.libraryWidget().moveItemsToTrash([item], wait=True)
+            except Exception as error:
+                raise ItemSaveError(unicode(error))
+
             self.setPath(path)
         else:
             raise ItemSaveError("You cannot save over an existing item.")
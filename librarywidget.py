@@ -88,6 +88,12 @@ class LibraryWidget(QtWidgets.QWidget):
     RECURSIVE_SEARCH_DEPTH = 3
     RECURSIVE_SEARCH_ENABLED = False
 
+    # Only list the child folders when a folder is first expanded
+    LAZY_FOLDERS_ENABLED = True
+
+    # Duplicate the copied files with reflinks or hardlinks when supported
+    LINKED_COPY_ENABLED = True
+
     # Still in development
     DPI_ENABLED = False
     DPI_MIN_VALUE = 80
@@ -188,6 +194,9 @@ class LibraryWidget(QtWidgets.QWidget):
         self._previewWidget = None
         self._currentItem = None
         self._refreshEnabled = False
+        self._fileQueues = []
+        self._trashStats = None
+        self._trashingPaths = set()
 
         self._superusers = None
         self._lockRegExp = None
@@ -222,6 +231,9 @@ class LibraryWidget(QtWidgets.QWidget):
         self._menuBarWidget = studioqt.MenuBarWidget()
         self._foldersWidget = studioqt.TreeWidget(self)
 
+        if self.LAZY_FOLDERS_ENABLED:
+            self._foldersWidget.setChildPathsFunc(self.folderChildPaths)
+
         self.setMinimumWidth(5)
         self.setMinimumHeight(5)
 
@@ -634,7 +646,7 @@ class LibraryWidget(QtWidgets.QWidget):
         :rtype: None 
         """
         rootPath = self.path()
-        trashPath = self.trashPath()
+        foldersWidget = self.foldersWidget()
 
         paths = {
             rootPath: {
@@ -645,20 +657,63 @@ class LibraryWidget(QtWidgets.QWidget):
             }
         }
 
-        for item in studiolibrary.findItems(rootPath):
+        if foldersWidget.isLazy():
+            # Only list the folders that have already been expanded
+            loadedPaths = set(foldersWidget.loadedPaths())
+            loadedPaths.add(rootPath)
+
+            for path in sorted(loadedPaths):
+                if path == rootPath or path in paths:
+                    paths.update(self.folderChildPaths(path))
+                else:
+                    loadedPaths.discard(path)
+
+            foldersWidget.updatePaths(paths, root=rootPath)
+            foldersWidget.setLoadedPaths(loadedPaths)
+        else:
+            for item in studiolibrary.findItems(rootPath):
+                paths.update(self.folderSettings(item))
+
+            foldersWidget.updatePaths(paths, root=rootPath)
+
+    def folderChildPaths(self, path):
+        """
+        Return the child folders and their settings for the given path.
+
+        This is used for lazy loading the folders widget.
+
+        :type path: str
+        :rtype: dict
+        """
+        paths = {}
+
+        for item in studiolibrary.findItems(path, depth=1):
+            paths.update(self.folderSettings(item))
+
+        return paths
 
-            if self.isValidInFolderView(item):
+    def folderSettings(self, item):
+        """
+        Return the folder path and settings for the given item.
 
-                path = item.path()
-                paths[path] = {}
+        An empty dict is returned if the item is not shown in the folder view.
 
-                if trashPath == path:
-                    iconPath = studioqt.resource.get("icons", "delete.png")
-                    paths[path] = {
-                        "iconPath": iconPath
-                    }
+        :type item: studiolibrary.LibraryItem
+        :rtype: dict
+        """
+        if not self.isValidInFolderView(item):
+            return {}
 
-        self.foldersWidget().setPaths(paths, root=rootPath)
+        path = item.path()
+        settings = {}
+
+        if self.trashPath() == path:
+            iconPath = studioqt.resource.get("icons", "delete.png")
+            settings = {
+                "iconPath": iconPath
+            }
+
+        return {path: settings}
 
     def isValidInFolderView(self, item):
         """
@@ -818,6 +873,8 @@ class LibraryWidget(QtWidgets.QWidget):
 
         data = self.readItemData()
 
+        items = [item for item in items if not self.isItemTrashed(item)]
+
         self.itemsWidget().setItems(items, data=data, sortEnabled=True)
 
         self.refreshSearch()
@@ -982,6 +1039,11 @@ class LibraryWidget(QtWidgets.QWidget):
 
         action = menu.addAction("Refresh")
         action.triggered.connect(self.refresh)
+
+        if self.fileQueues():
+            action = menu.addAction("Cancel Copy/Move")
+            action.triggered.connect(self.cancelFileQueues)
+
         menu.addSeparator()
 
         if self.DPI_ENABLED:
@@ -1042,6 +1104,19 @@ class LibraryWidget(QtWidgets.QWidget):
             action.triggered[bool].connect(self.setTrashFolderVisible)
             menu.addAction(action)
 
+            stats = self.trashStats()
+
+            text = u"Empty Trash ({0} items, {1:.1f} MB)"
+            text = text.format(
+                stats["itemCount"],
+                stats["byteCount"] / (1024.0 * 1024.0),
+            )
+
+            action = QtWidgets.QAction(text, menu)
+            action.setEnabled(self.trashFolderExists())
+            action.triggered.connect(self.showEmptyTrashDialog)
+            menu.addAction(action)
+
         menu.addSeparator()
 
         action = QtWidgets.QAction("Enable Recursive Search", menu)
@@ -1197,6 +1272,7 @@ class LibraryWidget(QtWidgets.QWidget):
         :rtype: None
         """
         self._database = database
+        self.invalidateTrashStats()
 
     def refreshItemData(self):
         """
@@ -1337,38 +1413,187 @@ class LibraryWidget(QtWidgets.QWidget):
     def moveItems(self, items, dst, copy=False, force=False):
         """
         Move the given items to the destination folder path.
-        
+
+        The files are copied in the background and the database is
+        updated once all the items have been moved.
+
         :type items: list[studiolibrary.LibraryItem]
         :type dst: str
         :type copy: bool
         :type force: bool
-        :rtype: None 
+        :rtype: studiolibrary.FileQueue
         """
         self.itemsWidget().clearSelection()
 
-        movedItems = []
+        if copy:
+            operation = studiolibrary.FileQueue.COPY
+        else:
+            operation = studiolibrary.FileQueue.MOVE
+
+        queue = studiolibrary.FileQueue(parent=self)
 
         try:
             for item in items:
 
                 path = dst + "/" + item.name()
+                link = self.LINKED_COPY_ENABLED and item.EnableLinkedCopy
 
-                if force:
-                    path = studiolibrary.generateUniquePath(path)
+                queue.add(
+                    item.path(),
+                    path,
+                    operation,
+                    unique=force,
+                    link=link,
+                )
 
-                if copy:
-                    item.copy(path)
-                else:
-                    item.rename(path)
+            queue.progressChanged.connect(self._fileQueueProgressChanged)
+            queue.finished.connect(partial(self._itemsMoved, queue, items))
+            queue.cancelled.connect(partial(self._fileQueueCancelled, queue))
+            queue.failed.connect(partial(self._fileQueueFailed, queue))
+
+            self._fileQueues.append(queue)
+
+            queue.start()
+
+        except Exception as error:
+            self.removeFileQueue(queue)
+            self.showExceptionDialog("Move Error", error)
+            raise
+
+        return queue
+
+    def fileQueues(self):
+        """
+        Return the file queues that are copying or moving items.
+
+        :rtype: list[studiolibrary.FileQueue]
+        """
+        return [queue for queue in self._fileQueues if queue.isRunning()]
+
+    def removeFileQueue(self, queue):
+        """
+        Remove the given file queue when it has finished.
+
+        :type queue: studiolibrary.FileQueue
+        :rtype: None
+        """
+        if queue in self._fileQueues:
+            self._fileQueues.remove(queue)
+
+        queue.deleteLater()
+
+    def cancelFileQueues(self):
+        """
+        Cancel all the file queues that are copying or moving items.
 
-                movedItems.append(item)
+        :rtype: None
+        """
+        for queue in self.fileQueues():
+            queue.cancel()
+
+    def _fileQueueProgressChanged(self, progress):
+        """
+        Triggered when the files of a file queue have been copied.
+
+        :type progress: dict
+        :rtype: None
+        """
+        totalFileCount = progress["totalFileCount"]
+
+        if not totalFileCount:
+            return
+
+        text = u"Copying {0} of {1} files ({2:.1f} of {3:.1f} MB)"
+        text = text.format(
+            progress["fileCount"],
+            totalFileCount,
+            progress["byteCount"] / (1024.0 * 1024.0),
+            progress["totalByteCount"] / (1024.0 * 1024.0),
+        )
+
+        self.showInfoMessage(text)
+
+    def _itemsMoved(self, queue, items, jobs):
+        """
+        Triggered when all the items of a file queue have been moved.
+
+        The pathCopied or pathMoved method is called for each item and
+        the database is updated once for all the items.
+
+        :type queue: studiolibrary.FileQueue
+        :type items: list[studiolibrary.LibraryItem]
+        :type jobs: list[(str, str, str)]
+        :rtype: None
+        """
+        self.removeFileQueue(queue)
+
+        copied = []
+        renamed = []
+
+        for item, (operation, src, dst) in zip(items, jobs):
+            if operation == queue.COPY:
+                item.pathCopied(src, dst)
+                copied.append(dst)
+            else:
+                item.pathMoved(src, dst)
+                renamed.append((src, dst))
+
+        # Items that are moved out of the trash are no longer trashed
+        untrashed = []
+
+        for src, dst in renamed:
+            if self.isPathInTrash(src) and not self.isPathInTrash(dst):
+                untrashed.append(dst)
+
+        try:
+            database = self.database()
+
+            if database and copied:
+                database.addPaths(copied)
+
+            if database and renamed:
+                database.renamePaths(renamed)
+
+            if database and untrashed:
+                database.untrashPaths(untrashed)
+                self.invalidateTrashStats()
 
         except Exception as error:
             self.showExceptionDialog("Move Error", error)
             raise
         finally:
             self.refresh()
-            self.selectItems(movedItems)
+            self.selectItems(items)
+
+        strategies = queue.strategies().values()
+        copyCount = strategies.count(studiolibrary.MOVE_COPY)
+
+        if copyCount:
+            text = u"{0} of {1} item/s were moved by copying the files"
+            self.showWarningMessage(text.format(copyCount, len(strategies)))
+
+    def _fileQueueCancelled(self, queue):
+        """
+        Triggered when a file queue has been cancelled.
+
+        :type queue: studiolibrary.FileQueue
+        :rtype: None
+        """
+        self.removeFileQueue(queue)
+        self.showWarningMessage("The copy/move has been cancelled.")
+        self.refresh()
+
+    def _fileQueueFailed(self, queue, error):
+        """
+        Triggered when a file queue has failed.
+
+        :type queue: studiolibrary.FileQueue
+        :type error: Exception
+        :rtype: None
+        """
+        self.removeFileQueue(queue)
+        self.refresh()
+        self.showExceptionDialog("Move Error", error)
 
     # -----------------------------------------------------------------------
     # Support for search
@@ -1564,10 +1789,10 @@ class LibraryWidget(QtWidgets.QWidget):
         self._itemsVisibleCount = len(items)
         self._itemsHiddenCount = len(hiddenItems)
 
-        self.itemsWidget().setItemsHidden(items, False)
-
         if hideOthers:
-            self.itemsWidget().setItemsHidden(hiddenItems, True)
+            changed = self.itemsWidget().setVisibleItems(items)
+        else:
+            changed = self.itemsWidget().setItemsHidden(items, False)
 
         item = self.itemsWidget().selectedItem()
 
@@ -1577,7 +1802,7 @@ class LibraryWidget(QtWidgets.QWidget):
         if item:
             self.itemsWidget().scrollToItem(item)
 
-        self.itemsWidget().treeWidget().refreshGroupBy()
+        self.itemsWidget().treeWidget().refreshGroupBy(changed)
 
     # -----------------------------------------------------------------------
     # Support for custom preview widgets
@@ -2200,15 +2425,307 @@ class LibraryWidget(QtWidgets.QWidget):
 
         return False
 
-    def moveItemsToTrash(self, items):
+    def isItemTrashed(self, item):
+        """
+        Return True if the given item is being moved to the trash.
+
+        :type item: studiolibrary.LibraryItem
+        :rtype: bool
+        """
+        return item.path() in self._trashingPaths
+
+    def moveItemsToTrash(self, items, wait=False):
         """
         Move the given items to trash path.
 
+        The items are removed from the view straight away and the files
+        are moved in the background. The moved paths are marked as trashed
+        in the database once all the files have been moved, so the
+        database never has trashed paths outside of the trash folder.
+
+        When wait is True this method blocks until the items have been
+        moved and raises a MovePathError if they could not be moved.
+
         :items items: list[studiolibrary.LibraryItem]
-        :rtype: None
+        :type wait: bool
+        :raises: studiolibrary.MovePathError
+        :rtype: studiolibrary.FileQueue
         """
         self.createTrashFolder()
-        self.moveItems(items, dst=self.trashPath(), force=True)
+
+        paths = [item.path() for item in items]
+
+        queue = studiolibrary.FileQueue(parent=self)
+
+        try:
+            for item in items:
+                path = self.trashPath() + "/" + item.name()
+                queue.add(item.path(), path, queue.MOVE, unique=True)
+
+            self._trashingPaths.update(paths)
+
+            loadedItems = [i for i in self.items() if i.path() in paths]
+            self.itemsWidget().removeItems(loadedItems)
+
+            queue.finished.connect(partial(self._itemsTrashed, queue, items))
+
+            # The caller reports the error when waiting for the queue
+            if not wait:
+                queue.cancelled.connect(
+                    partial(self._trashFailed, queue, paths)
+                )
+                queue.failed.connect(partial(self._trashFailed, queue, paths))
+
+            self._fileQueues.append(queue)
+
+            queue.start()
+
+        except Exception as error:
+            self.removeFileQueue(queue)
+            self._trashFailed(queue, paths, None if wait else error)
+            raise
+
+        if wait:
+            queue.wait()
+
+            if queue.error() is not None or queue.isCancelled():
+                self._trashFailed(queue, paths)
+
+                msg = u'Cannot move the items to the trash: {0}'
+                error = queue.error() or "The move was cancelled"
+                raise studiolibrary.MovePathError(msg.format(error))
+
+        return queue
+
+    def _itemsTrashed(self, queue, items, jobs):
+        """
+        Triggered when the given items have been moved to the trash.
+
+        :type queue: studiolibrary.FileQueue
+        :type items: list[studiolibrary.LibraryItem]
+        :type jobs: list[(str, str, str)]
+        :rtype: None
+        """
+        self.removeFileQueue(queue)
+
+        renamed = []
+
+        for item, (operation, src, dst) in zip(items, jobs):
+            self._trashingPaths.discard(src)
+            item.pathMoved(src, dst)
+            renamed.append((src, dst))
+
+        trashedPaths = [dst for src, dst in renamed]
+        database = self.database()
+
+        if database:
+            database.renamePaths(renamed)
+            database.trashPaths(trashedPaths)
+            self.measureTrashedPaths(trashedPaths)
+
+        self.invalidateTrashStats()
+
+        if self.isTrashFolderVisible():
+            self.refreshFolders()
+
+        if self.isTrashSelected():
+            self.refreshItems()
+
+    def _trashFailed(self, queue, paths, error=None):
+        """
+        Triggered when the given paths could not be moved to the trash.
+
+        :type queue: studiolibrary.FileQueue
+        :type paths: list[str]
+        :type error: Exception or None
+        :rtype: None
+        """
+        self.removeFileQueue(queue)
+        self._trashingPaths.difference_update(paths)
+
+        self.refreshItems()
+
+        if error:
+            self.showExceptionDialog("Trash Error", error)
+
+    def measureTrashedPaths(self, paths):
+        """
+        Measure and record the size of the given trashed paths.
+
+        The paths are measured in the background so that the trash stats
+        never need to walk the trash folder.
+
+        :type paths: list[str]
+        :rtype: studiolibrary.FileQueue
+        """
+        queue = studiolibrary.FileQueue(parent=self)
+
+        for path in paths:
+            queue.add(path, operation=queue.MEASURE)
+
+        queue.finished.connect(partial(self._trashedPathsMeasured, queue))
+        queue.cancelled.connect(partial(self._trashedPathsMeasured, queue))
+        queue.failed.connect(partial(self._trashedPathsMeasured, queue))
+
+        self._fileQueues.append(queue)
+
+        queue.start()
+
+        return queue
+
+    def _trashedPathsMeasured(self, queue, *args):
+        """
+        Triggered when the size of the trashed paths have been measured.
+
+        :type queue: studiolibrary.FileQueue
+        :rtype: None
+        """
+        self.removeFileQueue(queue)
+
+        database = self.database()
+
+        if database:
+            database.setTrashSizes(queue.sizes())
+
+        self.invalidateTrashStats()
+
+    def trashStats(self):
+        """
+        Return the number of items and bytes in the trash.
+
+        The stats are read from the database without walking the trash
+        folder. Items trashed before the sizes were recorded count as
+        zero bytes. The stats are cached until items are trashed,
+        untrashed or purged.
+
+        :rtype: dict
+        """
+        if self._trashStats is None:
+            itemCount = 0
+            byteCount = 0
+
+            database = self.database()
+
+            if database:
+                trashedPaths = database.trashedPaths()
+
+                for path, data in trashedPaths.items():
+                    if self.isPathInTrash(path):
+                        itemCount += 1
+                        byteCount += data.get(database.TRASH_SIZE_KEY, 0)
+
+            self._trashStats = {
+                "itemCount": itemCount,
+                "byteCount": byteCount,
+            }
+
+        return dict(self._trashStats)
+
+    def invalidateTrashStats(self):
+        """
+        Clear the cached trash stats so they are read again when needed.
+
+        :rtype: None
+        """
+        self._trashStats = None
+
+    def purgeTrash(self, paths=None):
+        """
+        Delete the given trashed paths from disc in the background.
+
+        All the paths in the trash folder are deleted when no paths are
+        given. The database is updated once all the paths are deleted.
+
+        :type paths: list[str] or None
+        :rtype: studiolibrary.FileQueue or None
+        """
+        if paths is None:
+            if not self.trashFolderExists():
+                return None
+
+            paths = list(studiolibrary.listPaths(self.trashPath()))
+
+        paths = [path for path in paths if self.isPathInTrash(path)]
+
+        queue = studiolibrary.FileQueue(parent=self)
+
+        for path in paths:
+            queue.add(path, operation=queue.REMOVE)
+
+        queue.progressChanged.connect(self._trashPurgeProgressChanged)
+        queue.finished.connect(partial(self._trashPurged, queue))
+        queue.cancelled.connect(partial(self._trashPurged, queue))
+        queue.failed.connect(partial(self._trashPurgeFailed, queue))
+
+        self._fileQueues.append(queue)
+
+        queue.start()
+
+        return queue
+
+    def _trashPurged(self, queue, jobs=None):
+        """
+        Triggered when the trashed paths have been deleted from disc.
+
+        :type queue: studiolibrary.FileQueue
+        :type jobs: list[(str, str, str)] or None
+        :rtype: None
+        """
+        self.removeFileQueue(queue)
+
+        # A cancelled purge only removes the paths that were deleted
+        removed = queue.sizes().keys()
+
+        database = self.database()
+
+        if database and removed:
+            database.deleteMultiple(removed)
+
+        self.invalidateTrashStats()
+
+        if self.isTrashFolderVisible():
+            self.refreshFolders()
+
+        if self.isTrashSelected():
+            self.refreshItems()
+
+    def _trashPurgeProgressChanged(self, progress):
+        """
+        Triggered when a trashed path has been deleted from disc.
+
+        :type progress: dict
+        :rtype: None
+        """
+        text = u"Deleting {0} of {1} trashed items"
+        text = text.format(progress["fileCount"], progress["totalFileCount"])
+
+        self.showInfoMessage(text)
+
+    def _trashPurgeFailed(self, queue, error):
+        """
+        Triggered when a trashed path could not be deleted from disc.
+
+        :type queue: studiolibrary.FileQueue
+        :type error: Exception
+        :rtype: None
+        """
+        self._trashPurged(queue)
+        self.showExceptionDialog("Trash Error", error)
+
+    def showEmptyTrashDialog(self):
+        """
+        Show the "Empty trash" dialog.
+
+        :rtype: None
+        """
+        title = "Empty trash?"
+        text = "Are you sure you want to permanently delete all the " \
+               "items in the trash?"
+
+        result = self.showQuestionDialog(title, text)
+
+        if result == QtWidgets.QMessageBox.Yes:
+            self.purgeTrash()
 
     def showMoveItemsToTrashDialog(self, items=None):
         """
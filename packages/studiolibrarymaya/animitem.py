@@ -88,6 +88,10 @@ class ValidateAnimError(AnimItemError):
 
 class AnimItem(baseitem.BaseItem):
 
+    # Save the preview frames to a single "sequence.pack" file instead
+    # of a folder of images. Older versions can only play the folder.
+    PACK_IMAGE_SEQUENCE = False
+
     def __init__(self, *args, **kwargs):
         """
         Create a new instance of the anim item from the given path.
@@ -587,7 +591,12 @@ class AnimCreateWidget(basecreatewidget.BaseCreateWidget):
 
         sequencePath = self.sequencePath()
         if sequencePath:
-            contents = [os.path.dirname(sequencePath)]
+            sequenceDir = os.path.dirname(sequencePath)
+
+            if item.PACK_IMAGE_SEQUENCE:
+                contents = [studioqt.packImageSequence(sequenceDir)]
+            else:
+                contents = [sequenceDir]
 
         item.save(
             path=path,
@@ -19,14 +19,24 @@ from studioqt.menu import Menu
 from studioqt.theme import Theme, ThemesMenu
 from studioqt.color import Color
 from studioqt.pixmap import Pixmap
+from studioqt.pixmapcache import PixmapCache, pixmapCache
 from studioqt.resource import Resource, RESOURCE_DIRNAME
 from studioqt.stylesheet import StyleSheet
 
 from studioqt.decorators import showWaitCursor
 from studioqt.decorators import showArrowCursor
 
+from studioqt.thumbnailcache import ThumbnailCache
+from studioqt.thumbnailcache import thumbnailCache
+
+from studioqt.imageloader import ImageLoader
+from studioqt.imageloader import imageLoader
+
 from studioqt.imagesequence import ImageSequence
 from studioqt.imagesequence import ImageSequenceWidget
+from studioqt.imagesequence import PackedSequence
+from studioqt.imagesequence import packImageSequence
+from studioqt.imagesequence import imageSequenceExists
 
 from studioqt.widgets.messagebox import MessageBox, createMessageBox
 from studioqt.widgets.toastwidget import ToastWidget
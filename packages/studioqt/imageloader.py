@@ -0,0 +1,488 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import heapq
+import logging
+import itertools
+import threading
+
+from collections import OrderedDict
+
+from studioqt import QtGui
+from studioqt import QtCore
+from studioqt import QtWidgets
+
+from studioqt.thumbnailcache import thumbnailCache
+
+
+__all__ = [
+    "ImageLoader",
+    "imageLoader",
+    "readImage",
+    "readThumbnail",
+]
+
+logger = logging.getLogger(__name__)
+
+
+_imageLoader = None
+
+
+def imageLoader():
+    """
+    Return the image loader that is shared by all the widgets.
+
+    :rtype: ImageLoader
+    """
+    global _imageLoader
+
+    if not _imageLoader:
+        _imageLoader = ImageLoader()
+
+        app = QtWidgets.QApplication.instance()
+        if app:
+            app.aboutToQuit.connect(_imageLoader.stop)
+
+    return _imageLoader
+
+
+def readImage(path, size=None):
+    """
+    Read the image for the given path.
+
+    When a size is given the image is decoded at the largest size that
+    fits within size x size, so that large images are never decoded at
+    full resolution.
+
+    This function is called from the loader threads so it must not
+    create any QPixmap objects. A null image is returned if the path
+    does not exist or cannot be read.
+
+    :type path: str
+    :type size: int or None
+    :rtype: QtGui.QImage
+    """
+    image = QtGui.QImage()
+
+    if not path or not os.path.exists(path):
+        return image
+
+    reader = QtGui.QImageReader(path)
+
+    if size:
+        imageSize = reader.size()
+
+        if imageSize.width() > size or imageSize.height() > size:
+            imageSize.scale(size, size, QtCore.Qt.KeepAspectRatio)
+            reader.setScaledSize(imageSize)
+
+    reader.read(image)
+
+    return image
+
+
+def readThumbnail(path, mtime, size=None):
+    """
+    Read the thumbnail image for the given path at the given size.
+
+    The size is rounded up to the nearest size of the local thumbnail
+    cache, which is read first. On a miss the source image is decoded at
+    that size and written to the cache.
+
+    :type path: str
+    :type mtime: float or None
+    :type size: int or None
+    :rtype: QtGui.QImage
+    """
+    if not size:
+        return readImage(path)
+
+    cache = thumbnailCache()
+    size = cache.bucket(size)
+
+    image = cache.read(path, mtime, size)
+
+    if image.isNull():
+        image = readImage(path, size)
+        image = cache.write(path, mtime, size, image)
+
+    return image
+
+
+class ImageLoaderThread(QtCore.QThread):
+    """
+    A worker thread that reads the images requested from the loader.
+    """
+
+    loaded = QtCore.Signal(object, object)
+
+    def __init__(self, loader, *args):
+        QtCore.QThread.__init__(self, *args)
+
+        self._loader = loader
+
+    def run(self):
+        """
+        The starting point for the thread.
+
+        :rtype: None
+        """
+        while True:
+            request = self._loader.takeRequest()
+
+            if request is None:
+                break
+
+            key, path, size, reader = request
+
+            try:
+                if reader:
+                    image = reader(path)
+                else:
+                    mtime = os.path.getmtime(path)
+                    image = readThumbnail(path, mtime, size)
+            except (OSError, TypeError):
+                mtime = None
+                image = QtGui.QImage()
+            except Exception, e:
+                logger.exception(e)
+                mtime = None
+                image = QtGui.QImage()
+
+            if not reader:
+                self._loader.setMtime(path, mtime)
+
+            self.loaded.emit(key, image)
+
+
+class ImageLoader(QtCore.QObject):
+    """
+    Load images in a bounded pool of threads.
+
+    Requests are kept in a priority queue. Requests with a lower priority
+    value are loaded first and requests with the same priority are
+    loaded in the reverse order they were made, so that the items that
+    were painted last are loaded first. Each key has at most one entry
+    in the queue.
+
+    A key can be requested by several owners. Each owner keeps its own
+    callbacks and the request is only cancelled when no owners remain.
+
+    The results are delivered on the GUI thread as QImage objects.
+
+    Example:
+        def loaded(image):
+            print image.size()
+
+        loader = studioqt.imageLoader()
+        loader.request("/tmp/thumbnail.jpg", "/tmp/thumbnail.jpg", loaded)
+    """
+
+    DEFAULT_THREAD_COUNT = 4
+    MAX_MTIME_COUNT = 4096
+
+    loaded = QtCore.Signal(object, object)
+
+    def __init__(self, threadCount=None, parent=None):
+        QtCore.QObject.__init__(self, parent)
+
+        self._queue = []
+        self._threads = []
+        self._running = set()
+        self._mtimes = OrderedDict()
+        self._owners = {}
+        self._requests = {}
+        self._callbacks = {}
+        self._stopped = False
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._threadCount = threadCount or self.DEFAULT_THREAD_COUNT
+
+    def threadCount(self):
+        """
+        Return the maximum number of threads used for loading.
+
+        :rtype: int
+        """
+        return self._threadCount
+
+    def startThreads(self):
+        """
+        Start the loader threads if they are not already running.
+
+        :rtype: None
+        """
+        self._stopped = False
+
+        while len(self._threads) < self._threadCount:
+            thread = ImageLoaderThread(self)
+            thread.loaded.connect(self._imageLoaded)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """
+        Cancel all requests and wait for the loader threads to finish.
+
+        :rtype: None
+        """
+        with self._condition:
+            self._stopped = True
+            self._queue = []
+            self._owners = {}
+            self._requests = {}
+            self._callbacks = {}
+            self._condition.notify_all()
+
+        for thread in self._threads:
+            thread.wait()
+
+        self._threads = []
+
+    def request(
+            self,
+            key,
+            path,
+            callback=None,
+            priority=0,
+            owner=None,
+            size=None,
+            reader=None,
+    ):
+        """
+        Request the image for the given path to be loaded.
+
+        Requesting a key that is already queued updates its entry in
+        the queue and adds the owner and its callback. The callback is
+        called with the loaded QImage on the GUI thread.
+
+        When a size is given the image is read through the local
+        thumbnail cache and is downscaled to fit the cached size. A
+        reader can be given to read the image in a different way. It is
+        called with the path on a loader thread and must return a QImage.
+
+        :type key: object
+        :type path: str
+        :type callback: func or None
+        :type priority: int
+        :type owner: object or None
+        :type size: int or None
+        :type reader: func or None
+        :rtype: None
+        """
+        with self._condition:
+            owners = self._owners.setdefault(key, [])
+            if owner not in owners:
+                owners.append(owner)
+
+            if callback:
+                callbacks = self._callbacks.setdefault(key, [])
+                if (owner, callback) not in callbacks:
+                    callbacks.append((owner, callback))
+
+            if key in self._running:
+                return
+
+            request = self._requests.get(key)
+
+            if request:
+                entry = request[3]
+
+                if entry[0] != priority:
+                    entry[0] = priority
+                    entry[1] = -next(self._counter)
+                    heapq.heapify(self._queue)
+            else:
+                entry = [priority, -next(self._counter), key]
+                heapq.heappush(self._queue, entry)
+
+            self._requests[key] = (path, size, reader, entry)
+            self._condition.notify()
+
+        self.startThreads()
+
+    def takeRequest(self):
+        """
+        Take the next request from the queue.
+
+        This method is called from the loader threads and blocks until
+        a request is available. None is returned when the loader stops.
+
+        :rtype: (object, str, int, func) or None
+        """
+        with self._condition:
+            while True:
+                if self._stopped:
+                    return None
+
+                if self._queue:
+                    key = heapq.heappop(self._queue)[2]
+
+                    request = self._requests.pop(key)
+                    self._running.add(key)
+
+                    return key, request[0], request[1], request[2]
+
+                self._condition.wait()
+
+    def setMtime(self, path, mtime):
+        """
+        Set the modified time of the given path when it was last read.
+
+        Only the modified times of the most recently read paths are kept.
+
+        :type path: str
+        :type mtime: float or None
+        :rtype: None
+        """
+        with self._condition:
+            self._mtimes.pop(path, None)
+            self._mtimes[path] = mtime
+
+            if len(self._mtimes) > self.MAX_MTIME_COUNT:
+                self._mtimes.popitem(last=False)
+
+    def mtime(self, path):
+        """
+        Return the modified time of the given path when it was last read.
+
+        :type path: str
+        :rtype: float or None
+        """
+        with self._condition:
+            return self._mtimes.get(path)
+
+    def isPending(self, key, owner=None):
+        """
+        Return True if the given key is queued or currently loading.
+
+        When an owner is given True is only returned if the key has
+        been requested by that owner.
+
+        :type key: object
+        :type owner: object or None
+        :rtype: bool
+        """
+        with self._condition:
+            if owner is not None and owner not in self._owners.get(key, []):
+                return False
+
+            return key in self._requests or key in self._running
+
+    def cancel(self, key, owner=None):
+        """
+        Cancel the request for the given key.
+
+        When an owner is given only the callbacks of that owner are
+        removed and the request is cancelled when no owners remain.
+
+        The image for a request that is already loading is still read,
+        but the callbacks are not called.
+
+        :type key: object
+        :type owner: object or None
+        :rtype: None
+        """
+        with self._condition:
+            if owner is None or self._removeOwner(key, owner):
+                self._removeRequest(key)
+                self._queue = [r[3] for r in self._requests.values()]
+                heapq.heapify(self._queue)
+
+    def clear(self, owner=None):
+        """
+        Cancel all the queued requests for the given owner.
+
+        Requests that were also made by other owners stay in the queue.
+        All queued requests are cancelled when no owner is given.
+
+        :type owner: object or None
+        :rtype: None
+        """
+        with self._condition:
+            if owner is None:
+                keys = list(self._requests.keys())
+            else:
+                keys = []
+
+                for key, owners in self._owners.items():
+                    if owner in owners:
+                        keys.append(key)
+
+                keys = [k for k in keys if self._removeOwner(k, owner)]
+
+            for key in keys:
+                self._removeRequest(key)
+
+            self._queue = [r[3] for r in self._requests.values()]
+            heapq.heapify(self._queue)
+
+    def _removeOwner(self, key, owner):
+        """
+        Remove the owner and its callbacks from the given key.
+
+        This method must be called while holding the lock.
+
+        :type key: object
+        :type owner: object
+        :rtype: bool
+        :return: True if no owners remain for the key.
+        """
+        owners = self._owners.get(key, [])
+
+        if owner in owners:
+            owners.remove(owner)
+
+        callbacks = self._callbacks.get(key)
+
+        if callbacks:
+            callbacks[:] = [c for c in callbacks if c[0] is not owner]
+
+        return not owners
+
+    def _removeRequest(self, key):
+        """
+        Remove the queued request, owners and callbacks for the given key.
+
+        The queue is not updated. This method must be called while
+        holding the lock.
+
+        :type key: object
+        :rtype: None
+        """
+        self._requests.pop(key, None)
+        self._owners.pop(key, None)
+        self._callbacks.pop(key, None)
+
+    def _imageLoaded(self, key, image):
+        """
+        Triggered on the GUI thread when an image has been loaded.
+
+        :type key: object
+        :type image: QtGui.QImage
+        :rtype: None
+        """
+        with self._condition:
+            self._running.discard(key)
+            self._owners.pop(key, None)
+            callbacks = self._callbacks.pop(key, [])
+
+        for owner, callback in callbacks:
+            try:
+                callback(image)
+            except RuntimeError:
+                # The item has been deleted while the image was loading.
+                logger.debug("Cannot deliver image for %s", key)
+
+        self.loaded.emit(key, image)
@@ -13,18 +13,269 @@
 
 import re
 import os
+import time
+import struct
+
+from functools import partial
 
 from studioqt import QtGui
 from studioqt import QtCore
 from studioqt import QtWidgets
 
+from studioqt.imageloader import imageLoader
+from studioqt.pixmapcache import PixmapCache
+
+
+__all__ = [
+    'ImageSequence',
+    'ImageSequenceWidget',
+    'PackedSequence',
+    'frameCache',
+    'packImageSequence',
+    'imageSequenceExists',
+]
+
+
+FRAME_CACHE_BYTE_LIMIT = 64 * 1024 * 1024
+
+PACKED_EXTENSION = ".pack"
+
+_frameCache = None
+_frameListings = {}
+
+
+def frameCache():
+    """
+    Return the pixmap cache that is shared by all image sequences.
+
+    :rtype: studioqt.PixmapCache
+    """
+    global _frameCache
+
+    if not _frameCache:
+        _frameCache = PixmapCache(FRAME_CACHE_BYTE_LIMIT)
+
+    return _frameCache
+
+
+def naturalSortItems(items):
+    """
+    Sort the given list in the way that humans expect.
+
+    :type items: list[str]
+    :rtype: None
+    """
+    convert = lambda text: int(text) if text.isdigit() else text
+    alphanum_key = lambda key: [convert(c) for c in re.split('([0-9]+)', key)]
+    items.sort(key=alphanum_key)
+
+
+def listFrames(dirname):
+    """
+    Return the sorted frame paths and the modified time for the dirname.
+
+    The listing is cached until the modified time of the dirname changes.
+
+    :type dirname: str
+    :rtype: (list[str], float or None)
+    """
+    try:
+        mtime = os.path.getmtime(dirname)
+    except OSError:
+        return [], None
+
+    listing = _frameListings.get(dirname)
+
+    if not listing or listing[1] != mtime:
+        frames = [dirname + "/" + filename for filename in os.listdir(dirname)]
+        naturalSortItems(frames)
+
+        listing = (frames, mtime)
+        _frameListings[dirname] = listing
+
+    return list(listing[0]), mtime
+
+
+def imageSequenceExists(dirname):
+    """
+    Return True if there is a frame folder or a packed file for the dirname.
+
+    :type dirname: str
+    :rtype: bool
+    """
+    return os.path.isfile(dirname + PACKED_EXTENSION) or os.path.isdir(dirname)
+
+
+def packImageSequence(dirname, path=None):
+    """
+    Pack the frames in the given folder into a single file.
+
+    The packed file is written next to the folder by default.
 
-__all__ = ['ImageSequence', 'ImageSequenceWidget']
+    Example:
+        path = packImageSequence("C:/temp/sequence")
+        print path
+        # C:/temp/sequence.pack
+
+    :type dirname: str
+    :type path: str or None
+    :rtype: str
+    """
+    path = path or dirname + PACKED_EXTENSION
+    frames, mtime = listFrames(dirname)
+
+    PackedSequence.write(path, frames)
+
+    return path
+
+
+class PackedSequence(object):
+    """
+    Read the frames of an image sequence that is packed into a single file.
+
+    The file starts with a header and an index of the offset and size
+    of each frame, followed by the encoded frame data. The index is read
+    once when the sequence is opened. The file is only opened while a
+    frame is read, so the item folder is never locked by a loaded
+    sequence.
+    """
+
+    MAGIC = "SLPS"
+    VERSION = 1
+
+    HEADER = struct.Struct("<4sII")
+    ENTRY = struct.Struct("<QQ")
+
+    @classmethod
+    def write(cls, path, filenames):
+        """
+        Write the given frame files to a packed file at the given path.
+
+        :type path: str
+        :type filenames: list[str]
+        :rtype: None
+        """
+        entries = []
+        offset = cls.HEADER.size + cls.ENTRY.size * len(filenames)
+
+        for filename in filenames:
+            size = os.path.getsize(filename)
+            entries.append((offset, size))
+            offset += size
+
+        tempPath = path + ".tmp"
+
+        with open(tempPath, "wb") as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, len(filenames)))
+
+            for entry in entries:
+                f.write(cls.ENTRY.pack(*entry))
+
+            for filename in filenames:
+                with open(filename, "rb") as frame:
+                    f.write(frame.read())
+
+        if os.path.exists(path):
+            os.remove(path)
+
+        os.rename(tempPath, path)
+
+    def __init__(self, path):
+        self._path = path
+        self._entries = []
+
+        self.open()
+
+    def path(self):
+        """
+        Return the location of the packed file.
+
+        :rtype: str
+        """
+        return self._path
+
+    def open(self):
+        """
+        Read the frame index from the packed file.
+
+        :raise: IOError
+        :rtype: None
+        """
+        with open(self._path, "rb") as f:
+            data = f.read(self.HEADER.size)
+
+            if len(data) < self.HEADER.size:
+                raise IOError("Not a packed image sequence: " + self._path)
+
+            magic, version, count = self.HEADER.unpack(data)
+
+            if magic != self.MAGIC or version != self.VERSION:
+                raise IOError("Not a packed image sequence: " + self._path)
+
+            data = f.read(self.ENTRY.size * count)
+
+        if len(data) < self.ENTRY.size * count:
+            raise IOError("Truncated packed image sequence: " + self._path)
+
+        self._entries = [
+            self.ENTRY.unpack_from(data, i * self.ENTRY.size)
+            for i in range(count)
+        ]
+
+    def close(self):
+        """
+        Clear the frame index.
+
+        :rtype: None
+        """
+        self._entries = []
+
+    def frameCount(self):
+        """
+        Return the number of frames in the packed file.
+
+        :rtype: int
+        """
+        return len(self._entries)
+
+    def frameData(self, frame):
+        """
+        Return the encoded image data for the given frame.
+
+        The file is opened and closed for each frame that is read.
+
+        :type frame: int
+        :raise: IOError
+        :rtype: str
+        """
+        offset, size = self._entries[frame]
+
+        with open(self._path, "rb") as f:
+            f.seek(offset)
+            return f.read(size)
+
+    def frameImage(self, frame):
+        """
+        Return the decoded image for the given frame.
+
+        :type frame: int
+        :rtype: QtGui.QImage
+        """
+        image = QtGui.QImage()
+
+        try:
+            image.loadFromData(self.frameData(frame))
+        except (IndexError, IOError):
+            # The sequence has been closed or the file has been moved.
+            pass
+
+        return image
 
 
 class ImageSequence(QtCore.QObject):
 
     DEFAULT_FPS = 24
+    PREFETCH_COUNT = 12
 
     frameChanged = QtCore.Signal(int)
 
@@ -35,8 +286,18 @@ class ImageSequence(QtCore.QObject):
         self._timer = None
         self._frame = 0
         self._frames = []
+        self._mtime = None
+        self._packed = None
         self._dirname = None
         self._paused = False
+        self._lastPixmap = None
+
+        self._realtime = True
+        self._startTime = None
+        self._statsTime = None
+        self._targetFrame = 0
+        self._droppedFrames = 0
+        self._displayedFrames = 0
 
         if path:
             self.setDirname(path)
@@ -48,18 +309,45 @@ class ImageSequence(QtCore.QObject):
         :type dirname: str
         :rtype: None
         """
-        def naturalSortItems(items):
-            """
-            Sort the given list in the way that humans expect.
-            """
-            convert = lambda text: int(text) if text.isdigit() else text
-            alphanum_key = lambda key: [convert(c) for c in re.split('([0-9]+)', key)]
-            items.sort(key=alphanum_key)
+        self.close()
 
         self._dirname = dirname
-        if os.path.isdir(dirname):
-            self._frames = [dirname + "/" + filename for filename in os.listdir(dirname)]
-            naturalSortItems(self._frames)
+        packedPath = dirname + PACKED_EXTENSION
+
+        if os.path.isfile(packedPath):
+            self._packed = PackedSequence(packedPath)
+            self._mtime = os.path.getmtime(packedPath)
+            self._frames = [packedPath + "/" + str(i) for i in range(self._packed.frameCount())]
+            self.prefetch(0)
+
+        elif os.path.isdir(dirname):
+            self._frames, self._mtime = listFrames(dirname)
+            self.prefetch(0)
+
+    def close(self):
+        """
+        Close the packed file if the sequence is reading one.
+
+        The queued frame requests are cancelled before the index is
+        cleared.
+
+        :rtype: None
+        """
+        imageLoader().clear(owner=self)
+
+        if self._packed:
+            self._packed.close()
+            self._packed = None
+
+        self._lastPixmap = None
+
+    def isPacked(self):
+        """
+        Return True if the frames are read from a packed file.
+
+        :rtype: bool
+        """
+        return self._packed is not None
 
     def dirname(self):
         """
@@ -92,6 +380,7 @@ class ImageSequence(QtCore.QObject):
         """
         self._paused = True
         self._timer.stop()
+        imageLoader().clear(owner=self)
 
     def resume(self):
         """
@@ -101,6 +390,7 @@ class ImageSequence(QtCore.QObject):
         """
         if self._paused:
             self._paused = False
+            self._resetStartTime()
             self._timer.start()
 
     def stop(self):
@@ -109,7 +399,9 @@ class ImageSequence(QtCore.QObject):
 
         :rtype: None
         """
-        self._timer.stop()
+        if self._timer:
+            self._timer.stop()
+        imageLoader().clear(owner=self)
 
     def start(self):
         """
@@ -118,9 +410,99 @@ class ImageSequence(QtCore.QObject):
         :rtype: None
         """
         self.reset()
+        self.resetStats()
+
         if self._timer:
             self._timer.start(1000.0 / self._fps)
 
+    def isRealtime(self):
+        """
+        Return True if the frames are picked from the elapsed time.
+
+        :rtype: bool
+        """
+        return self._realtime
+
+    def setRealtime(self, value):
+        """
+        Set if the frames are picked from the elapsed time.
+
+        When enabled the sequence plays at the real frame rate and frames
+        that have not been read in time are dropped. When disabled every
+        frame is shown in order, at most one per timer tick, and playback
+        waits on the current frame until the next frame has been read.
+
+        :type value: bool
+        :rtype: None
+        """
+        self._realtime = value
+        self._resetStartTime()
+
+    def _resetStartTime(self):
+        """
+        Set the start time so that playback continues from the current frame.
+
+        :rtype: None
+        """
+        self._startTime = time.time() - float(self._frame) / self._fps
+        self._targetFrame = self._frame
+
+    def resetStats(self):
+        """
+        Reset the playback stats and start measuring from the current frame.
+
+        :rtype: None
+        """
+        self._statsTime = time.time()
+        self._droppedFrames = 0
+        self._displayedFrames = 0
+        self._resetStartTime()
+
+    def droppedFrameCount(self):
+        """
+        Return the number of frames dropped since playback started.
+
+        :rtype: int
+        """
+        return self._droppedFrames
+
+    def displayedFrameCount(self):
+        """
+        Return the number of frames shown since playback started.
+
+        :rtype: int
+        """
+        return self._displayedFrames
+
+    def achievedFps(self):
+        """
+        Return the number of frames shown per second since playback started.
+
+        :rtype: float
+        """
+        if not self._statsTime:
+            return 0.0
+
+        elapsed = time.time() - self._statsTime
+
+        if elapsed <= 0:
+            return 0.0
+
+        return self._displayedFrames / elapsed
+
+    def playbackStats(self):
+        """
+        Return the playback stats since playback started.
+
+        :rtype: dict
+        """
+        return {
+            "fps": self._fps,
+            "achievedFps": self.achievedFps(),
+            "droppedFrames": self._droppedFrames,
+            "displayedFrames": self._displayedFrames,
+        }
+
     def frames(self):
         """
         Return all the filenames in the image sequence.
@@ -138,9 +520,56 @@ class ImageSequence(QtCore.QObject):
         if not self._frames:
             return
 
-        frame = self._frame
-        frame += 1
-        self.jumpToFrame(frame)
+        if self._realtime:
+            self._realtimeFrameChanged()
+        else:
+            self._nextFrameChanged()
+
+    def _nextFrameChanged(self):
+        """
+        Show the next frame if it has been read.
+
+        The current frame stays on screen until the next frame is in the
+        frame cache, so no frames are skipped or repeated.
+
+        :rtype: None
+        """
+        frame = (self._frame + 1) % self.frameCount()
+
+        if frameCache().contains(self.frameKey(frame)):
+            self._displayedFrames += 1
+            self.jumpToFrame(frame)
+        else:
+            self.prefetch(frame)
+
+    def _realtimeFrameChanged(self):
+        """
+        Show the frame for the elapsed time if it has been read.
+
+        Frames that are not in the frame cache yet are dropped instead
+        of being read on the GUI thread.
+
+        :rtype: None
+        """
+        count = self.frameCount()
+
+        elapsed = time.time() - self._startTime
+        frame = int(elapsed * self._fps) % count
+
+        passed = (frame - self._targetFrame) % count
+        if not passed:
+            return
+
+        self._targetFrame = frame
+
+        if frameCache().contains(self.frameKey(frame)):
+            self._droppedFrames += passed - 1
+            self._displayedFrames += 1
+            self.jumpToFrame(frame)
+        else:
+            # The frame is already late so start reading the next frames
+            self._droppedFrames += passed
+            self.prefetch(frame + 1)
 
     def percent(self):
         """
@@ -168,7 +597,7 @@ class ImageSequence(QtCore.QObject):
 
         :rtype: QtGui.QIcon
         """
-        return QtGui.QIcon(self.currentFilename())
+        return QtGui.QIcon(self.currentPixmap())
 
     def currentPixmap(self):
         """
@@ -176,7 +605,137 @@ class ImageSequence(QtCore.QObject):
 
         :rtype: QtGui.QPixmap
         """
-        return QtGui.QPixmap(self.currentFilename())
+        return self.framePixmap(self.currentFrameNumber())
+
+    def frameKey(self, frame):
+        """
+        Return the frame cache key for the given frame.
+
+        :type frame: int
+        :rtype: (str, float) or None
+        """
+        try:
+            return self._frames[frame], self._mtime
+        except IndexError:
+            return None
+
+    def framePixmap(self, frame):
+        """
+        Return the pixmap for the given frame.
+
+        The pixmap is read from the shared frame cache. A frame that has
+        not been read yet is requested from the image loader and the last
+        displayed frame is returned instead, so the GUI thread never
+        waits for a frame to be read. The frameChanged signal is emitted
+        when the current frame has been read.
+
+        :type frame: int
+        :rtype: QtGui.QPixmap
+        """
+        key = self.frameKey(frame)
+
+        if not key:
+            return QtGui.QPixmap()
+
+        pixmap = frameCache().find(key)
+
+        if pixmap is None:
+            self.requestFrame(frame, priority=-self.PREFETCH_COUNT - 1)
+            return self._lastPixmap or QtGui.QPixmap()
+
+        self._lastPixmap = pixmap
+
+        return pixmap
+
+    def frameImage(self, frame):
+        """
+        Read the image for the given frame from the packed file or the folder.
+
+        :type frame: int
+        :rtype: QtGui.QImage
+        """
+        return self._readFrame(self._packed, frame, self._frames[frame])
+
+    @staticmethod
+    def _readFrame(packed, frame, path):
+        """
+        Read the given frame for the image loader.
+
+        The packed file and the frame are bound when the frame is
+        requested, so a request still reads the file it was made for
+        after the sequence has changed.
+
+        :type packed: PackedSequence or None
+        :type frame: int
+        :type path: str
+        :rtype: QtGui.QImage
+        """
+        if packed:
+            return packed.frameImage(frame)
+
+        return QtGui.QImage(path)
+
+    def prefetch(self, frame):
+        """
+        Request the frames after the given frame to be read in the background.
+
+        The frames are loaded before any thumbnails and the nearest
+        frames are loaded first.
+
+        :type frame: int
+        :rtype: None
+        """
+        count = self.frameCount()
+
+        for i in range(min(self.PREFETCH_COUNT, count)):
+            self.requestFrame((frame + i) % count, priority=i - self.PREFETCH_COUNT)
+
+    def requestFrame(self, frame, priority=0):
+        """
+        Request the given frame to be read in the background.
+
+        Requesting a frame that is already queued for this sequence only
+        updates its priority. Other sequences showing the same frame get
+        their own callback.
+
+        :type frame: int
+        :type priority: int
+        :rtype: None
+        """
+        key = self.frameKey(frame)
+
+        if not key or frameCache().contains(key):
+            return
+
+        loader = imageLoader()
+        callback = None
+
+        if not loader.isPending(key, owner=self):
+            callback = partial(self._frameLoaded, key)
+
+        loader.request(
+            key,
+            key[0],
+            callback=callback,
+            priority=priority,
+            owner=self,
+            reader=partial(self._readFrame, self._packed, frame),
+        )
+
+    def _frameLoaded(self, key, image):
+        """
+        Triggered when a requested frame has been read.
+
+        :type key: (str, float)
+        :type image: QtGui.QImage
+        :rtype: None
+        """
+        if not image.isNull():
+            pixmap = QtGui.QPixmap.fromImage(image)
+            frameCache().insert(key, pixmap)
+
+            if key == self.frameKey(self._frame):
+                self.frameChanged.emit(self._frame)
 
     def currentFilename(self):
         """
@@ -206,6 +765,7 @@ class ImageSequence(QtCore.QObject):
         if frame >= self.frameCount():
             frame = 0
         self._frame = frame
+        self.prefetch(frame + 1)
         self.frameChanged.emit(frame)
 
 
@@ -0,0 +1,209 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+
+from collections import OrderedDict
+
+
+__all__ = [
+    "PixmapCache",
+    "pixmapCache",
+]
+
+logger = logging.getLogger(__name__)
+
+
+_pixmapCache = None
+
+
+def pixmapCache():
+    """
+    Return the pixmap cache that is shared by all the widgets.
+
+    :rtype: PixmapCache
+    """
+    global _pixmapCache
+
+    if not _pixmapCache:
+        _pixmapCache = PixmapCache()
+
+    return _pixmapCache
+
+
+class PixmapCache(object):
+    """
+    A least recently used cache of pixmaps with a limit in bytes.
+
+    Example:
+        cache = studioqt.pixmapCache()
+
+        key = (path, mtime, size, dpi)
+        pixmap = cache.find(key)
+
+        if pixmap is None:
+            pixmap = QtGui.QPixmap(path)
+            cache.insert(key, pixmap)
+    """
+
+    DEFAULT_BYTE_LIMIT = 128 * 1024 * 1024
+
+    def __init__(self, byteLimit=None):
+
+        self._pixmaps = OrderedDict()
+        self._byteCount = 0
+        self._byteLimit = byteLimit or self.DEFAULT_BYTE_LIMIT
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def pixmapByteCount(pixmap):
+        """
+        Return the number of bytes used by the given pixmap.
+
+        :type pixmap: QtGui.QPixmap
+        :rtype: int
+        """
+        return pixmap.width() * pixmap.height() * pixmap.depth() / 8
+
+    def byteLimit(self):
+        """
+        Return the maximum number of bytes used by the cache.
+
+        :rtype: int
+        """
+        return self._byteLimit
+
+    def setByteLimit(self, value):
+        """
+        Set the maximum number of bytes used by the cache.
+
+        :type value: int
+        :rtype: None
+        """
+        self._byteLimit = value
+        self.evict()
+
+    def byteCount(self):
+        """
+        Return the number of bytes currently used by the cache.
+
+        :rtype: int
+        """
+        return self._byteCount
+
+    def contains(self, key):
+        """
+        Return True if the pixmap for the given key is cached.
+
+        This does not count as a hit or a miss and does not change the
+        order the pixmaps are evicted in.
+
+        :type key: tuple
+        :rtype: bool
+        """
+        return key in self._pixmaps
+
+    def find(self, key):
+        """
+        Return the pixmap for the given key or None if it isn't cached.
+
+        :type key: tuple
+        :rtype: QtGui.QPixmap or None
+        """
+        pixmap = self._pixmaps.pop(key, None)
+
+        if pixmap is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+            self._pixmaps[key] = pixmap
+
+        return pixmap
+
+    def insert(self, key, pixmap):
+        """
+        Insert the pixmap for the given key.
+
+        The least recently used pixmaps are removed when the cache is
+        over the byte limit.
+
+        :type key: tuple
+        :type pixmap: QtGui.QPixmap
+        :rtype: None
+        """
+        self.remove(key)
+
+        self._pixmaps[key] = pixmap
+        self._byteCount += self.pixmapByteCount(pixmap)
+
+        self.evict()
+
+    def remove(self, key):
+        """
+        Remove the pixmap for the given key.
+
+        :type key: tuple
+        :rtype: None
+        """
+        pixmap = self._pixmaps.pop(key, None)
+
+        if pixmap is not None:
+            self._byteCount -= self.pixmapByteCount(pixmap)
+
+    def evict(self):
+        """
+        Remove the least recently used pixmaps until under the byte limit.
+
+        :rtype: None
+        """
+        while self._pixmaps and self._byteCount > self._byteLimit:
+            key, pixmap = self._pixmaps.popitem(last=False)
+            self._byteCount -= self.pixmapByteCount(pixmap)
+            self._evictions += 1
+
+    def clear(self):
+        """
+        Remove all the pixmaps from the cache.
+
+        :rtype: None
+        """
+        self._pixmaps = OrderedDict()
+        self._byteCount = 0
+
+    def stats(self):
+        """
+        Return the hit, miss and eviction counters for the cache.
+
+        :rtype: dict
+        """
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "count": len(self._pixmaps),
+            "byteCount": self._byteCount,
+            "byteLimit": self._byteLimit,
+        }
+
+    def resetStats(self):
+        """
+        Reset the hit, miss and eviction counters.
+
+        :rtype: None
+        """
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
@@ -14,6 +14,7 @@
 import os
 
 from studioqt import QtGui
+from studioqt import QtCore
 from studioqt import Pixmap
 
 
@@ -22,6 +23,46 @@ DIRNAME = os.path.dirname(PATH)
 RESOURCE_DIRNAME = os.path.join(DIRNAME, "resource")
 
 
+_cache = {}
+
+
+def clearCache():
+    """
+    Remove all the pixmaps that have been cached by the resource objects.
+
+    This is called when the theme changes.
+
+    :rtype: None
+    """
+    _cache.clear()
+
+
+def _colorKey(color):
+    """
+    Return a hashable key for the given color.
+
+    :type color: QtGui.QColor or str or None
+    :rtype: int or str or None
+    """
+    if isinstance(color, QtGui.QColor):
+        return color.rgba()
+    return color
+
+
+def _sizeKey(size):
+    """
+    Return a hashable key for the given size.
+
+    :type size: QtCore.QSize or int or None
+    :rtype: (int, int) or None
+    """
+    if isinstance(size, QtCore.QSize):
+        return size.width(), size.height()
+    elif size:
+        return size, size
+    return None
+
+
 def get(*args):
     """
     This is a convenience function for returning the resource path.
@@ -76,31 +117,62 @@ class Resource(object):
         """
         return os.path.join(self.dirname(), *args)
 
-    def icon(self, name, extension="png", color=None):
+    def icon(self, name, extension="png", color=None, size=None):
         """
         Return an Icon object from the given resource name.
 
         :type name: str
         :type extension: str
+        :type color: QtGui.QColor or str or None
+        :type size: QtCore.QSize or int or None
         :rtype: QtGui.QIcon
         """
-        p = self.pixmap(name, extension=extension, color=color)
+        p = self.pixmap(name, extension=extension, color=color, size=size)
 
         return QtGui.QIcon(p)
 
-    def pixmap(self, name, scope="icons", extension="png", color=None):
+    def pixmap(self, name, scope="icons", extension="png", color=None, size=None):
         """
         Return a Pixmap object from the given resource name.
 
+        The tinted and scaled pixmaps are cached and shared by all the
+        resource objects. A copy is returned so that the caller can
+        change it without changing the cache.
+
         :type name: str
         :type scope: str
         :type extension: str
+        :type color: QtGui.QColor or str or None
+        :type size: QtCore.QSize or int or None
         :rtype: QtWidgets.QPixmap
         """
-        path = self.get(scope, name + "." + extension)
-        p = Pixmap(path)
-
-        if color:
-            p.setColor(color)
-
-        return p
+        key = (
+            self.dirname(),
+            name,
+            scope,
+            extension,
+            _colorKey(color),
+            _sizeKey(size),
+        )
+
+        p = _cache.get(key)
+
+        if p is None:
+            path = self.get(scope, name + "." + extension)
+            p = Pixmap(path)
+
+            if color:
+                p.setColor(color)
+
+            if size:
+                w, h = _sizeKey(size)
+                p = Pixmap(p.scaled(
+                    w,
+                    h,
+                    QtCore.Qt.KeepAspectRatio,
+                    QtCore.Qt.SmoothTransformation,
+                ))
+
+            _cache[key] = p
+
+        return Pixmap(p)
@@ -0,0 +1,84 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+"""
+# Example:
+# RUN TEST SUITE
+import studioqt.tests
+reload(studioqt.tests)
+studioqt.tests.run()
+"""
+import unittest
+
+import logging
+
+
+logging.basicConfig(
+    filemode='w',
+    level=logging.DEBUG,
+    format='%(levelname)s: %(funcName)s: %(message)s',
+)
+
+
+def testSuite():
+    """
+    Return a test suite containing all the tests.
+
+    :rtype: unittest.TestSuite
+    """
+    import test_imageloader
+    import test_pixmapcache
+    import test_thumbnailcache
+    import test_imagesequence
+    import test_combineditemstore
+    import test_searchfilter
+    import test_treewidget
+    import test_combinedwidget
+
+    suite = unittest.TestSuite()
+
+    s = unittest.makeSuite(test_imageloader.TestImageLoader, 'test')
+    suite.addTest(s)
+
+    s = unittest.makeSuite(test_pixmapcache.TestPixmapCache, 'test')
+    suite.addTest(s)
+
+    s = unittest.makeSuite(test_thumbnailcache.TestThumbnailCache, 'test')
+    suite.addTest(s)
+
+    s = unittest.makeSuite(test_imagesequence.TestPackedSequence, 'test')
+    suite.addTest(s)
+
+    s = unittest.makeSuite(test_imagesequence.TestImageSequence, 'test')
+    suite.addTest(s)
+
+    s = unittest.makeSuite(test_combineditemstore.TestCombinedItemStore, 'test')
+    suite.addTest(s)
+
+    s = unittest.makeSuite(test_searchfilter.TestSearchFilter, 'test')
+    suite.addTest(s)
+
+    s = unittest.makeSuite(test_treewidget.TestTreeWidget, 'test')
+    suite.addTest(s)
+
+    s = unittest.makeSuite(test_combinedwidget.TestCombinedWidget, 'test')
+    suite.addTest(s)
+
+    return suite
+
+
+def run():
+    """
+    Call from within Maya to run all valid tests.
+    """
+    tests = unittest.TextTestRunner()
+    tests.run(testSuite())
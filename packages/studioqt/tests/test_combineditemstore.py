@@ -0,0 +1,203 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from studioqt.widgets.combinedwidget.combineditemstore import CombinedItemStore
+
+
+class TestCombinedItemStore(unittest.TestCase):
+
+    def test_add_remove_row(self):
+        """
+        Test the rows of removed items are reused and cleared.
+        """
+        store = CombinedItemStore()
+
+        row1 = store.addRow()
+        row2 = store.addRow()
+
+        store.setValue(row1, "Name", "pose1")
+        store.setValue(row2, "Name", "pose2")
+
+        store.removeRow(row1)
+
+        self.assertEqual("", store.value(row1, "Name"))
+        self.assertEqual(row1, store.addRow())
+        self.assertEqual(2, store.rowCount())
+        self.assertEqual("pose2", store.value(row2, "Name"))
+
+        # New columns have a value for every row
+        row3 = store.addRow()
+        store.setValue(row3, "Type", "Pose")
+
+        self.assertEqual(None, store.value(row1, "Type", None))
+        self.assertEqual("Pose", store.value(row3, "Type"))
+
+    def test_shared_values(self):
+        """
+        Test equal values are stored once and only by the same type.
+        """
+        store = CombinedItemStore()
+
+        for i in range(10):
+            row = store.addRow()
+            store.setValue(row, "Type", "Pose")
+            store.setValue(row, "Count", 1)
+            store.setValue(row, "Enabled", True)
+            store.setValue(row, "Size", 1.0)
+
+        self.assertEqual(4, store.valueCount())
+        self.assertTrue(store.value(row, "Enabled") is True)
+        self.assertTrue(isinstance(store.value(row, "Size"), float))
+
+    def test_release_values(self):
+        """
+        Test values are released by setValue and removeRow.
+        """
+        store = CombinedItemStore()
+
+        row1 = store.addRow()
+        row2 = store.addRow()
+
+        store.setValue(row1, "Name", "a")
+        store.setValue(row2, "Name", "a")
+        self.assertEqual(1, store.valueCount())
+
+        store.setValue(row1, "Name", "b")
+        self.assertEqual(2, store.valueCount())
+
+        store.setValue(row2, "Name", "c")
+        self.assertEqual(2, store.valueCount())
+
+        store.removeRow(row1)
+        store.removeRow(row2)
+        self.assertEqual(0, store.valueCount())
+
+        # The released slots are reused for new values
+        for i in range(100):
+            row = store.addRow()
+            store.setValue(row, "Name", "name%d" % i)
+            store.removeRow(row)
+
+        self.assertEqual(0, store.valueCount())
+        self.assertTrue(store.stats()["freeValueCount"] <= 3)
+
+    def test_unhashable_values(self):
+        """
+        Test unhashable values are shared by identity.
+        """
+        store = CombinedItemStore()
+
+        value = ["a", "b"]
+
+        row1 = store.addRow()
+        row2 = store.addRow()
+
+        for i in range(10):
+            store.setValue(row1, "Tags", value)
+
+        store.setValue(row2, "Tags", value)
+        self.assertEqual(1, store.valueCount())
+        self.assertTrue(store.value(row1, "Tags") is value)
+
+        store.setValue(row2, "Tags", ["a", "b"])
+        self.assertEqual(2, store.valueCount())
+
+        store.removeRow(row1)
+        store.removeRow(row2)
+        self.assertEqual(0, store.valueCount())
+
+    def test_values(self):
+        """
+        Test reading a column for a list of rows.
+        """
+        store = CombinedItemStore()
+
+        rows = [store.addRow() for i in range(3)]
+
+        store.setValue(rows[0], "Name", "a")
+        store.setValue(rows[2], "Name", "c")
+
+        self.assertEqual(["a", None, "c"], store.values("Name", rows, None))
+        self.assertEqual(["", "", ""], store.values("Type", rows))
+
+    def test_items(self):
+        """
+        Test the label and value of the columns set for a row by role.
+        """
+        store = CombinedItemStore()
+
+        row = store.addRow()
+
+        store.setValue(row, "Name", "pose")
+        store.setValue(row, "Modified", "1 day ago")
+        store.setValue(row, "Modified", 1000, role=store.SORT_TEXT)
+
+        self.assertEqual(
+            [("Name", "pose"), ("Modified", "1 day ago")],
+            store.items(row),
+        )
+
+        self.assertEqual([("Modified", 1000)], store.items(row, role=store.SORT_TEXT))
+
+        store.removeRow(row)
+        self.assertEqual([], store.items(row))
+
+    def test_mtime(self):
+        """
+        Test the modified times are kept per row and cleared on removal.
+        """
+        store = CombinedItemStore()
+
+        rows = [store.addRow() for i in range(3)]
+
+        store.setMtime(rows[0], 1500000000.5)
+        store.setMtime(rows[2], 0.0)
+
+        self.assertEqual(1500000000.5, store.mtime(rows[0]))
+        self.assertEqual(None, store.mtime(rows[1]))
+        self.assertEqual([1500000000.5, -1, 0.0], store.mtimes(rows, -1))
+
+        store.removeRow(rows[0])
+        self.assertEqual(None, store.mtime(store.addRow()))
+
+        store.setMtime(rows[2], None)
+        self.assertEqual(None, store.mtime(rows[2]))
+        self.assertEqual(0, store.valueCount())
+
+
+def testSuite():
+    """
+    Return the test suite for this module.
+
+    :rtype: unittest.TestSuite
+    """
+    suite = unittest.TestSuite()
+    s = unittest.makeSuite(TestCombinedItemStore, 'test')
+    suite.addTest(s)
+    return suite
+
+
+def run():
+    """
+    Call from within Maya to run all valid tests.
+
+    Example:
+
+        import studioqt.tests.test_combineditemstore
+        reload(studioqt.tests.test_combineditemstore)
+        studioqt.tests.test_combineditemstore.run()
+    """
+    tests = unittest.TextTestRunner()
+    tests.run(testSuite())
@@ -0,0 +1,247 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+import studioqt
+
+from studioqt import QtCore
+from studioqt import QtWidgets
+
+
+class TestCombinedWidget(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a combined widget with a few items.
+        """
+        self.app = QtWidgets.QApplication.instance()
+
+        if not self.app:
+            self.app = QtWidgets.QApplication([])
+
+        self.items = []
+
+        for i in range(6):
+            item = studioqt.CombinedWidgetItem()
+            item.setText("Name", "item{0}".format(i))
+            item.setText("Type", "type{0}".format(i % 2))
+            item.setUrl(QtCore.QUrl.fromLocalFile("/item{0}".format(i)))
+            self.items.append(item)
+
+        self.combinedWidget = studioqt.CombinedWidget()
+        self.combinedWidget.setItems(self.items)
+
+    def tearDown(self):
+        """
+        Delete the combined widget.
+        """
+        self.combinedWidget.deleteLater()
+
+    def test_remove_items(self):
+        """
+        Test the removed items are not kept in the sort and group caches.
+        """
+        treeWidget = self.combinedWidget.treeWidget()
+
+        self.combinedWidget.groupByColumn("Type", 0)
+        self.combinedWidget.sortByColumn("Name", 0)
+
+        removed = [item for item in self.items if item.text("Type") == "type1"]
+        self.combinedWidget.removeItems(removed)
+
+        for keys in treeWidget._sortKeys.values():
+            for item in removed:
+                self.assertNotIn(item, keys)
+
+        for item in removed:
+            self.assertNotIn(item, treeWidget._groupFromItem)
+
+        for groupItem in treeWidget.groupItems():
+            for item in removed:
+                self.assertNotIn(item, groupItem.children())
+
+        # The group that lost all its children is hidden
+        hidden = [g.name() for g in treeWidget.groupItems() if g.isHidden()]
+        self.assertEqual(["type1"], hidden)
+
+
+    def test_set_items(self):
+        """
+        Test the items are shown in the given order by the model.
+        """
+        model = self.combinedWidget.model()
+
+        self.assertEqual(self.items, self.combinedWidget.items())
+        self.assertEqual(6, model.rowCount())
+
+        for row, item in enumerate(self.items):
+            self.assertEqual(row, model.rowFromItem(item))
+            self.assertIs(item, model.itemFromIndex(model.index(row, 0)))
+
+        self.combinedWidget.setItems(self.items[:2])
+        self.assertEqual(self.items[:2], self.combinedWidget.items())
+        self.assertIsNone(self.items[3].treeWidget())
+
+    def test_select_paths(self):
+        """
+        Test the items are selected by their paths.
+        """
+        self.combinedWidget.selectPaths(["/item1", "/item4", "/missing"])
+
+        selected = self.combinedWidget.selectedItems()
+        self.assertEqual([self.items[1], self.items[4]], selected)
+
+    def test_set_items_hidden(self):
+        """
+        Test only the items that change visibility are returned.
+        """
+        treeWidget = self.combinedWidget.treeWidget()
+        listView = self.combinedWidget.listView()
+
+        changed = self.combinedWidget.setItemsHidden(self.items[:3], True)
+        self.assertEqual(self.items[:3], changed)
+
+        changed = self.combinedWidget.setItemsHidden(self.items[:4], True)
+        self.assertEqual([self.items[3]], changed)
+
+        for row, item in enumerate(self.items):
+            self.assertEqual(row < 4, item.isHidden())
+
+        # The hidden items are left out by the proxy model
+        proxyModel = self.combinedWidget.proxyModel()
+
+        self.assertEqual(2, proxyModel.rowCount())
+        self.assertIs(proxyModel, treeWidget.proxyModel())
+        self.assertIs(proxyModel, listView.model())
+        self.assertEqual(self.items[4], proxyModel.item(0))
+        self.assertFalse(treeWidget.indexFromItem(self.items[0]).isValid())
+
+        self.combinedWidget.setVisibleItems(self.items[1:3])
+        self.assertEqual([self.items[1], self.items[2]], [proxyModel.item(0), proxyModel.item(1)])
+
+    def test_sort_keeps_selection(self):
+        """
+        Test the selection moves with the items when they are sorted.
+        """
+        self.combinedWidget.selectPaths(["/item1", "/item2"])
+
+        self.combinedWidget.sortByColumn("Name", QtCore.Qt.DescendingOrder)
+        items = self.combinedWidget.items()
+        self.assertEqual(list(reversed(self.items)), items)
+
+        selected = self.combinedWidget.selectedItems()
+        self.assertEqual([self.items[2], self.items[1]], selected)
+
+        self.combinedWidget.groupByColumn("Type", QtCore.Qt.AscendingOrder)
+        selected = self.combinedWidget.selectedItems()
+        self.assertEqual(set([self.items[1], self.items[2]]), set(selected))
+
+    def test_sort_by_modified_time(self):
+        """
+        Test the modified column is sorted by the modified time.
+        """
+        for i, item in enumerate(self.items):
+            item.setText("Modified", "{0} days ago".format(i))
+            item.setModifiedTime(1500000000.0 - i * 86400)
+
+        self.combinedWidget.setItems(self.items)
+        self.combinedWidget.sortByColumn("Modified", QtCore.Qt.AscendingOrder)
+        self.assertEqual(list(reversed(self.items)), self.combinedWidget.items())
+
+    def test_filter_keeps_selection(self):
+        """
+        Test the visible selected items stay selected while filtering.
+        """
+        self.combinedWidget.selectPaths(["/item1", "/item2"])
+
+        self.combinedWidget.setItemsHidden([self.items[0], self.items[2]], True)
+        self.assertEqual([self.items[1]], self.combinedWidget.selectedItems())
+
+        self.combinedWidget.sortByColumn("Name", QtCore.Qt.DescendingOrder)
+        self.combinedWidget.setItemsHidden([self.items[0]], False)
+
+        self.assertEqual([self.items[1]], self.combinedWidget.selectedItems())
+        self.assertEqual(
+            [self.items[5], self.items[4], self.items[3], self.items[1], self.items[0]],
+            [self.combinedWidget.proxyModel().item(row) for row in range(5)],
+        )
+
+    def test_insert_items(self):
+        """
+        Test the items are inserted before the item at the view row.
+        """
+        treeWidget = self.combinedWidget.treeWidget()
+        proxyModel = self.combinedWidget.proxyModel()
+
+        self.combinedWidget.sortByColumn("Name", QtCore.Qt.DescendingOrder)
+
+        item = studioqt.CombinedWidgetItem()
+        item.setText("Name", "inserted")
+
+        treeWidget.insertItems(2, [item])
+
+        self.assertEqual(7, proxyModel.rowCount())
+        self.assertEqual(2, treeWidget.itemRow(item))
+        self.assertEqual(self.items[3], proxyModel.item(3))
+
+        self.combinedWidget.removeItems([self.items[5], item])
+
+        self.assertEqual(5, proxyModel.rowCount())
+        self.assertEqual(list(reversed(self.items[:5])), self.combinedWidget.items())
+
+    def test_items_changed(self):
+        """
+        Test changed items emit one signal for each run of rows.
+        """
+        model = self.combinedWidget.model()
+        ranges = []
+
+        def dataChanged(topLeft, bottomRight, *args):
+            ranges.append((topLeft.row(), bottomRight.row()))
+
+        model.dataChanged.connect(dataChanged)
+
+        for item in [self.items[0], self.items[4], self.items[1]]:
+            item.setText("Name", item.text("Name") + "_changed")
+
+        self.assertEqual([], ranges)
+
+        model.emitItemsChanged()
+        self.assertEqual([(0, 1), (4, 4)], ranges)
+
+
+def testSuite():
+    """
+    Return the test suite for this module.
+
+    :rtype: unittest.TestSuite
+    """
+    suite = unittest.TestSuite()
+    s = unittest.makeSuite(TestCombinedWidget, 'test')
+    suite.addTest(s)
+    return suite
+
+
+def run():
+    """
+    Call from within Maya to run all valid tests.
+
+    Example:
+
+        import studioqt.tests.test_combinedwidget
+        reload(studioqt.tests.test_combinedwidget)
+        studioqt.tests.test_combinedwidget.run()
+    """
+    tests = unittest.TextTestRunner()
+    tests.run(testSuite())
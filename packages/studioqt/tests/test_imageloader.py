@@ -0,0 +1,215 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+import time
+import unittest
+
+from studioqt import QtGui
+from studioqt import QtWidgets
+
+from studioqt.imageloader import ImageLoader
+
+
+class QueuedImageLoader(ImageLoader):
+    """
+    An image loader that never starts its threads.
+
+    The requests stay in the queue so that they can be taken in the test.
+    """
+
+    def startThreads(self):
+        pass
+
+
+class TestImageLoader(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create the application needed for the loader threads.
+        """
+        self.app = QtWidgets.QApplication.instance()
+
+        if not self.app:
+            self.app = QtWidgets.QApplication([])
+
+    def test_priority_order(self):
+        """
+        Test the requests are taken by priority and then last in first out.
+        """
+        loader = QueuedImageLoader()
+
+        loader.request("a", "/tmp/a.jpg", priority=2)
+        loader.request("b", "/tmp/b.jpg", priority=0)
+        loader.request("c", "/tmp/c.jpg", priority=1)
+        loader.request("d", "/tmp/d.jpg", priority=0)
+
+        keys = [loader.takeRequest()[0] for i in range(4)]
+        self.assertEqual(["d", "b", "c", "a"], keys)
+
+    def test_request_updates_entry(self):
+        """
+        Test requesting a queued key updates its entry in the queue.
+        """
+        loader = QueuedImageLoader()
+
+        for i in range(10):
+            loader.request("a", "/tmp/a.jpg", priority=5)
+
+        loader.request("b", "/tmp/b.jpg", priority=3)
+        self.assertEqual(2, len(loader._queue))
+
+        loader.request("a", "/tmp/a.jpg", priority=0)
+        self.assertEqual(2, len(loader._queue))
+
+        self.assertEqual("a", loader.takeRequest()[0])
+        self.assertEqual("b", loader.takeRequest()[0])
+        self.assertEqual(0, len(loader._queue))
+
+    def test_running_request(self):
+        """
+        Test a key that is loading is not queued again.
+        """
+        loader = QueuedImageLoader()
+
+        loader.request("a", "/tmp/a.jpg")
+        loader.takeRequest()
+
+        loader.request("a", "/tmp/a.jpg")
+
+        self.assertTrue(loader.isPending("a"))
+        self.assertEqual(0, len(loader._queue))
+
+    def test_cancel(self):
+        """
+        Test cancelling and clearing the requests for an owner.
+        """
+        owner = object()
+        loader = QueuedImageLoader()
+
+        loader.request("a", "/tmp/a.jpg", owner=owner)
+        loader.request("b", "/tmp/b.jpg", owner=owner)
+        loader.request("c", "/tmp/c.jpg")
+
+        loader.cancel("a")
+        self.assertFalse(loader.isPending("a"))
+        self.assertEqual(2, len(loader._queue))
+
+        loader.clear(owner=owner)
+        self.assertFalse(loader.isPending("b"))
+        self.assertEqual(["c"], [entry[2] for entry in loader._queue])
+
+        self.assertEqual("c", loader.takeRequest()[0])
+
+    def test_shared_request(self):
+        """
+        Test a request made by two owners is kept until both cancel it.
+        """
+        images = []
+        owner1 = object()
+        owner2 = object()
+        loader = QueuedImageLoader()
+
+        def loaded1(image):
+            images.append(1)
+
+        def loaded2(image):
+            images.append(2)
+
+        loader.request("a", "/tmp/a.jpg", callback=loaded1, owner=owner1)
+        loader.request("a", "/tmp/a.jpg", callback=loaded2, owner=owner2)
+
+        self.assertTrue(loader.isPending("a", owner=owner1))
+        self.assertTrue(loader.isPending("a", owner=owner2))
+
+        loader.clear(owner=owner1)
+        self.assertTrue(loader.isPending("a"))
+        self.assertFalse(loader.isPending("a", owner=owner1))
+        self.assertEqual(1, len(loader._queue))
+
+        # Only the callback of the remaining owner is called
+        loader.takeRequest()
+        loader._imageLoaded("a", QtGui.QImage())
+        self.assertEqual([2], images)
+
+        loader.request("b", "/tmp/b.jpg", owner=owner1)
+        loader.request("b", "/tmp/b.jpg", owner=owner2)
+
+        loader.cancel("b", owner=owner2)
+        self.assertTrue(loader.isPending("b"))
+
+        loader.cancel("b", owner=owner1)
+        self.assertFalse(loader.isPending("b"))
+        self.assertEqual(0, len(loader._queue))
+
+    def test_mtime_limit(self):
+        """
+        Test only the most recently read modified times are kept.
+        """
+        loader = QueuedImageLoader()
+        loader.MAX_MTIME_COUNT = 3
+
+        for i in range(5):
+            loader.setMtime("/tmp/%d.jpg" % i, i)
+
+        self.assertEqual(None, loader.mtime("/tmp/0.jpg"))
+        self.assertEqual(None, loader.mtime("/tmp/1.jpg"))
+        self.assertEqual(4, loader.mtime("/tmp/4.jpg"))
+
+    def test_load_image(self):
+        """
+        Test the callback is called with the image read by the reader.
+        """
+        images = []
+        loader = ImageLoader(threadCount=2)
+
+        def reader(path):
+            return QtGui.QImage(4, 2, QtGui.QImage.Format_ARGB32)
+
+        loader.request("a", "/tmp/a.jpg", callback=images.append, reader=reader)
+
+        timeout = time.time() + 5
+
+        while not images and time.time() < timeout:
+            self.app.processEvents()
+
+        loader.stop()
+
+        self.assertEqual(1, len(images))
+        self.assertEqual(4, images[0].width())
+        self.assertFalse(loader.isPending("a"))
+
+
+def testSuite():
+    """
+    Return the test suite for this module.
+
+    :rtype: unittest.TestSuite
+    """
+    suite = unittest.TestSuite()
+    s = unittest.makeSuite(TestImageLoader, 'test')
+    suite.addTest(s)
+    return suite
+
+
+def run():
+    """
+    Call from within Maya to run all valid tests.
+
+    Example:
+
+        import studioqt.tests.test_imageloader
+        reload(studioqt.tests.test_imageloader)
+        studioqt.tests.test_imageloader.run()
+    """
+    tests = unittest.TextTestRunner()
+    tests.run(testSuite())
@@ -0,0 +1,216 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from studioqt import QtGui
+from studioqt import QtWidgets
+
+from studioqt.imagesequence import frameCache
+from studioqt.imagesequence import ImageSequence
+from studioqt.imagesequence import PackedSequence
+from studioqt.imagesequence import packImageSequence
+
+
+class TestPackedSequence(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a temp folder with a few frames.
+        """
+        self.tempDir = tempfile.mkdtemp()
+        self.dirname = os.path.join(self.tempDir, "sequence")
+
+        os.mkdir(self.dirname)
+
+        self.frames = ["frame 1", "frame 10 data", "", "frame 2 " * 100]
+        names = ["image.0001.jpg", "image.0010.jpg", "image.0003.jpg", "image.0002.jpg"]
+
+        for name, data in zip(names, self.frames):
+            with open(os.path.join(self.dirname, name), "wb") as f:
+                f.write(data)
+
+        # The frames are packed in natural sort order
+        self.frames = [self.frames[0], self.frames[3], self.frames[2], self.frames[1]]
+
+    def tearDown(self):
+        """
+        Remove the temp folder.
+        """
+        shutil.rmtree(self.tempDir)
+
+    def test_header(self):
+        """
+        Test the header of the packed file.
+        """
+        path = packImageSequence(self.dirname)
+
+        self.assertEqual(self.dirname + ".pack", path)
+
+        with open(path, "rb") as f:
+            data = f.read(PackedSequence.HEADER.size)
+
+        magic, version, count = PackedSequence.HEADER.unpack(data)
+
+        self.assertEqual(PackedSequence.MAGIC, magic)
+        self.assertEqual(PackedSequence.VERSION, version)
+        self.assertEqual(4, count)
+
+    def test_round_trip(self):
+        """
+        Test the frame count and the frame bytes read from the packed file.
+        """
+        path = os.path.join(self.tempDir, "test.pack")
+        packImageSequence(self.dirname, path)
+
+        packed = PackedSequence(path)
+
+        try:
+            self.assertEqual(path, packed.path())
+            self.assertEqual(4, packed.frameCount())
+
+            for i, data in enumerate(self.frames):
+                self.assertEqual(data, packed.frameData(i))
+        finally:
+            packed.close()
+
+        self.assertEqual(0, packed.frameCount())
+        self.assertFalse(os.path.exists(path + ".tmp"))
+
+    def test_overwrite(self):
+        """
+        Test packing over an existing packed file.
+        """
+        path = packImageSequence(self.dirname)
+
+        os.remove(os.path.join(self.dirname, "image.0010.jpg"))
+        packImageSequence(self.dirname)
+
+        packed = PackedSequence(path)
+
+        try:
+            self.assertEqual(3, packed.frameCount())
+            self.assertEqual(self.frames[1], packed.frameData(1))
+        finally:
+            packed.close()
+
+    def test_file_not_kept_open(self):
+        """
+        Test the packed file can be moved while the sequence is loaded.
+        """
+        path = packImageSequence(self.dirname)
+        packed = PackedSequence(path)
+
+        self.assertEqual(self.frames[0], packed.frameData(0))
+
+        os.rename(path, path + ".moved")
+
+        self.assertRaises(IOError, packed.frameData, 0)
+        self.assertTrue(packed.frameImage(0).isNull())
+
+        os.rename(path + ".moved", path)
+
+        self.assertEqual(self.frames[3], packed.frameData(3))
+
+    def test_invalid_file(self):
+        """
+        Test opening a file that is not a packed file.
+        """
+        path = os.path.join(self.tempDir, "invalid.pack")
+
+        with open(path, "wb") as f:
+            f.write("X" * PackedSequence.HEADER.size)
+
+        self.assertRaises(IOError, PackedSequence, path)
+
+        with open(path, "wb") as f:
+            f.write(PackedSequence.HEADER.pack(PackedSequence.MAGIC, 1, 4))
+
+        self.assertRaises(IOError, PackedSequence, path)
+
+
+class TestImageSequence(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a temp folder with a few frames that cannot be read.
+        """
+        self.app = QtWidgets.QApplication.instance()
+
+        if not self.app:
+            self.app = QtWidgets.QApplication([])
+
+        self.tempDir = tempfile.mkdtemp()
+
+        for i in range(3):
+            path = os.path.join(self.tempDir, "image.000{0}.jpg".format(i))
+            with open(path, "wb") as f:
+                f.write("invalid")
+
+    def tearDown(self):
+        """
+        Remove the temp folder.
+        """
+        shutil.rmtree(self.tempDir)
+
+    def test_wait_for_next_frame(self):
+        """
+        Test playback that is not realtime waits for the next frame.
+        """
+        sequence = ImageSequence(self.tempDir)
+        sequence.setRealtime(False)
+
+        try:
+            sequence._frameChanged()
+            self.assertEqual(0, sequence.currentFrameNumber())
+
+            frameCache().insert(sequence.frameKey(1), QtGui.QPixmap(1, 1))
+
+            sequence._frameChanged()
+            self.assertEqual(1, sequence.currentFrameNumber())
+
+            sequence._frameChanged()
+            self.assertEqual(1, sequence.currentFrameNumber())
+        finally:
+            sequence.close()
+
+
+def testSuite():
+    """
+    Return the test suite for this module.
+
+    :rtype: unittest.TestSuite
+    """
+    suite = unittest.TestSuite()
+    s = unittest.makeSuite(TestPackedSequence, 'test')
+    suite.addTest(s)
+    s = unittest.makeSuite(TestImageSequence, 'test')
+    suite.addTest(s)
+    return suite
+
+
+def run():
+    """
+    Call from within Maya to run all valid tests.
+
+    Example:
+
+        import studioqt.tests.test_imagesequence
+        reload(studioqt.tests.test_imagesequence)
+        studioqt.tests.test_imagesequence.run()
+    """
+    tests = unittest.TextTestRunner()
+    tests.run(testSuite())
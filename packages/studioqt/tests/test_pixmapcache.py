@@ -0,0 +1,129 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from studioqt import QtGui
+from studioqt import QtWidgets
+
+from studioqt.pixmapcache import PixmapCache
+
+
+class TestPixmapCache(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create the application needed for the pixmaps.
+        """
+        self.app = QtWidgets.QApplication.instance()
+
+        if not self.app:
+            self.app = QtWidgets.QApplication([])
+
+        self.pixmap = QtGui.QPixmap(10, 10)
+        self.byteCount = PixmapCache.pixmapByteCount(self.pixmap)
+
+    def test_find(self):
+        """
+        Test finding the cached pixmaps and the hit and miss counters.
+        """
+        cache = PixmapCache()
+
+        cache.insert("a", self.pixmap)
+
+        self.assertTrue(cache.find("a") is self.pixmap)
+        self.assertEqual(None, cache.find("b"))
+
+        stats = cache.stats()
+        self.assertEqual(1, stats["hits"])
+        self.assertEqual(1, stats["misses"])
+        self.assertEqual(self.byteCount, stats["byteCount"])
+
+    def test_insert_existing_key(self):
+        """
+        Test inserting a pixmap for a cached key only counts it once.
+        """
+        cache = PixmapCache()
+
+        cache.insert("a", self.pixmap)
+        cache.insert("a", QtGui.QPixmap(10, 10))
+
+        self.assertEqual(self.byteCount, cache.byteCount())
+
+        cache.remove("a")
+        self.assertEqual(0, cache.byteCount())
+
+    def test_byte_eviction(self):
+        """
+        Test the least recently used pixmaps are evicted over the byte limit.
+        """
+        cache = PixmapCache(byteLimit=self.byteCount * 3)
+
+        cache.insert("a", self.pixmap)
+        cache.insert("b", QtGui.QPixmap(10, 10))
+        cache.insert("c", QtGui.QPixmap(10, 10))
+
+        # Using "a" makes "b" the least recently used pixmap
+        cache.find("a")
+        cache.insert("d", QtGui.QPixmap(10, 10))
+
+        self.assertTrue(cache.contains("a"))
+        self.assertFalse(cache.contains("b"))
+        self.assertTrue(cache.contains("d"))
+
+        self.assertEqual(self.byteCount * 3, cache.byteCount())
+        self.assertEqual(1, cache.stats()["evictions"])
+
+    def test_set_byte_limit(self):
+        """
+        Test lowering the byte limit evicts the pixmaps over the limit.
+        """
+        cache = PixmapCache()
+
+        for key in "abcd":
+            cache.insert(key, QtGui.QPixmap(10, 10))
+
+        cache.setByteLimit(self.byteCount)
+
+        self.assertEqual(["d"], [k for k in "abcd" if cache.contains(k)])
+        self.assertEqual(self.byteCount, cache.byteCount())
+
+        # A pixmap larger than the limit is not kept
+        cache.insert("e", QtGui.QPixmap(20, 20))
+        self.assertEqual(0, cache.byteCount())
+
+
+def testSuite():
+    """
+    Return the test suite for this module.
+
+    :rtype: unittest.TestSuite
+    """
+    suite = unittest.TestSuite()
+    s = unittest.makeSuite(TestPixmapCache, 'test')
+    suite.addTest(s)
+    return suite
+
+
+def run():
+    """
+    Call from within Maya to run all valid tests.
+
+    Example:
+
+        import studioqt.tests.test_pixmapcache
+        reload(studioqt.tests.test_pixmapcache)
+        studioqt.tests.test_pixmapcache.run()
+    """
+    tests = unittest.TextTestRunner()
+    tests.run(testSuite())
@@ -0,0 +1,93 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from studioqt.widgets.searchwidget.searchfilter import SearchFilter
+
+
+class TestSearchFilter(unittest.TestCase):
+
+    def test_groups_from_pattern(self):
+        """
+        Test splitting a resolved pattern into the OR and AND labels.
+        """
+        searchFilter = SearchFilter("")
+
+        groups = searchFilter.groupsFromPattern("red and Apples or pears")
+        self.assertEqual([["red", "apples"], ["pears"]], groups)
+
+        groups = searchFilter.groupsFromPattern("apples")
+        self.assertEqual([["apples"]], groups)
+
+        groups = searchFilter.groupsFromPattern("")
+        self.assertEqual([[""]], groups)
+
+    def test_space_operator(self):
+        """
+        Test the groups are updated when the space operator changes.
+        """
+        searchFilter = SearchFilter("Red  apples")
+
+        self.assertEqual("red and apples", searchFilter.resolvedPattern())
+        self.assertEqual([["red", "apples"]], searchFilter._groups)
+
+        searchFilter.setSpaceOperator(SearchFilter.Operator.OR)
+
+        self.assertEqual("red or apples", searchFilter.resolvedPattern())
+        self.assertEqual([["red"], ["apples"]], searchFilter._groups)
+
+    def test_match(self):
+        """
+        Test matching the text with the AND and OR operators.
+        """
+        searchFilter = SearchFilter("red and apples")
+
+        self.assertTrue(searchFilter.match("Are RED apples better than green apples"))
+        self.assertFalse(searchFilter.match("Do cats like green apples"))
+        self.assertEqual(0, searchFilter.matches())
+
+        searchFilter.setPattern("red or apples")
+
+        self.assertTrue(searchFilter.match("Do cats like green apples"))
+        self.assertEqual(3, searchFilter.matches())
+
+        # An empty pattern matches everything
+        searchFilter.setPattern("")
+        self.assertTrue(searchFilter.match("Do cats like green apples"))
+
+
+def testSuite():
+    """
+    Return the test suite for this module.
+
+    :rtype: unittest.TestSuite
+    """
+    suite = unittest.TestSuite()
+    s = unittest.makeSuite(TestSearchFilter, 'test')
+    suite.addTest(s)
+    return suite
+
+
+def run():
+    """
+    Call from within Maya to run all valid tests.
+
+    Example:
+
+        import studioqt.tests.test_searchfilter
+        reload(studioqt.tests.test_searchfilter)
+        studioqt.tests.test_searchfilter.run()
+    """
+    tests = unittest.TextTestRunner()
+    tests.run(testSuite())
@@ -0,0 +1,171 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import time
+import shutil
+import tempfile
+import unittest
+
+from studioqt import QtGui
+from studioqt import QtWidgets
+
+from studioqt.thumbnailcache import ThumbnailCache
+
+
+class TestThumbnailCache(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a temp directory for the cache.
+        """
+        self.app = QtWidgets.QApplication.instance()
+
+        if not self.app:
+            self.app = QtWidgets.QApplication([])
+
+        self.dirname = tempfile.mkdtemp()
+        self.source = os.path.join(self.dirname, "thumbnail.jpg")
+
+        self.image = QtGui.QImage(600, 300, QtGui.QImage.Format_RGB32)
+        self.image.fill(0)
+
+    def tearDown(self):
+        """
+        Remove the temp directory.
+        """
+        shutil.rmtree(self.dirname)
+
+    def cacheDirname(self):
+        """
+        Return the location of the cache in the temp directory.
+
+        :rtype: str
+        """
+        return os.path.join(self.dirname, "cache")
+
+    def test_bucket(self):
+        """
+        Test the sizes are rounded up to the cached sizes.
+        """
+        cache = ThumbnailCache()
+
+        self.assertEqual(64, cache.bucket(10))
+        self.assertEqual(64, cache.bucket(64))
+        self.assertEqual(128, cache.bucket(65))
+        self.assertEqual(512, cache.bucket(2000))
+
+    def test_path(self):
+        """
+        Test the cache path is keyed by the bucket and the mtime.
+        """
+        cache = ThumbnailCache(self.cacheDirname())
+
+        path = cache.path(self.source, 1.0, 100)
+
+        self.assertEqual(path, cache.path(self.source, 1.0, 128))
+        self.assertNotEqual(path, cache.path(self.source, 1.0, 129))
+        self.assertNotEqual(path, cache.path(self.source, 2.0, 100))
+
+        self.assertEqual("128", os.path.basename(os.path.dirname(os.path.dirname(path))))
+
+    def test_disabled(self):
+        """
+        Test the image is downscaled but not written without a dirname.
+        """
+        cache = ThumbnailCache()
+
+        image = cache.write(self.source, 1.0, 200, self.image)
+
+        self.assertEqual(256, image.width())
+        self.assertEqual(128, image.height())
+        self.assertTrue(cache.read(self.source, 1.0, 200).isNull())
+        self.assertEqual([], cache.files())
+
+    def test_write_read(self):
+        """
+        Test the written thumbnail is read for the same mtime and bucket.
+        """
+        cache = ThumbnailCache(self.cacheDirname())
+
+        cache.write(self.source, 1.0, 200, self.image)
+
+        image = cache.read(self.source, 1.0, 250)
+
+        self.assertFalse(image.isNull())
+        self.assertEqual(256, image.width())
+        self.assertEqual(128, image.height())
+
+        self.assertTrue(cache.read(self.source, 2.0, 200).isNull())
+        self.assertTrue(cache.read(self.source, 1.0, 100).isNull())
+        self.assertTrue(cache.read(self.source, None, 200).isNull())
+
+    def test_evict(self):
+        """
+        Test the least recently used files are removed over the byte limit.
+        """
+        cache = ThumbnailCache(self.cacheDirname())
+
+        paths = []
+        now = time.time()
+
+        for i in range(4):
+            cache.write(self.source, float(i), 128, self.image)
+
+            path = cache.path(self.source, float(i), 128)
+            os.utime(path, (now - 100 + i, now - 100 + i))
+            paths.append(path)
+
+        # Reading the oldest file makes it the most recently used
+        cache.read(self.source, 0.0, 128)
+
+        files = cache.files()
+        byteCount = cache.byteCount()
+        size = max(size for path, size, mtime in files)
+
+        cache.setByteLimit(byteCount - size)
+        cache.evict()
+
+        self.assertTrue(os.path.exists(paths[0]))
+        self.assertFalse(os.path.exists(paths[1]))
+        self.assertTrue(os.path.exists(paths[3]))
+        self.assertTrue(cache.byteCount() <= cache.byteLimit())
+
+        cache.clear()
+        self.assertEqual([], cache.files())
+
+
+def testSuite():
+    """
+    Return the test suite for this module.
+
+    :rtype: unittest.TestSuite
+    """
+    suite = unittest.TestSuite()
+    s = unittest.makeSuite(TestThumbnailCache, 'test')
+    suite.addTest(s)
+    return suite
+
+
+def run():
+    """
+    Call from within Maya to run all valid tests.
+
+    Example:
+
+        import studioqt.tests.test_thumbnailcache
+        reload(studioqt.tests.test_thumbnailcache)
+        studioqt.tests.test_thumbnailcache.run()
+    """
+    tests = unittest.TextTestRunner()
+    tests.run(testSuite())
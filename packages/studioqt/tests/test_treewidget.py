@@ -0,0 +1,166 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+import unittest
+
+from studioqt import QtWidgets
+
+from studioqt.widgets.treewidget import TreeWidget
+
+
+CHILD_PATHS = {
+    "lib": ["lib/a", "lib/b"],
+    "lib/a": ["lib/a/x"],
+    "lib/a/x": ["lib/a/x/deep"],
+}
+
+
+class TestTreeWidget(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a tree widget that loads the child paths lazily.
+        """
+        self.app = QtWidgets.QApplication.instance()
+
+        if not self.app:
+            self.app = QtWidgets.QApplication([])
+
+        self.calls = []
+
+        self.treeWidget = TreeWidget()
+        self.treeWidget.setChildPathsFunc(self.childPaths)
+        self.treeWidget.updatePaths(["lib"])
+
+    def tearDown(self):
+        """
+        Delete the tree widget.
+        """
+        self.treeWidget.deleteLater()
+
+    def childPaths(self, path):
+        """
+        Return the child paths for the given path and record the call.
+
+        :type path: str
+        :rtype: dict
+        """
+        self.calls.append(path)
+        return dict((p, {}) for p in CHILD_PATHS.get(path, []))
+
+    def childTexts(self, path):
+        """
+        Return the text of the child items for the given path.
+
+        :type path: str
+        :rtype: list[str]
+        """
+        item = self.treeWidget.itemFromPath(path)
+        return [item.child(i).text(0) for i in range(item.childCount())]
+
+    def test_load_children(self):
+        """
+        Test the children are loaded once when the item is expanded.
+        """
+        item = self.treeWidget.itemFromPath("lib")
+
+        self.assertEqual(0, item.childCount())
+        self.assertEqual(QtWidgets.QTreeWidgetItem.ShowIndicator, item.childIndicatorPolicy())
+
+        item.setExpanded(True)
+        item.setExpanded(False)
+        item.setExpanded(True)
+
+        self.assertEqual(["lib"], self.calls)
+        self.assertEqual(["a", "b"], self.childTexts("lib"))
+        self.assertTrue(self.treeWidget.isPathLoaded("lib"))
+        self.assertFalse(self.treeWidget.isPathLoaded("lib/a"))
+
+        # Loaded items only show the indicator when they have children
+        policy = QtWidgets.QTreeWidgetItem.DontShowIndicatorWhenChildless
+        self.assertEqual(policy, item.childIndicatorPolicy())
+
+    def test_load_path(self):
+        """
+        Test only the parents of a path are loaded to create its item.
+        """
+        item = self.treeWidget.loadPath("lib/a/x/deep")
+
+        self.assertEqual("lib/a/x/deep", item.path())
+        self.assertEqual(["lib", "lib/a", "lib/a/x"], self.calls)
+        self.assertEqual(0, self.treeWidget.itemFromPath("lib/b").childCount())
+
+        self.assertEqual(None, self.treeWidget.loadPath("lib/c"))
+        self.assertEqual(None, self.treeWidget.loadPath("other/a"))
+        self.assertEqual(["lib", "lib/a", "lib/a/x"], self.calls)
+
+    def test_select_paths(self):
+        """
+        Test selecting a path that has not been loaded yet.
+        """
+        self.treeWidget.selectPaths(["lib/a/x"])
+
+        self.assertEqual(["lib/a/x"], self.treeWidget.selectedPaths())
+
+    def test_remove_items(self):
+        """
+        Test the loaded paths are removed with their items.
+        """
+        self.treeWidget.loadPath("lib/a/x")
+        self.assertEqual(["lib", "lib/a"], self.treeWidget.loadedPaths())
+
+        self.treeWidget.updatePaths(["lib", "lib/b"])
+
+        self.assertEqual(["lib"], self.treeWidget.loadedPaths())
+        self.assertEqual(None, self.treeWidget.itemFromPath("lib/a"))
+
+        self.treeWidget.clear()
+        self.assertEqual([], self.treeWidget.loadedPaths())
+
+    def test_not_lazy(self):
+        """
+        Test nothing is loaded when there is no child paths function.
+        """
+        self.treeWidget.setChildPathsFunc(None)
+
+        item = self.treeWidget.itemFromPath("lib")
+        self.treeWidget.loadChildren(item)
+
+        self.assertEqual(None, self.treeWidget.loadPath("lib/a"))
+        self.assertEqual([], self.calls)
+
+
+def testSuite():
+    """
+    Return the test suite for this module.
+
+    :rtype: unittest.TestSuite
+    """
+    suite = unittest.TestSuite()
+    s = unittest.makeSuite(TestTreeWidget, 'test')
+    suite.addTest(s)
+    return suite
+
+
+def run():
+    """
+    Call from within Maya to run all valid tests.
+
+    Example:
+
+        import studioqt.tests.test_treewidget
+        reload(studioqt.tests.test_treewidget)
+        studioqt.tests.test_treewidget.run()
+    """
+    tests = unittest.TextTestRunner()
+    tests.run(testSuite())
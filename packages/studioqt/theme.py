@@ -253,6 +253,8 @@ class Theme(QtCore.QObject):
     def __init__(self):
         QtCore.QObject.__init__(self)
 
+        self.updated.connect(studioqt.resource.clearCache)
+
         self._dpi = 1
 
         self._name = "Default"
@@ -0,0 +1,307 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import hashlib
+import logging
+import threading
+
+from studioqt import QtGui
+from studioqt import QtCore
+
+
+__all__ = [
+    "ThumbnailCache",
+    "thumbnailCache",
+]
+
+logger = logging.getLogger(__name__)
+
+
+_thumbnailCache = None
+
+
+def thumbnailCache():
+    """
+    Return the thumbnail cache that is shared by all the widgets.
+
+    The cache is disabled until a dirname has been set.
+
+    :rtype: ThumbnailCache
+    """
+    global _thumbnailCache
+
+    if not _thumbnailCache:
+        _thumbnailCache = ThumbnailCache()
+
+    return _thumbnailCache
+
+
+class ThumbnailCache(object):
+    """
+    A cache of downscaled thumbnails on the local disc.
+
+    Thumbnails are stored for a few fixed sizes and are keyed by the
+    source path and its modified time, so a changed thumbnail is never
+    read from the cache. The files that were used least recently are
+    removed when the cache is over the byte limit.
+
+    This class is used from the image loader threads so it must not
+    create any QPixmap objects.
+
+    Example:
+        cache = studioqt.thumbnailCache()
+        cache.setDirname("C:/temp/thumbnails")
+
+        image = cache.read(path, mtime, 128)
+
+        if image.isNull():
+            image = QtGui.QImage(path)
+            image = cache.write(path, mtime, 128, image)
+    """
+
+    BUCKETS = [64, 128, 256, 512]
+
+    EXTENSION = "jpg"
+    QUALITY = 90
+
+    EVICT_INTERVAL = 200
+    DEFAULT_BYTE_LIMIT = 256 * 1024 * 1024
+
+    def __init__(self, dirname=None, byteLimit=None):
+
+        self._lock = threading.Lock()
+        self._dirname = dirname
+        self._byteLimit = byteLimit or self.DEFAULT_BYTE_LIMIT
+        self._writeCount = 0
+
+    def dirname(self):
+        """
+        Return the location of the cache on disc.
+
+        :rtype: str or None
+        """
+        return self._dirname
+
+    def setDirname(self, dirname):
+        """
+        Set the location of the cache on disc.
+
+        Set the dirname to None to disable the cache.
+
+        :type dirname: str or None
+        :rtype: None
+        """
+        self._dirname = dirname
+
+    def isEnabled(self):
+        """
+        Return True if the cache has a location on disc.
+
+        :rtype: bool
+        """
+        return bool(self._dirname)
+
+    def byteLimit(self):
+        """
+        Return the maximum number of bytes used by the cache on disc.
+
+        :rtype: int
+        """
+        return self._byteLimit
+
+    def setByteLimit(self, value):
+        """
+        Set the maximum number of bytes used by the cache on disc.
+
+        :type value: int
+        :rtype: None
+        """
+        self._byteLimit = value
+
+    def bucket(self, size):
+        """
+        Return the smallest cached size that is larger than the given size.
+
+        :type size: int
+        :rtype: int
+        """
+        for bucket in self.BUCKETS:
+            if bucket >= size:
+                return bucket
+
+        return self.BUCKETS[-1]
+
+    def path(self, source, mtime, size):
+        """
+        Return the cache path for the given source path, mtime and size.
+
+        :type source: str
+        :type mtime: float
+        :type size: int
+        :rtype: str
+        """
+        text = "%s|%r" % (source, mtime)
+
+        if isinstance(text, unicode):
+            text = text.encode("utf-8")
+
+        name = hashlib.md5(text).hexdigest() + "." + self.EXTENSION
+        bucket = str(self.bucket(size))
+
+        return os.path.join(self.dirname(), bucket, name[:2], name)
+
+    def read(self, source, mtime, size):
+        """
+        Return the cached image for the given source path, mtime and size.
+
+        A null image is returned if the thumbnail has not been cached.
+
+        :type source: str
+        :type mtime: float
+        :type size: int
+        :rtype: QtGui.QImage
+        """
+        image = QtGui.QImage()
+
+        if not self.isEnabled() or mtime is None:
+            return image
+
+        path = self.path(source, mtime, size)
+
+        if os.path.exists(path) and image.load(path):
+            try:
+                # Touch the file so that it's evicted last
+                os.utime(path, None)
+            except OSError:
+                pass
+
+        return image
+
+    def write(self, source, mtime, size, image):
+        """
+        Downscale and write the given image to the cache.
+
+        Returns the downscaled image.
+
+        :type source: str
+        :type mtime: float
+        :type size: int
+        :type image: QtGui.QImage
+        :rtype: QtGui.QImage
+        """
+        bucket = self.bucket(size)
+
+        if image.width() > bucket or image.height() > bucket:
+            image = image.scaled(
+                bucket,
+                bucket,
+                QtCore.Qt.KeepAspectRatio,
+                QtCore.Qt.SmoothTransformation,
+            )
+
+        if not self.isEnabled() or mtime is None or image.isNull():
+            return image
+
+        path = self.path(source, mtime, size)
+        tempPath = "%s.%s.tmp" % (path, threading.current_thread().ident)
+
+        try:
+            dirname = os.path.dirname(path)
+            if not os.path.exists(dirname):
+                os.makedirs(dirname)
+
+            if image.save(tempPath, "JPG", self.QUALITY):
+                if os.path.exists(path):
+                    os.remove(path)
+                os.rename(tempPath, path)
+
+        except OSError, e:
+            logger.debug("Cannot write thumbnail cache %s: %s", path, e)
+
+            if os.path.exists(tempPath):
+                os.remove(tempPath)
+
+        with self._lock:
+            self._writeCount += 1
+            evict = self._writeCount % self.EVICT_INTERVAL == 0
+
+        if evict:
+            self.evict()
+
+        return image
+
+    def files(self):
+        """
+        Return the path, size and mtime for all the files in the cache.
+
+        :rtype: list[(str, int, float)]
+        """
+        files = []
+
+        if not self.isEnabled():
+            return files
+
+        for dirpath, dirnames, filenames in os.walk(self.dirname()):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((path, stat.st_size, stat.st_mtime))
+
+        return files
+
+    def byteCount(self):
+        """
+        Return the number of bytes used by the cache on disc.
+
+        :rtype: int
+        """
+        return sum(size for path, size, mtime in self.files())
+
+    def evict(self):
+        """
+        Remove the least recently used files until under the byte limit.
+
+        :rtype: None
+        """
+        with self._lock:
+            files = self.files()
+            byteCount = sum(size for path, size, mtime in files)
+
+            files.sort(key=lambda f: f[2])
+
+            for path, size, mtime in files:
+                if byteCount <= self._byteLimit:
+                    break
+
+                try:
+                    os.remove(path)
+                    byteCount -= size
+                except OSError:
+                    pass
+
+    def clear(self):
+        """
+        Remove all the files from the cache.
+
+        :rtype: None
+        """
+        with self._lock:
+            for path, size, mtime in self.files():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
@@ -52,8 +52,19 @@ class CombinedItemDelegate(QtWidgets.QStyledItemDelegate):
         :type index: QtCore.QModelIndex
         :rtype: QtCore.QSize
         """
+        # The row height comes from the first column, so the other
+        # columns do not need to look up the item for every row.
+        if index.column() > 0:
+            return QtCore.QSize()
+
+        combinedWidget = self.combinedWidget()
+
+        # All items have the same size when the items are not grouped.
+        if combinedWidget.isUniformItemSizes():
+            return combinedWidget.itemSizeHint()
+
         # This will be called for each row.
-        item = self.combinedWidget().itemFromIndex(index)
+        item = combinedWidget.itemFromIndex(index)
         return item.sizeHint(0)
 
     def paint(self, painter, option, index):
@@ -65,5 +76,14 @@ class CombinedItemDelegate(QtWidgets.QStyledItemDelegate):
         :type index: QtCore.QModelIndex
         :rtype: None
         """
-        item = self.combinedWidget().itemFromIndex(index)
+        combinedWidget = self.combinedWidget()
+
+        # Skip the items that are outside of the area being painted
+        if not combinedWidget.isRectExposed(option.rect):
+            combinedWidget.itemSkipped()
+            return
+
+        item = combinedWidget.itemFromIndex(index)
         item.paint(painter, option, index)
+
+        combinedWidget.itemPainted()
@@ -0,0 +1,514 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+
+from studioqt import QtCore
+
+
+__all__ = [
+    "CombinedItemModel",
+    "rowRanges",
+]
+
+logger = logging.getLogger(__name__)
+
+
+def rowRanges(rows):
+    """
+    Return the first and last row for each run of consecutive rows.
+
+    Example:
+        rowRanges([5, 1, 2, 3, 7, 8])
+        # [(1, 3), (5, 5), (7, 8)]
+
+    :type rows: list[int]
+    :rtype: list[(int, int)]
+    """
+    ranges = []
+
+    for row in sorted(set(rows)):
+        if ranges and ranges[-1][1] == row - 1:
+            ranges[-1] = (ranges[-1][0], row)
+        else:
+            ranges.append((row, row))
+
+    return ranges
+
+
+class CombinedItemModel(QtCore.QAbstractTableModel):
+    """
+    A table model for the items of a combined widget.
+
+    The model only keeps the list of items in row order and the column
+    labels. The text for each cell is read from the shared item store
+    by the column label, so the items do not need a Qt item or a copy
+    of the text for each column.
+
+    Changes are reported in batches. Setting the items resets the model
+    once, adding and removing items emits one signal per run of
+    consecutive rows, and the text changes of the items are collected
+    and emitted as one dataChanged signal per run of rows when control
+    returns to the event loop.
+
+    Example:
+        model = CombinedItemModel()
+        model.setHeaderLabels(["Name", "Type"])
+
+        item = studioqt.CombinedWidgetItem()
+        item.setText("Name", "pose1")
+
+        model.setItems([item])
+
+        print model.data(model.index(0, 0))
+        # pose1
+    """
+
+    def __init__(self, parent=None):
+        QtCore.QAbstractTableModel.__init__(self, parent)
+
+        self._items = []
+        self._rows = {}
+
+        self._labels = []
+        self._columns = {}
+
+        self._hiddenItems = set()
+        self._changedItems = set()
+
+        self._changedTimer = QtCore.QTimer(self)
+        self._changedTimer.setSingleShot(True)
+        self._changedTimer.setInterval(0)
+        self._changedTimer.timeout.connect(self.emitItemsChanged)
+
+    # -----------------------------------------------------------------------
+    # Reimplemented from QAbstractTableModel
+    # -----------------------------------------------------------------------
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        """
+        Return the number of items in the model.
+
+        :type parent: QtCore.QModelIndex
+        :rtype: int
+        """
+        if parent.isValid():
+            return 0
+
+        return len(self._items)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        """
+        Return the number of column labels.
+
+        :type parent: QtCore.QModelIndex
+        :rtype: int
+        """
+        if parent.isValid():
+            return 0
+
+        return len(self._labels)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        """
+        Return the data for the given index and role from the item.
+
+        :type index: QtCore.QModelIndex
+        :type role: int
+        :rtype: object
+        """
+        item = self.itemFromIndex(index)
+
+        if item is not None:
+            return item.data(index.column(), role)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        """
+        Return the column label for the given section.
+
+        :type section: int
+        :type orientation: QtCore.Qt.Orientation
+        :type role: int
+        :rtype: str or None
+        """
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return self.labelFromColumn(section)
+
+    def flags(self, index):
+        """
+        Return the item flags for the given index.
+
+        :type index: QtCore.QModelIndex
+        :rtype: QtCore.Qt.ItemFlags
+        """
+        return self.itemFlags(self.itemFromIndex(index))
+
+    def itemFlags(self, item):
+        """
+        Return the item flags for the given item.
+
+        :type item: studioqt.CombinedWidgetItem or None
+        :rtype: QtCore.Qt.ItemFlags
+        """
+        if item is None:
+            return QtCore.Qt.NoItemFlags
+
+        flags = QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+
+        if item.dragEnabled():
+            flags |= QtCore.Qt.ItemIsDragEnabled
+
+        return flags
+
+    # -----------------------------------------------------------------------
+    # Support for column labels
+    # -----------------------------------------------------------------------
+
+    def headerLabels(self):
+        """
+        Return the column labels.
+
+        :rtype: list[str]
+        """
+        return list(self._labels)
+
+    def setHeaderLabels(self, labels):
+        """
+        Set the column labels.
+
+        Only the columns that are added or removed at the end are
+        inserted or removed, so the views keep their column state.
+
+        :type labels: list[str]
+        :rtype: None
+        """
+        labels = list(labels)
+
+        if labels == self._labels:
+            return
+
+        oldCount = len(self._labels)
+        newCount = len(labels)
+
+        if newCount > oldCount:
+            self.beginInsertColumns(QtCore.QModelIndex(), oldCount, newCount - 1)
+            self._setLabels(labels)
+            self.endInsertColumns()
+
+        elif newCount < oldCount:
+            self.beginRemoveColumns(QtCore.QModelIndex(), newCount, oldCount - 1)
+            self._setLabels(labels)
+            self.endRemoveColumns()
+
+        else:
+            self._setLabels(labels)
+
+        if newCount:
+            self.headerDataChanged.emit(QtCore.Qt.Horizontal, 0, newCount - 1)
+            self.emitRowsChanged(0, len(self._items) - 1)
+
+    def _setLabels(self, labels):
+        """
+        Set the labels and update the column lookup.
+
+        :type labels: list[str]
+        :rtype: None
+        """
+        self._labels = labels
+        self._columns = {}
+
+        for column, label in enumerate(labels):
+            self._columns.setdefault(label, column)
+
+    def labelFromColumn(self, column):
+        """
+        Return the label for the given column.
+
+        An empty string is returned for an invalid column.
+
+        :type column: int
+        :rtype: str
+        """
+        if 0 <= column < len(self._labels):
+            return self._labels[column]
+
+        return ""
+
+    def columnFromLabel(self, label):
+        """
+        Return the column for the given label or -1 if it does not exist.
+
+        :type label: str
+        :rtype: int
+        """
+        return self._columns.get(label, -1)
+
+    # -----------------------------------------------------------------------
+    # Support for items
+    # -----------------------------------------------------------------------
+
+    def items(self):
+        """
+        Return all the items in row order.
+
+        :rtype: list[studioqt.CombinedWidgetItem]
+        """
+        return list(self._items)
+
+    def item(self, row):
+        """
+        Return the item at the given row.
+
+        :type row: int
+        :rtype: studioqt.CombinedWidgetItem or None
+        """
+        if 0 <= row < len(self._items):
+            return self._items[row]
+
+        return None
+
+    def itemFromIndex(self, index):
+        """
+        Return the item for the given index.
+
+        :type index: QtCore.QModelIndex
+        :rtype: studioqt.CombinedWidgetItem or None
+        """
+        if index.isValid():
+            return self.item(index.row())
+
+        return None
+
+    def rowFromItem(self, item):
+        """
+        Return the row for the given item or -1 if it is not in the model.
+
+        :type item: studioqt.CombinedWidgetItem
+        :rtype: int
+        """
+        if self._rows is None:
+            self._updateRows()
+
+        return self._rows.get(item, -1)
+
+    def indexFromItem(self, item, column=0):
+        """
+        Return the index for the given item and column.
+
+        :type item: studioqt.CombinedWidgetItem
+        :type column: int
+        :rtype: QtCore.QModelIndex
+        """
+        row = self.rowFromItem(item)
+
+        if row < 0:
+            return QtCore.QModelIndex()
+
+        return self.index(row, column)
+
+    def _updateRows(self):
+        """
+        Update the row lookup for all the items.
+
+        :rtype: None
+        """
+        self._rows = {}
+
+        for row, item in enumerate(self._items):
+            self._rows[item] = row
+
+    def clear(self):
+        """
+        Remove all the items from the model.
+
+        :rtype: None
+        """
+        self.setItems([])
+
+    def setItems(self, items):
+        """
+        Replace all the items in the model with a single model reset.
+
+        :type items: list[studioqt.CombinedWidgetItem]
+        :rtype: None
+        """
+        self.beginResetModel()
+
+        self._items = list(items)
+        self._rows = None
+        self._hiddenItems = set()
+        self._changedItems = set()
+
+        self.endResetModel()
+
+    def addItems(self, items):
+        """
+        Add the given items after the last row.
+
+        :type items: list[studioqt.CombinedWidgetItem]
+        :rtype: None
+        """
+        self.insertItems(len(self._items), items)
+
+    def insertItems(self, row, items):
+        """
+        Insert the given items at the given row.
+
+        :type row: int
+        :type items: list[studioqt.CombinedWidgetItem]
+        :rtype: None
+        """
+        if not items:
+            return
+
+        row = max(0, min(row, len(self._items)))
+
+        self.beginInsertRows(QtCore.QModelIndex(), row, row + len(items) - 1)
+
+        self._items[row:row] = items
+        self._rows = None
+
+        self.endInsertRows()
+
+    def removeItems(self, items):
+        """
+        Remove the given items from the model.
+
+        The rows are removed with one signal for each run of consecutive
+        rows, starting from the last row.
+
+        :type items: list[studioqt.CombinedWidgetItem]
+        :rtype: None
+        """
+        rows = [self.rowFromItem(item) for item in items]
+        rows = [row for row in rows if row >= 0]
+
+        for first, last in reversed(rowRanges(rows)):
+            self.beginRemoveRows(QtCore.QModelIndex(), first, last)
+
+            for item in self._items[first:last + 1]:
+                self._hiddenItems.discard(item)
+                self._changedItems.discard(item)
+
+            del self._items[first:last + 1]
+            self._rows = None
+
+            self.endRemoveRows()
+
+    # -----------------------------------------------------------------------
+    # Support for hidden items
+    # -----------------------------------------------------------------------
+
+    def isItemHidden(self, item):
+        """
+        Return True if the given item is hidden.
+
+        :type item: studioqt.CombinedWidgetItem
+        :rtype: bool
+        """
+        return item in self._hiddenItems
+
+    def hiddenItems(self):
+        """
+        Return the items that are hidden.
+
+        :rtype: set[studioqt.CombinedWidgetItem]
+        """
+        return set(self._hiddenItems)
+
+    def setItemsHidden(self, items, value):
+        """
+        Set the hidden state for the given items.
+
+        The model only keeps the state. The hidden items are left out of
+        the views by the proxy model. Returns the items that have changed.
+
+        :type items: list[studioqt.CombinedWidgetItem]
+        :type value: bool
+        :rtype: list[studioqt.CombinedWidgetItem]
+        """
+        hiddenItems = self._hiddenItems
+        changed = []
+
+        for item in items:
+            if (item in hiddenItems) != value and self.rowFromItem(item) >= 0:
+                changed.append(item)
+
+        if value:
+            hiddenItems.update(changed)
+        else:
+            hiddenItems.difference_update(changed)
+
+        return changed
+
+    # -----------------------------------------------------------------------
+    # Support for batched data changes
+    # -----------------------------------------------------------------------
+
+    def itemChanged(self, item):
+        """
+        Report that the data for the given item has changed.
+
+        The changes are collected and emitted once control returns to
+        the event loop, so setting several values for many items only
+        emits one signal for each run of consecutive rows.
+
+        :type item: studioqt.CombinedWidgetItem
+        :rtype: None
+        """
+        self._changedItems.add(item)
+
+        if not self._changedTimer.isActive():
+            self._changedTimer.start()
+
+    def itemsChanged(self, items):
+        """
+        Emit the data changed signal for the given items.
+
+        :type items: list[studioqt.CombinedWidgetItem]
+        :rtype: None
+        """
+        rows = [self.rowFromItem(item) for item in items]
+        rows = [row for row in rows if row >= 0]
+
+        for first, last in rowRanges(rows):
+            self.emitRowsChanged(first, last)
+
+    def emitItemsChanged(self):
+        """
+        Emit the data changed signal for the items that have changed.
+
+        :rtype: None
+        """
+        self._changedTimer.stop()
+
+        items = self._changedItems
+        self._changedItems = set()
+
+        self.itemsChanged(items)
+
+    def emitRowsChanged(self, first, last):
+        """
+        Emit the data changed signal for all columns of the given rows.
+
+        :type first: int
+        :type last: int
+        :rtype: None
+        """
+        if first > last or not self._labels:
+            return
+
+        topLeft = self.index(first, 0)
+        bottomRight = self.index(last, len(self._labels) - 1)
+
+        self.dataChanged.emit(topLeft, bottomRight)
@@ -0,0 +1,646 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+import array
+import logging
+
+from studioqt import QtCore
+
+from .combineditemmodel import rowRanges
+
+
+__all__ = [
+    "CombinedItemProxyModel",
+]
+
+logger = logging.getLogger(__name__)
+
+
+class CombinedItemProxyModel(QtCore.QAbstractProxyModel):
+    """
+    A sort and filter proxy for the item model of a combined widget.
+
+    The source model keeps the items in the order they were added. The
+    proxy keeps the sorted order as an array of source rows and the
+    visible rows as a second array without the hidden items. Sorting,
+    grouping and searching only replace these arrays with a single
+    layout change, and the persistent indexes, such as the selection,
+    are moved with their items.
+
+    The hidden state is read from the source model, so the views do not
+    need to hide any rows.
+
+    Example:
+        proxyModel = CombinedItemProxyModel()
+        proxyModel.setSourceModel(model)
+
+        proxyModel.setItemOrder(sortedItems)
+
+        model.setItemsHidden(items, True)
+        proxyModel.invalidateFilter()
+    """
+
+    def __init__(self, parent=None):
+        QtCore.QAbstractProxyModel.__init__(self, parent)
+
+        # The source rows in the sorted order including the hidden rows
+        self._order = array.array("l")
+
+        # The source row for each proxy row
+        self._rows = array.array("l")
+
+        # The proxy row for each source row or -1 if it is hidden
+        self._proxyRows = array.array("l")
+
+        self._insertPosition = 0
+
+    def setSourceModel(self, model):
+        """
+        Set the item model to sort and filter.
+
+        :type model: CombinedItemModel
+        :rtype: None
+        """
+        oldModel = self.sourceModel()
+
+        if oldModel is not None:
+            oldModel.modelAboutToBeReset.disconnect(self._sourceAboutToBeReset)
+            oldModel.modelReset.disconnect(self._sourceReset)
+            oldModel.rowsAboutToBeInserted.disconnect(self._sourceRowsAboutToBeInserted)
+            oldModel.rowsInserted.disconnect(self._sourceRowsInserted)
+            oldModel.rowsAboutToBeRemoved.disconnect(self._sourceRowsAboutToBeRemoved)
+            oldModel.rowsRemoved.disconnect(self._sourceRowsRemoved)
+            oldModel.columnsAboutToBeInserted.disconnect(self._sourceColumnsAboutToBeInserted)
+            oldModel.columnsInserted.disconnect(self._sourceColumnsInserted)
+            oldModel.columnsAboutToBeRemoved.disconnect(self._sourceColumnsAboutToBeRemoved)
+            oldModel.columnsRemoved.disconnect(self._sourceColumnsRemoved)
+            oldModel.dataChanged.disconnect(self._sourceDataChanged)
+            oldModel.headerDataChanged.disconnect(self.headerDataChanged)
+
+        self.beginResetModel()
+
+        QtCore.QAbstractProxyModel.setSourceModel(self, model)
+
+        if model is not None:
+            model.modelAboutToBeReset.connect(self._sourceAboutToBeReset)
+            model.modelReset.connect(self._sourceReset)
+            model.rowsAboutToBeInserted.connect(self._sourceRowsAboutToBeInserted)
+            model.rowsInserted.connect(self._sourceRowsInserted)
+            model.rowsAboutToBeRemoved.connect(self._sourceRowsAboutToBeRemoved)
+            model.rowsRemoved.connect(self._sourceRowsRemoved)
+            model.columnsAboutToBeInserted.connect(self._sourceColumnsAboutToBeInserted)
+            model.columnsInserted.connect(self._sourceColumnsInserted)
+            model.columnsAboutToBeRemoved.connect(self._sourceColumnsAboutToBeRemoved)
+            model.columnsRemoved.connect(self._sourceColumnsRemoved)
+            model.dataChanged.connect(self._sourceDataChanged)
+            model.headerDataChanged.connect(self.headerDataChanged)
+
+        self._resetOrder()
+
+        self.endResetModel()
+
+    # -----------------------------------------------------------------------
+    # Reimplemented from QAbstractProxyModel
+    # -----------------------------------------------------------------------
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        """
+        Return the index for the given row and column.
+
+        :type row: int
+        :type column: int
+        :type parent: QtCore.QModelIndex
+        :rtype: QtCore.QModelIndex
+        """
+        if parent.isValid() or not 0 <= row < len(self._rows):
+            return QtCore.QModelIndex()
+
+        if not 0 <= column < self.columnCount():
+            return QtCore.QModelIndex()
+
+        return self.createIndex(row, column)
+
+    def parent(self, index=None):
+        """
+        Return an invalid index as the items do not have children.
+
+        The parent object is returned when no index is given.
+
+        :type index: QtCore.QModelIndex or None
+        :rtype: QtCore.QModelIndex or QtCore.QObject
+        """
+        if index is None:
+            return QtCore.QAbstractProxyModel.parent(self)
+
+        return QtCore.QModelIndex()
+
+    def sibling(self, row, column, index):
+        """
+        Return the index for the given row and column.
+
+        :type row: int
+        :type column: int
+        :type index: QtCore.QModelIndex
+        :rtype: QtCore.QModelIndex
+        """
+        return self.index(row, column)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        """
+        Return the number of visible rows.
+
+        :type parent: QtCore.QModelIndex
+        :rtype: int
+        """
+        if parent.isValid():
+            return 0
+
+        return len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        """
+        Return the number of columns in the source model.
+
+        :type parent: QtCore.QModelIndex
+        :rtype: int
+        """
+        model = self.sourceModel()
+
+        if parent.isValid() or model is None:
+            return 0
+
+        return model.columnCount()
+
+    def hasChildren(self, parent=QtCore.QModelIndex()):
+        """
+        Return True for the root index if there are any visible rows.
+
+        :type parent: QtCore.QModelIndex
+        :rtype: bool
+        """
+        if parent.isValid():
+            return False
+
+        return len(self._rows) > 0
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        """
+        Return the data for the given index and role from the item.
+
+        :type index: QtCore.QModelIndex
+        :type role: int
+        :rtype: object
+        """
+        item = self.itemFromIndex(index)
+
+        if item is not None:
+            return item.data(index.column(), role)
+
+    def flags(self, index):
+        """
+        Return the item flags for the given index.
+
+        The flags are read from the item without mapping the index.
+
+        :type index: QtCore.QModelIndex
+        :rtype: QtCore.Qt.ItemFlags
+        """
+        return self.sourceModel().itemFlags(self.itemFromIndex(index))
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        """
+        Return the header data for the given section from the source model.
+
+        :type section: int
+        :type orientation: QtCore.Qt.Orientation
+        :type role: int
+        :rtype: object
+        """
+        model = self.sourceModel()
+
+        if model is not None and orientation == QtCore.Qt.Horizontal:
+            return model.headerData(section, orientation, role)
+
+        return QtCore.QAbstractProxyModel.headerData(self, section, orientation, role)
+
+    def mapToSource(self, proxyIndex):
+        """
+        Return the source index for the given proxy index.
+
+        :type proxyIndex: QtCore.QModelIndex
+        :rtype: QtCore.QModelIndex
+        """
+        row = self.sourceRow(proxyIndex.row())
+
+        if not proxyIndex.isValid() or row < 0:
+            return QtCore.QModelIndex()
+
+        return self.sourceModel().index(row, proxyIndex.column())
+
+    def mapFromSource(self, sourceIndex):
+        """
+        Return the proxy index for the given source index.
+
+        An invalid index is returned if the source row is hidden.
+
+        :type sourceIndex: QtCore.QModelIndex
+        :rtype: QtCore.QModelIndex
+        """
+        row = self.proxyRow(sourceIndex.row())
+
+        if not sourceIndex.isValid() or row < 0:
+            return QtCore.QModelIndex()
+
+        return self.createIndex(row, sourceIndex.column())
+
+    # -----------------------------------------------------------------------
+    # Support for mapping rows and items
+    # -----------------------------------------------------------------------
+
+    def sourceRow(self, row):
+        """
+        Return the source row for the given proxy row or -1 if invalid.
+
+        :type row: int
+        :rtype: int
+        """
+        if 0 <= row < len(self._rows):
+            return self._rows[row]
+
+        return -1
+
+    def proxyRow(self, sourceRow):
+        """
+        Return the proxy row for the given source row.
+
+        Returns -1 if the source row is hidden or invalid.
+
+        :type sourceRow: int
+        :rtype: int
+        """
+        if 0 <= sourceRow < len(self._proxyRows):
+            return self._proxyRows[sourceRow]
+
+        return -1
+
+    def item(self, row):
+        """
+        Return the item at the given proxy row.
+
+        :type row: int
+        :rtype: studioqt.CombinedWidgetItem or None
+        """
+        return self.sourceModel().item(self.sourceRow(row))
+
+    def itemFromIndex(self, index):
+        """
+        Return the item for the given proxy index.
+
+        :type index: QtCore.QModelIndex
+        :rtype: studioqt.CombinedWidgetItem or None
+        """
+        if index.isValid():
+            return self.item(index.row())
+
+        return None
+
+    def rowFromItem(self, item):
+        """
+        Return the proxy row for the given item.
+
+        Returns -1 if the item is hidden or not in the source model.
+
+        :type item: studioqt.CombinedWidgetItem
+        :rtype: int
+        """
+        return self.proxyRow(self.sourceModel().rowFromItem(item))
+
+    def indexFromItem(self, item, column=0):
+        """
+        Return the proxy index for the given item and column.
+
+        :type item: studioqt.CombinedWidgetItem
+        :type column: int
+        :rtype: QtCore.QModelIndex
+        """
+        row = self.rowFromItem(item)
+
+        if row < 0:
+            return QtCore.QModelIndex()
+
+        return self.index(row, column)
+
+    def items(self):
+        """
+        Return all the items in the sorted order including the hidden items.
+
+        :rtype: list[studioqt.CombinedWidgetItem]
+        """
+        item = self.sourceModel().item
+        return [item(row) for row in self._order]
+
+    # -----------------------------------------------------------------------
+    # Support for sorting and filtering
+    # -----------------------------------------------------------------------
+
+    def setItemOrder(self, items):
+        """
+        Sort the rows in the order of the given items.
+
+        The items that are not given keep their relative order after the
+        given items.
+
+        :type items: list[studioqt.CombinedWidgetItem]
+        :rtype: None
+        """
+        model = self.sourceModel()
+
+        order = array.array("l")
+        given = set()
+
+        for item in items:
+            row = model.rowFromItem(item)
+            if row >= 0 and row not in given:
+                order.append(row)
+                given.add(row)
+
+        if len(order) < len(self._order):
+            order.extend([row for row in self._order if row not in given])
+
+        self._changeLayout(order)
+
+    def invalidateFilter(self):
+        """
+        Update the visible rows after the hidden items have changed.
+
+        :rtype: None
+        """
+        self._changeLayout(self._order)
+
+    def _visibleRows(self, order):
+        """
+        Return the rows in the given order that are not hidden.
+
+        :type order: array.array
+        :rtype: array.array
+        """
+        model = self.sourceModel()
+        hiddenItems = model.hiddenItems()
+
+        if not hiddenItems:
+            return array.array("l", order)
+
+        item = model.item
+        return array.array("l", [row for row in order if item(row) not in hiddenItems])
+
+    def _updateProxyRows(self):
+        """
+        Update the proxy row lookup for all the source rows.
+
+        :rtype: None
+        """
+        proxyRows = array.array("l", [-1]) * self.sourceModel().rowCount()
+
+        for proxyRow, row in enumerate(self._rows):
+            proxyRows[row] = proxyRow
+
+        self._proxyRows = proxyRows
+
+    def _changeLayout(self, order):
+        """
+        Set the sorted order and update the visible rows.
+
+        The layout is only changed when the visible rows have changed.
+
+        :type order: array.array
+        :rtype: None
+        """
+        rows = self._visibleRows(order)
+
+        if rows == self._rows:
+            self._order = order
+            return
+
+        self.layoutAboutToBeChanged.emit()
+
+        oldIndexes = self.persistentIndexList()
+        oldRows = [self._rows[index.row()] for index in oldIndexes]
+
+        self._order = order
+        self._rows = rows
+        self._updateProxyRows()
+
+        newIndexes = []
+        for index, row in zip(oldIndexes, oldRows):
+            newIndexes.append(self.index(self._proxyRows[row], index.column()))
+
+        self.changePersistentIndexList(oldIndexes, newIndexes)
+
+        self.layoutChanged.emit()
+
+    def _resetOrder(self):
+        """
+        Reset the order to the order of the source model.
+
+        :rtype: None
+        """
+        model = self.sourceModel()
+
+        if model is None:
+            self._order = array.array("l")
+        else:
+            self._order = array.array("l", range(model.rowCount()))
+
+        self._rows = self._visibleRows(self._order)
+        self._updateProxyRows()
+
+    # -----------------------------------------------------------------------
+    # Support for the changes of the source model
+    # -----------------------------------------------------------------------
+
+    def _sourceAboutToBeReset(self):
+        """
+        Triggered before the source model is reset.
+
+        :rtype: None
+        """
+        self.beginResetModel()
+
+    def _sourceReset(self):
+        """
+        Triggered after the source model has been reset.
+
+        :rtype: None
+        """
+        self._resetOrder()
+        self.endResetModel()
+
+    def _sourceRowsAboutToBeInserted(self, parent, first, last):
+        """
+        Triggered before rows are inserted into the source model.
+
+        The new rows are shown before the item that is currently at the
+        first source row, or after the last row when they are added at
+        the end.
+
+        :type parent: QtCore.QModelIndex
+        :type first: int
+        :type last: int
+        :rtype: None
+        """
+        position = len(self._order)
+
+        if first < self.sourceModel().rowCount():
+            position = self._order.index(first)
+
+        proxyRow = len(self._rows)
+
+        for row in self._order[position:]:
+            if self._proxyRows[row] >= 0:
+                proxyRow = self._proxyRows[row]
+                break
+
+        self._insertPosition = position
+
+        self.beginInsertRows(QtCore.QModelIndex(), proxyRow, proxyRow + last - first)
+
+    def _sourceRowsInserted(self, parent, first, last):
+        """
+        Triggered after rows have been inserted into the source model.
+
+        :type parent: QtCore.QModelIndex
+        :type first: int
+        :type last: int
+        :rtype: None
+        """
+        count = last - first + 1
+
+        order = array.array("l", [row + count if row >= first else row for row in self._order])
+        order[self._insertPosition:self._insertPosition] = array.array("l", range(first, last + 1))
+
+        self._order = order
+        self._rows = self._visibleRows(order)
+        self._updateProxyRows()
+
+        self.endInsertRows()
+
+    def _sourceRowsAboutToBeRemoved(self, parent, first, last):
+        """
+        Triggered before rows are removed from the source model.
+
+        The visible rows are removed with one signal for each run of
+        consecutive proxy rows, starting from the last row.
+
+        :type parent: QtCore.QModelIndex
+        :type first: int
+        :type last: int
+        :rtype: None
+        """
+        proxyRows = [self._proxyRows[row] for row in range(first, last + 1)]
+        proxyRows = [row for row in proxyRows if row >= 0]
+
+        for proxyFirst, proxyLast in reversed(rowRanges(proxyRows)):
+            self.beginRemoveRows(QtCore.QModelIndex(), proxyFirst, proxyLast)
+
+            del self._rows[proxyFirst:proxyLast + 1]
+            self._updateProxyRows()
+
+            self.endRemoveRows()
+
+    def _sourceRowsRemoved(self, parent, first, last):
+        """
+        Triggered after rows have been removed from the source model.
+
+        :type parent: QtCore.QModelIndex
+        :type first: int
+        :type last: int
+        :rtype: None
+        """
+        count = last - first + 1
+
+        def shifted(rows):
+            return array.array("l", [
+                row - count if row > last else row
+                for row in rows if not first <= row <= last
+            ])
+
+        self._order = shifted(self._order)
+        self._rows = shifted(self._rows)
+        self._updateProxyRows()
+
+    def _sourceColumnsAboutToBeInserted(self, parent, first, last):
+        """
+        Triggered before columns are inserted into the source model.
+
+        :type parent: QtCore.QModelIndex
+        :type first: int
+        :type last: int
+        :rtype: None
+        """
+        self.beginInsertColumns(QtCore.QModelIndex(), first, last)
+
+    def _sourceColumnsInserted(self, parent, first, last):
+        """
+        Triggered after columns have been inserted into the source model.
+
+        :type parent: QtCore.QModelIndex
+        :type first: int
+        :type last: int
+        :rtype: None
+        """
+        self.endInsertColumns()
+
+    def _sourceColumnsAboutToBeRemoved(self, parent, first, last):
+        """
+        Triggered before columns are removed from the source model.
+
+        :type parent: QtCore.QModelIndex
+        :type first: int
+        :type last: int
+        :rtype: None
+        """
+        self.beginRemoveColumns(QtCore.QModelIndex(), first, last)
+
+    def _sourceColumnsRemoved(self, parent, first, last):
+        """
+        Triggered after columns have been removed from the source model.
+
+        :type parent: QtCore.QModelIndex
+        :type first: int
+        :type last: int
+        :rtype: None
+        """
+        self.endRemoveColumns()
+
+    def _sourceDataChanged(self, topLeft, bottomRight, roles=None):
+        """
+        Triggered when the data of the source model has changed.
+
+        The changed source rows are emitted with one signal for each run
+        of consecutive visible proxy rows.
+
+        :type topLeft: QtCore.QModelIndex
+        :type bottomRight: QtCore.QModelIndex
+        :type roles: list[int] or None
+        :rtype: None
+        """
+        rows = range(topLeft.row(), bottomRight.row() + 1)
+
+        proxyRows = [self.proxyRow(row) for row in rows]
+        proxyRows = [row for row in proxyRows if row >= 0]
+
+        for first, last in rowRanges(proxyRows):
+            self.dataChanged.emit(
+                self.index(first, topLeft.column()),
+                self.index(last, bottomRight.column()),
+            )
@@ -0,0 +1,388 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+import array
+import logging
+
+
+__all__ = [
+    "CombinedItemStore",
+    "itemStore",
+]
+
+logger = logging.getLogger(__name__)
+
+
+_itemStore = None
+
+
+def itemStore():
+    """
+    Return the item store that is shared by all the combined widget items.
+
+    :rtype: CombinedItemStore
+    """
+    global _itemStore
+
+    if not _itemStore:
+        _itemStore = CombinedItemStore()
+
+    return _itemStore
+
+
+class CombinedItemStore(object):
+    """
+    A shared column store for the text of the combined widget items.
+
+    Every distinct value is kept once in a value table. Each column has
+    an array with the index of the value for every row, so an item only
+    needs to keep its row. The modified time of each row is kept as a
+    float in its own array, since it is unique for most items and is
+    only used for sorting. Values that are repeated by many items, such
+    as the type, the category or the modified time, are only stored once
+    and reading a column for sorting or grouping is a scan over one
+    array.
+
+    The values are reference counted by the rows that use them. A value
+    is removed from the table when no row uses it anymore and its index
+    is reused for the next new value. Values that cannot be hashed are
+    shared by identity.
+
+    Example:
+        store = itemStore()
+
+        row = store.addRow()
+        store.setValue(row, "Type", "Pose")
+
+        print store.value(row, "Type")
+        # Pose
+
+        store.setMtime(row, 1500000000.0)
+
+        store.removeRow(row)
+    """
+
+    TEXT = "text"
+    SORT_TEXT = "sortText"
+
+    # The index used for a row that has no value in the column
+    NO_VALUE = -1
+
+    # The modified time used for a row that has no modified time
+    NO_MTIME = -1.0
+
+    def __init__(self):
+
+        self._values = []
+        self._valueIndexes = {}
+        self._refCounts = array.array("l")
+        self._freeValues = []
+
+        self._columns = {}
+        self._labels = {}
+
+        self._mtimes = array.array("d")
+
+        self._rowCount = 0
+        self._freeRows = []
+
+    def rowCount(self):
+        """
+        Return the number of rows in the store including the free rows.
+
+        :rtype: int
+        """
+        return self._rowCount
+
+    def valueCount(self):
+        """
+        Return the number of distinct values in the value table.
+
+        :rtype: int
+        """
+        return len(self._values) - len(self._freeValues)
+
+    def addRow(self):
+        """
+        Add a new empty row and return it.
+
+        The rows of removed items are reused before the columns grow.
+
+        :rtype: int
+        """
+        if self._freeRows:
+            return self._freeRows.pop()
+
+        row = self._rowCount
+        self._rowCount += 1
+
+        for column in self._columns.values():
+            column.append(self.NO_VALUE)
+
+        self._mtimes.append(self.NO_MTIME)
+
+        return row
+
+    def removeRow(self, row):
+        """
+        Clear the values for the given row so that it can be reused.
+
+        :type row: int
+        :rtype: None
+        """
+        if row is None or row >= self._rowCount:
+            return
+
+        for column in self._columns.values():
+            index = column[row]
+
+            if index != self.NO_VALUE:
+                column[row] = self.NO_VALUE
+                self.releaseValue(index)
+
+        self._mtimes[row] = self.NO_MTIME
+        self._freeRows.append(row)
+
+    @staticmethod
+    def valueKey(value):
+        """
+        Return the key used to share the given value in the value table.
+
+        :type value: object
+        :rtype: object
+        """
+        # Most values are text, which is used as its own key. The other
+        # keys are always tuples, so they cannot be equal to the text.
+        if type(value) is str:
+            return value
+
+        # Compare the type so that 1, 1.0 and True are not shared
+        key = (type(value), value)
+
+        try:
+            hash(key)
+        except TypeError:
+            key = (None, id(value))
+
+        return key
+
+    def addValue(self, value):
+        """
+        Add a reference to the given value and return its index.
+
+        The value is added to the value table if it does not exist.
+
+        :type value: object
+        :rtype: int
+        """
+        key = self.valueKey(value)
+        index = self._valueIndexes.get(key)
+
+        if index is None:
+            if self._freeValues:
+                index = self._freeValues.pop()
+                self._values[index] = value
+                self._refCounts[index] = 0
+            else:
+                index = len(self._values)
+                self._values.append(value)
+                self._refCounts.append(0)
+
+            self._valueIndexes[key] = index
+
+        self._refCounts[index] += 1
+
+        return index
+
+    def releaseValue(self, index):
+        """
+        Release a reference to the value at the given index.
+
+        The value is removed from the value table when it has no more
+        references.
+
+        :type index: int
+        :rtype: None
+        """
+        self._refCounts[index] -= 1
+
+        if self._refCounts[index] <= 0:
+            key = self.valueKey(self._values[index])
+            del self._valueIndexes[key]
+
+            self._values[index] = None
+            self._refCounts[index] = 0
+            self._freeValues.append(index)
+
+    def column(self, label, role=TEXT):
+        """
+        Return the array of value indexes for the given column.
+
+        :type label: str
+        :type role: str
+        :rtype: array.array
+        """
+        key = (role, label)
+        column = self._columns.get(key)
+
+        if column is None:
+            column = array.array("l", [self.NO_VALUE]) * self._rowCount
+            self._columns[key] = column
+            self._labels.setdefault(role, []).append(label)
+
+        return column
+
+    def setValue(self, row, label, value, role=TEXT):
+        """
+        Set the value for the given row and column.
+
+        :type row: int
+        :type label: str
+        :type value: object
+        :type role: str
+        :rtype: None
+        """
+        column = self.column(label, role)
+
+        oldIndex = column[row]
+        column[row] = self.addValue(value)
+
+        if oldIndex != self.NO_VALUE:
+            self.releaseValue(oldIndex)
+
+    def value(self, row, label, default="", role=TEXT):
+        """
+        Return the value for the given row and column.
+
+        :type row: int
+        :type label: str
+        :type default: object
+        :type role: str
+        :rtype: object
+        """
+        column = self._columns.get((role, label))
+
+        if column is not None:
+            index = column[row]
+            if index != self.NO_VALUE:
+                return self._values[index]
+
+        return default
+
+    def values(self, label, rows, default="", role=TEXT):
+        """
+        Return the values for the given rows in the given column.
+
+        :type label: str
+        :type rows: list[int]
+        :type default: object
+        :type role: str
+        :rtype: list[object]
+        """
+        column = self._columns.get((role, label))
+
+        if column is None:
+            return [default] * len(rows)
+
+        values = self._values
+        noValue = self.NO_VALUE
+
+        result = []
+        for row in rows:
+            index = column[row]
+            if index == noValue:
+                result.append(default)
+            else:
+                result.append(values[index])
+
+        return result
+
+    def setMtime(self, row, mtime):
+        """
+        Set the modified time in seconds for the given row.
+
+        :type row: int
+        :type mtime: float or None
+        :rtype: None
+        """
+        if mtime is None:
+            mtime = self.NO_MTIME
+
+        self._mtimes[row] = mtime
+
+    def mtime(self, row, default=None):
+        """
+        Return the modified time in seconds for the given row.
+
+        :type row: int
+        :type default: object
+        :rtype: float or object
+        """
+        mtime = self._mtimes[row]
+
+        if mtime == self.NO_MTIME:
+            return default
+
+        return mtime
+
+    def mtimes(self, rows, default=None):
+        """
+        Return the modified times for the given rows.
+
+        :type rows: list[int]
+        :type default: object
+        :rtype: list[float or object]
+        """
+        mtimes = self._mtimes
+        noMtime = self.NO_MTIME
+
+        result = []
+        for row in rows:
+            mtime = mtimes[row]
+            if mtime == noMtime:
+                result.append(default)
+            else:
+                result.append(mtime)
+
+        return result
+
+    def items(self, row, role=TEXT):
+        """
+        Return the label and value for all the columns set for the row.
+
+        :type row: int
+        :type role: str
+        :rtype: list[(str, object)]
+        """
+        items = []
+
+        for label in self._labels.get(role, []):
+            index = self._columns[(role, label)][row]
+            if index != self.NO_VALUE:
+                items.append((label, self._values[index]))
+
+        return items
+
+    def stats(self):
+        """
+        Return the row, column and value counts for the store.
+
+        :rtype: dict
+        """
+        return {
+            "rowCount": self._rowCount,
+            "freeRowCount": len(self._freeRows),
+            "columnCount": len(self._columns),
+            "valueCount": self.valueCount(),
+            "freeValueCount": len(self._freeValues),
+        }
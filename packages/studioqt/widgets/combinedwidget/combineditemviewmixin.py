@@ -42,13 +42,10 @@ class CombinedItemViewMixin(object):
 
         :rtype: None
         """
-        if self._currentItem:
-            try:
-                self._currentItem.text(0)
-            except RuntimeError:
-                self._hoverItem = None
-                self._currentItem = None
-                self._currentSelection = None
+        if self._currentItem and not self._currentItem.treeWidget():
+            self._hoverItem = None
+            self._currentItem = None
+            self._currentSelection = None
 
     def combinedWidget(self):
         """
@@ -74,7 +71,7 @@ class CombinedItemViewMixin(object):
         Return a list of Tree Widget Items assocated with the given indexes.
 
         :type indexes: list[QtCore.QModelIndex]
-        :rtype: list[QtWidgets.QTreeWidgetItem]
+        :rtype: list[studioqt.CombinedWidgetItem]
         """
         items = {}
         for index in indexes:
@@ -234,7 +231,7 @@ class CombinedItemViewMixin(object):
         """
         Triggered when the mouse enters the given item.
 
-        :type item: QtWidgets.QTreeWidgetItem
+        :type item: studioqt.CombinedWidgetItem
         :type event: QtWidgets.QMouseEvent
         :rtype: None
         """
@@ -245,7 +242,7 @@ class CombinedItemViewMixin(object):
         """
         Triggered when the mouse leaves the given item.
 
-        :type item: QtWidgets.QTreeWidgetItem
+        :type item: studioqt.CombinedWidgetItem
         :type event: QtWidgets.QMouseEvent
         :rtype: None
         """
@@ -256,7 +253,7 @@ class CombinedItemViewMixin(object):
         """
         Triggered when the mouse moves within the given item.
 
-        :type item: QtWidgets.QTreeWidgetItem
+        :type item: studioqt.CombinedWidgetItem
         :type event: QtWidgets.QMouseEvent
         :rtype: None
         """
@@ -266,7 +263,7 @@ class CombinedItemViewMixin(object):
         """
         Triggered when the mouse is pressed on the given item.
 
-        :type item: QtWidgets.QTreeWidgetItem
+        :type item: studioqt.CombinedWidgetItem
         :type event: QtWidgets.QMouseEvent
         :rtype: None
         """
@@ -277,7 +274,7 @@ class CombinedItemViewMixin(object):
         """
         Triggered when the mouse is released on the given item.
 
-        :type item: QtWidgets.QTreeWidgetItem
+        :type item: studioqt.CombinedWidgetItem
         :type event: QtWidgets.QMouseEvent
         :rtype: None
         """
@@ -288,7 +285,7 @@ class CombinedItemViewMixin(object):
         """
         Triggered when a key is pressed for the selected item.
 
-        :type item: QtWidgets.QTreeWidgetItem
+        :type item: studioqt.CombinedWidgetItem
         :type event: QtWidgets.QKeyEvent
         :rtype: None
         """
@@ -299,7 +296,7 @@ class CombinedItemViewMixin(object):
         """
         Triggered when a key is released for the selected item.
 
-        :type item: QtWidgets.QTreeWidgetItem
+        :type item: studioqt.CombinedWidgetItem
         :type event: QtWidgets.QKeyEvent
         :rtype: None
         """
@@ -94,7 +94,7 @@ class CombinedListView(CombinedItemViewMixin, QtWidgets.QListView):
         """
         Return the tree widget that contains the item.
 
-        :rtype: QtWidgets.QTreeWidget
+        :rtype: CombinedTreeWidget
         """
         return self._treeWidget
 
@@ -102,18 +102,18 @@ class CombinedListView(CombinedItemViewMixin, QtWidgets.QListView):
         """
         Set the tree widget that contains the item.
 
-        :type treeWidget: QtWidgets.QTreeWidget
+        :type treeWidget: CombinedTreeWidget
         :rtype: None
         """
         self._treeWidget = treeWidget
-        self.setModel(treeWidget.model())
+        self.setModel(treeWidget.proxyModel())
         self.setSelectionModel(treeWidget.selectionModel())
 
     def scrollToItem(self, item, pos=None):
         """
         Ensures that the item is visible.
 
-        :type item: QtWidgets.QTreeWidgetItem
+        :type item: studioqt.CombinedWidgetItem
         :type pos: QtCore.QPoint or None
         :rtype: None
         """
@@ -126,7 +126,7 @@ class CombinedListView(CombinedItemViewMixin, QtWidgets.QListView):
         """
         Return all the items.
 
-        :rtype: list[QtWidgets.QTreeWidgetItem]
+        :rtype: list[studioqt.CombinedWidgetItem]
         """
         return self.treeWidget().items()
 
@@ -137,7 +137,7 @@ class CombinedListView(CombinedItemViewMixin, QtWidgets.QListView):
         The coordinates are relative to the tree widget's viewport().
 
         :type pos: QtCore.QPoint
-        :rtype: QtWidgets.QTreeWidgetItem
+        :rtype: studioqt.CombinedWidgetItem
         """
         index = self.indexAt(pos)
         return self.itemFromIndex(index)
@@ -146,17 +146,17 @@ class CombinedListView(CombinedItemViewMixin, QtWidgets.QListView):
         """
         Return the QModelIndex assocated with the given item.
 
-        :type item: QtWidgets.QTreeWidgetItem.
+        :type item: studioqt.CombinedWidgetItem
         :rtype: QtCore.QModelIndex
         """
         return self.treeWidget().indexFromItem(item)
 
     def itemFromIndex(self, index):
         """
-        Return a pointer to the QTreeWidgetItem assocated with the given index.
+        Return a pointer to the item associated with the given index.
 
         :type index: QtCore.QModelIndex
-        :rtype: QtWidgets.QTreeWidgetItem
+        :rtype: studioqt.CombinedWidgetItem
         """
         return self.treeWidget().itemFromIndex(index)
 
@@ -165,29 +165,25 @@ class CombinedListView(CombinedItemViewMixin, QtWidgets.QListView):
         Inserts the item at row in the top level in the view.
 
         :type row: int
-        :type item: QtWidgets.QTreeWidgetItem
+        :type item: studioqt.CombinedWidgetItem
         :rtype: None
         """
-        self.treeWidget().insertTopLevelItem(row, item)
+        self.treeWidget().insertItems(row, [item])
 
     def takeItems(self, items):
         """
         Removes and returns the items from the view
 
-        :type items: list[QtWidgets.QTreeWidgetItem]
-        :rtype: list[QtWidgets.QTreeWidgetItem]
+        :type items: list[studioqt.CombinedWidgetItem]
+        :rtype: list[studioqt.CombinedWidgetItem]
         """
-        for item in items:
-            row = self.treeWidget().indexOfTopLevelItem(item)
-            self.treeWidget().takeTopLevelItem(row)
-
-        return items
+        return self.treeWidget().takeItems(items)
 
     def selectedItem(self):
         """
         Return the last selected non-hidden item.
 
-        :rtype: QtWidgets.QTreeWidgetItem
+        :rtype: studioqt.CombinedWidgetItem
         """
         return self.treeWidget().selectedItem()
 
@@ -195,7 +191,7 @@ class CombinedListView(CombinedItemViewMixin, QtWidgets.QListView):
         """
         Return a list of all selected non-hidden items.
 
-        :rtype: list[QtWidgets.QTreeWidgetItem]
+        :rtype: list[studioqt.CombinedWidgetItem]
         """
         return self.treeWidget().selectedItems()
 
@@ -219,8 +215,7 @@ class CombinedListView(CombinedItemViewMixin, QtWidgets.QListView):
         :rtype: None
         """
         self.treeWidget().blockSignals(True)
-        for item in items:
-            self.treeWidget().setItemSelected(item, value)
+        self.treeWidget().setItemsSelected(items, value, scrollTo=False)
         self.treeWidget().blockSignals(False)
 
     def moveItems(self, items, itemAt):
@@ -391,6 +386,29 @@ class CombinedListView(CombinedItemViewMixin, QtWidgets.QListView):
     # Support for drag and drop
     # -----------------------------------------------------------------------
 
+    def paintEvent(self, event):
+        """
+        Reimplemented to record the paint stats for the combined widget.
+
+        :type event: QtGui.QPaintEvent
+        :rtype: None
+        """
+        combinedWidget = self.combinedWidget()
+        combinedWidget.beginPaintFrame(event.rect())
+
+        try:
+            QtWidgets.QListView.paintEvent(self, event)
+        finally:
+            combinedWidget.endPaintFrame()
+
+        if combinedWidget.isPaintStatsVisible():
+            painter = QtGui.QPainter(self.viewport())
+            try:
+                rect = self.viewport().rect()
+                combinedWidget.paintPaintStats(painter, rect)
+            finally:
+                painter.end()
+
     def rowAt(self, pos):
         """
         Return the row for the given pos.
@@ -444,10 +462,15 @@ class CombinedListView(CombinedItemViewMixin, QtWidgets.QListView):
         :type path: str
         :rtype: studioqt.ListWidgetItem
         """
-        for item in self.items():
-            path_ = item.url().path()
-            if path_ and path_ == path:
-                return item
+        item = self.combinedWidget().itemFromId(path)
+
+        if item is None:
+            for item_ in self.items():
+                path_ = item_.url().path()
+                if path_ and path_ == path:
+                    return item_
+
+        return item
 
     def setDropEnabled(self, value):
         """
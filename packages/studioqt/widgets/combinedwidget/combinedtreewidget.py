@@ -11,6 +11,7 @@
 # You should have received a copy of the GNU Lesser General Public
 # License along with this library. If not, see <http://www.gnu.org/licenses/>.
 
+import re
 import logging
 
 from functools import partial
@@ -22,31 +23,83 @@ from studioqt import QtGui
 from studioqt import QtCore
 from studioqt import QtWidgets
 
+from .combineditemstore import itemStore
+from .combineditemmodel import CombinedItemModel, rowRanges
+from .combineditemproxymodel import CombinedItemProxyModel
 from .combineditemviewmixin import CombinedItemViewMixin
 
 
 logger = logging.getLogger(__name__)
 
 
-class CombinedTreeWidget(CombinedItemViewMixin, QtWidgets.QTreeWidget):
+def naturalSortKey(text):
+    """
+    Return a key for sorting the given text in the way that humans expect.
+
+    Example:
+        sorted(["item10", "item2"], key=naturalSortKey)
+        # ['item2', 'item10']
+
+    :type text: str
+    :rtype: tuple
+    """
+    key = []
+
+    for part in re.split("([0-9]+)", text.lower()):
+        if part.isdigit():
+            key.append((0, int(part)))
+        elif part:
+            key.append((1, part))
+
+    return tuple(key)
+
+
+class CombinedTreeWidget(CombinedItemViewMixin, QtWidgets.QTreeView):
+    """
+    The table view for the items of a combined widget.
+
+    The items are kept in a CombinedItemModel and the view provides the
+    item based methods that the combined widget and the list view use.
+    The views show the items through a CombinedItemProxyModel which
+    keeps the sorted order and hides the hidden items, so the rows of
+    the views are proxy rows.
+    """
+
+    NUMERIC_SORT_COLUMNS = ["Modified", "Custom Order", "Search Order"]
+
+    # The column that is sorted by the modified time of the items
+    MTIME_COLUMN = "Modified"
+
+    itemClicked = QtCore.Signal(object)
+    itemDoubleClicked = QtCore.Signal(object)
+    itemSelectionChanged = QtCore.Signal()
 
     def __init__(self, *args):
-        QtWidgets.QTreeWidget.__init__(self, *args)
+        QtWidgets.QTreeView.__init__(self, *args)
         CombinedItemViewMixin.__init__(self)
 
+        self._model = CombinedItemModel(self)
+
+        self._proxyModel = CombinedItemProxyModel(self)
+        self._proxyModel.setSourceModel(self._model)
+
+        self.setModel(self._proxyModel)
+
         self._sortColumn = None
+        self._sortKeys = {}
 
         self._groupItems = []
+        self._groupFromItem = {}
         self._groupColumn = None
         self._groupOrder = QtCore.Qt.AscendingOrder
 
-        self._headerLabels = []
         self._hiddenColumns = {}
         self._validGroupByColumns = []
 
         self.setAutoScroll(False)
         self.setMouseTracking(True)
-        self.setSortingEnabled(True)
+        self.setSortingEnabled(False)
+        self.setRootIsDecorated(False)
         self.setSelectionMode(QtWidgets.QListWidget.ExtendedSelection)
         self.setVerticalScrollMode(QtWidgets.QAbstractItemView.ScrollPerPixel)
 
@@ -54,6 +107,12 @@ class CombinedTreeWidget(CombinedItemViewMixin, QtWidgets.QTreeWidget):
         header.setContextMenuPolicy(QtCore.Qt.CustomContextMenu)
         header.customContextMenuRequested.connect(self.showHeaderMenu)
 
+        self.clicked.connect(self._indexClicked)
+        self.doubleClicked.connect(self._indexDoubleClicked)
+
+        selectionModel = self.selectionModel()
+        selectionModel.selectionChanged.connect(self._selectionChanged)
+
         self.itemClicked.connect(self._itemClicked)
         self.itemDoubleClicked.connect(self._itemDoubleClicked)
 
@@ -61,6 +120,29 @@ class CombinedTreeWidget(CombinedItemViewMixin, QtWidgets.QTreeWidget):
         item = self.itemFromIndex(index)
         item.paintRow(painter, options, index)
 
+    def paintEvent(self, event):
+        """
+        Reimplemented to record the paint stats for the combined widget.
+
+        :type event: QtGui.QPaintEvent
+        :rtype: None
+        """
+        combinedWidget = self.combinedWidget()
+        combinedWidget.beginPaintFrame(event.rect())
+
+        try:
+            QtWidgets.QTreeView.paintEvent(self, event)
+        finally:
+            combinedWidget.endPaintFrame()
+
+        if combinedWidget.isPaintStatsVisible():
+            painter = QtGui.QPainter(self.viewport())
+            try:
+                rect = self.viewport().rect()
+                combinedWidget.paintPaintStats(painter, rect)
+            finally:
+                painter.end()
+
     def settings(self):
         """
         Return the current state of the widget.
@@ -104,11 +186,43 @@ class CombinedTreeWidget(CombinedItemViewMixin, QtWidgets.QTreeWidget):
 
         return settings
 
+    def _indexClicked(self, index):
+        """
+        Triggered when the user clicks on an index.
+
+        :type index: QtCore.QModelIndex
+        :rtype: None
+        """
+        item = self.itemFromIndex(index)
+        if item:
+            self.itemClicked.emit(item)
+
+    def _indexDoubleClicked(self, index):
+        """
+        Triggered when the user double clicks on an index.
+
+        :type index: QtCore.QModelIndex
+        :rtype: None
+        """
+        item = self.itemFromIndex(index)
+        if item:
+            self.itemDoubleClicked.emit(item)
+
+    def _selectionChanged(self, selected, deselected):
+        """
+        Triggered when the selection of the selection model has changed.
+
+        :type selected: QtCore.QItemSelection
+        :type deselected: QtCore.QItemSelection
+        :rtype: None
+        """
+        self.itemSelectionChanged.emit()
+
     def _itemClicked(self, item):
         """
         Triggered when the user clicks on an item.
 
-        :type item: QtWidgets.QTreeWidgetItem
+        :type item: studioqt.CombinedWidgetItem
         :rtype: None
         """
         item.clicked()
@@ -117,34 +231,236 @@ class CombinedTreeWidget(CombinedItemViewMixin, QtWidgets.QTreeWidget):
         """
         Triggered when the user double clicks on an item.
 
-        :type item: QtWidgets.QTreeWidgetItem
+        :type item: studioqt.CombinedWidgetItem
         :rtype: None
         """
         item.doubleClicked()
 
-    def clear(self, *args):
+    def model(self):
+        """
+        Return the item model for the view.
+
+        :rtype: CombinedItemModel
+        """
+        return self._model
+
+    def proxyModel(self):
+        """
+        Return the sort and filter model that is shown by the views.
+
+        :rtype: CombinedItemProxyModel
+        """
+        return self._proxyModel
+
+    def clear(self):
+        """
+        Remove all the items and the group items from the view.
+
+        :rtype: None
+        """
+        self.setItems([])
+
+    def setItems(self, items):
         """
-        Reimplementing so that all dirty objects can be removed.
+        Replace all the items in the view with the given items.
 
-        :param args:
+        :type items: list[studioqt.CombinedWidgetItem]
         :rtype: None
         """
-        QtWidgets.QTreeWidget.clear(self, *args)
-        self.cleanDirtyObjects()
+        for item in self._model.items():
+            item.setTreeWidget(None)
+
+        self._currentItem = None
+        self._hoverItem = None
+        self._currentSelection = []
+
         self._groupItems = []
+        self._groupFromItem = {}
+        self._sortKeys = {}
+
+        for item in items:
+            item.setTreeWidget(self)
+
+        self._model.setItems(items)
+
+        self.combinedWidget().updateUniformItemSizes()
+
+    def addItems(self, items):
+        """
+        Add the given items after the last row.
+
+        :type items: list[studioqt.CombinedWidgetItem]
+        :rtype: None
+        """
+        self.insertItems(self._model.rowCount(), items)
+
+    def insertItems(self, row, items):
+        """
+        Insert the given items before the item at the given view row.
+
+        :type row: int
+        :type items: list[studioqt.CombinedWidgetItem]
+        :rtype: None
+        """
+        for item in items:
+            item.setTreeWidget(self)
+
+        sourceRow = self._proxyModel.sourceRow(row)
+
+        if sourceRow < 0:
+            sourceRow = self._model.rowCount()
+
+        self._model.insertItems(sourceRow, items)
+
+    def takeItems(self, items):
+        """
+        Remove the given items from the view and return them.
+
+        :type items: list[studioqt.CombinedWidgetItem]
+        :rtype: list[studioqt.CombinedWidgetItem]
+        """
+        self._model.removeItems(items)
+
+        for item in items:
+            item.setTreeWidget(None)
+            self.clearSortKeys(item)
+
+        if self._currentItem in items:
+            self._currentItem = None
+
+        return items
+
+    def itemFromIndex(self, index):
+        """
+        Return the item for the given index.
+
+        :type index: QtCore.QModelIndex
+        :rtype: studioqt.CombinedWidgetItem or None
+        """
+        return self._proxyModel.itemFromIndex(index)
+
+    def indexFromItem(self, item, column=0):
+        """
+        Return the index for the given item.
+
+        :type item: studioqt.CombinedWidgetItem
+        :type column: int
+        :rtype: QtCore.QModelIndex
+        """
+        return self._proxyModel.indexFromItem(item, column)
+
+    def itemAt(self, pos):
+        """
+        Return the item at the given position in the viewport.
+
+        :type pos: QtCore.QPoint
+        :rtype: studioqt.CombinedWidgetItem or None
+        """
+        return self.itemFromIndex(self.indexAt(pos))
+
+    def scrollToItem(self, item, hint=QtWidgets.QAbstractItemView.EnsureVisible):
+        """
+        Scroll the view so that the given item is visible.
+
+        :type item: studioqt.CombinedWidgetItem
+        :type hint: QtWidgets.QAbstractItemView.ScrollHint
+        :rtype: None
+        """
+        index = self.indexFromItem(item)
+        if index.isValid():
+            self.scrollTo(index, hint)
+
+    def columnCount(self):
+        """
+        Return the number of columns.
+
+        :rtype: int
+        """
+        return self._model.columnCount()
+
+    def sortColumn(self):
+        """
+        Return the column the items are sorted by.
+
+        :rtype: int
+        """
+        return self.header().sortIndicatorSection()
+
+    def isItemHidden(self, item):
+        """
+        Return True if the given item is hidden.
+
+        :type item: studioqt.CombinedWidgetItem
+        :rtype: bool
+        """
+        return self._model.isItemHidden(item)
+
+    def setItemsHidden(self, items, value):
+        """
+        Set the given items hidden in both views.
+
+        :type items: list[studioqt.CombinedWidgetItem]
+        :type value: bool
+        :rtype: list[studioqt.CombinedWidgetItem]
+        """
+        return self.combinedWidget().setItemsHidden(items, value)
+
+    def isItemSelected(self, item):
+        """
+        Return True if the given item is selected.
+
+        :type item: studioqt.CombinedWidgetItem
+        :rtype: bool
+        """
+        index = self.indexFromItem(item)
+        return index.isValid() and self.selectionModel().isSelected(index)
+
+    def setItemSelected(self, item, value):
+        """
+        Set the selected state for the given item.
+
+        :type item: studioqt.CombinedWidgetItem
+        :type value: bool
+        :rtype: None
+        """
+        if item:
+            self.setItemsSelected([item], value, scrollTo=False)
 
     def setItemsSelected(self, items, value, scrollTo=True):
         """
         Select the given items.
 
-        :type items: list[studioqt.CombinedWidget]
+        The rows are selected with one selection range for each run of
+        consecutive rows.
+
+        :type items: list[studioqt.CombinedWidgetItem]
         :type value: bool
         :type scrollTo: bool
 
         :rtype: None
         """
-        for item in items:
-            self.setItemSelected(item, value)
+        proxyModel = self._proxyModel
+
+        rows = [proxyModel.rowFromItem(item) for item in items]
+        rows = [row for row in rows if row >= 0]
+
+        if not rows:
+            return
+
+        lastColumn = max(proxyModel.columnCount() - 1, 0)
+
+        selection = QtCore.QItemSelection()
+        for first, last in rowRanges(rows):
+            topLeft = proxyModel.index(first, 0)
+            bottomRight = proxyModel.index(last, lastColumn)
+            selection.select(topLeft, bottomRight)
+
+        if value:
+            flags = QtCore.QItemSelectionModel.Select
+        else:
+            flags = QtCore.QItemSelectionModel.Deselect
+
+        self.selectionModel().select(selection, flags)
 
         if scrollTo:
             self.combinedWidget().scrollToItem(items[-1])
@@ -169,11 +485,17 @@ class CombinedTreeWidget(CombinedItemViewMixin, QtWidgets.QTreeWidget):
         :rtype: list[studioqt.CombinedWidgetItem]
         """
         items = []
-        items_ = QtWidgets.QTreeWidget.selectedItems(self)
+        rows = set()
 
-        for item in items_:
-            if not isinstance(item, studioqt.CombinedWidgetItemGroup):
-                items.append(item)
+        for index in self.selectionModel().selectedIndexes():
+            row = index.row()
+
+            if row not in rows:
+                rows.add(row)
+
+                item = self._proxyModel.item(row)
+                if not isinstance(item, studioqt.CombinedWidgetItemGroup):
+                    items.append(item)
 
         return items
 
@@ -213,27 +535,13 @@ class CombinedTreeWidget(CombinedItemViewMixin, QtWidgets.QTreeWidget):
 
     def _items(self):
         """
-        Return a list of all the items in the tree widget.
+        Return a list of all the items including the group items.
 
-        :rtype: lsit[studioqt.TreeWidgetItem]
-        """
-        return self.findItems(
-            "*",
-            QtCore.Qt.MatchWildcard | QtCore.Qt.MatchRecursive
-        )
+        The items are in the sorted order and include the hidden items.
 
-    def takeTopLevelItems(self):
+        :rtype: lsit[studioqt.TreeWidgetItem]
         """
-        Take all items from the tree widget.
-
-        :rtype: list[QtWidgets.QTreeWidgetItem]
-        """
-        items = []
-        for item in self._items():
-            # For some reason its faster to take from index 1.
-            items.append(self.takeTopLevelItem(1))
-        items.append(self.takeTopLevelItem(0))
-        return items
+        return self._proxyModel.items()
 
     def textFromColumn(self, column, split=None, duplicates=False):
         """
@@ -284,13 +592,7 @@ class CombinedTreeWidget(CombinedItemViewMixin, QtWidgets.QTreeWidget):
 
         :rtype: list[str]
         """
-        labels = []
-
-        for column in range(self.columnCount()):
-            label = self.headerItem().text(column)
-            labels.append(label)
-
-        return labels
+        return self._model.headerLabels()
 
     def updateData(self):
         """
@@ -310,22 +612,24 @@ class CombinedTreeWidget(CombinedItemViewMixin, QtWidgets.QTreeWidget):
         :rtype: str
         """
         if column is not None:
-            return self.headerItem().text(column)
+            return self._model.labelFromColumn(column)
 
-    def setHeaderLabels(self, *args):
+    def setHeaderLabels(self, labels):
         """
         Set the header for each item in the given label list.
 
-        :type args:
+        :type labels: list[str]
         :rtype: None
         """
         columnSettings = self.columnSettings()
 
-        QtWidgets.QTreeWidget.setHeaderLabels(self, *args)
+        self._model.setHeaderLabels(labels)
+
+        # The search text is made from the text of all the columns
+        for item in self._model.items():
+            item.clearSearchText()
 
-        self.updateHeaderLabels()
         self.updateColumnHidden()
-        self.updateData()
 
         self.setColumnSettings(columnSettings)
 
@@ -337,7 +641,7 @@ class CombinedTreeWidget(CombinedItemViewMixin, QtWidgets.QTreeWidget):
         :rtype: None
         """
         labels = self.headerLabels()
-        if label not in labels:
+        if label and label not in labels:
             labels.append(label)
             self.setHeaderLabels(labels)
 
@@ -347,19 +651,7 @@ class CombinedTreeWidget(CombinedItemViewMixin, QtWidgets.QTreeWidget):
 
         :rtype: str
         """
-        return self._headerLabels
-
-    def updateHeaderLabels(self):
-        """
-        Add a column in the header for the data in the items.
-
-        :rtype: None
-        """
-        self._headerLabels = []
-
-        for column in range(self.columnCount()):
-            label = self.headerItem().text(column)
-            self._headerLabels.append(label)
+        return self._model.headerLabels()
 
     def columnFromLabel(self, label):
         """
@@ -368,13 +660,7 @@ class CombinedTreeWidget(CombinedItemViewMixin, QtWidgets.QTreeWidget):
         :type label: str
         :rtype: int
         """
-        if label not in self._headerLabels:
-            self.updateHeaderLabels()
-
-        try:
-            return self._headerLabels.index(label)
-        except ValueError:
-            return -1
+        return self._model.columnFromLabel(label)
 
     def showAllColumns(self):
         """
@@ -415,7 +701,7 @@ class CombinedTreeWidget(CombinedItemViewMixin, QtWidgets.QTreeWidget):
         label = self.labelFromColumn(column)
         self._hiddenColumns[label] = value
 
-        QtWidgets.QTreeWidget.setColumnHidden(self, column, value)
+        QtWidgets.QTreeView.setColumnHidden(self, column, value)
 
         # Make sure the column is not collapsed
         width = self.columnWidth(column)
@@ -489,11 +775,8 @@ class CombinedTreeWidget(CombinedItemViewMixin, QtWidgets.QTreeWidget):
 
         :rtype: list[studioqt.CombinedWidgetItem]
         """
-        items = self.items()
         column = self.columnFromLabel("Custom Order")
-        customOrder = sorted(items, key=lambda item: item.text(column))
-
-        return customOrder
+        return self.itemsSortedByColumn(column, QtCore.Qt.AscendingOrder)
 
     def moveItems(self, items, itemAt):
         """
@@ -521,8 +804,7 @@ class CombinedTreeWidget(CombinedItemViewMixin, QtWidgets.QTreeWidget):
         self.setItemsCustomOrder(orderedItems)
         self.sortByColumn(column, QtCore.Qt.AscendingOrder)
 
-        for item in items:
-            self.setItemSelected(item, True)
+        self.setItemsSelected(items, True, scrollTo=False)
 
     # ----------------------------------------------------------------------
     # Support for menus
@@ -785,14 +1067,15 @@ class CombinedTreeWidget(CombinedItemViewMixin, QtWidgets.QTreeWidget):
             groupColumn = self.columnFromLabel(groupColumn)
 
         self._sortColumn = sortColumn
-        self.setSortingEnabled(True)
 
         sortColumnLabel = self.labelFromColumn(sortColumn)
         if sortColumnLabel == "Custom Order":
             sortOrder = QtCore.Qt.AscendingOrder
 
         sortOrder = self.intToSortOrder(sortOrder)
-        QtWidgets.QTreeWidget.sortByColumn(self, sortColumn, sortOrder)
+        self.header().setSortIndicator(sortColumn, sortOrder)
+
+        items = self.itemsSortedByColumn(sortColumn, sortOrder)
 
         if groupOrder is False:
             groupOrder = self.groupOrder()
@@ -805,7 +1088,102 @@ class CombinedTreeWidget(CombinedItemViewMixin, QtWidgets.QTreeWidget):
         self._groupOrder = groupOrder
         self._groupColumn = groupColumn
 
-        self._groupByColumn(groupColumn, groupOrder)
+        self._groupByColumn(groupColumn, groupOrder, items=items)
+
+    def sortKeyFromText(self, label, text):
+        """
+        Return the sort key for the given text in the given column label.
+
+        Numeric values are sorted before text values and empty values
+        are always sorted last.
+
+        :type label: str
+        :type text: str or None
+        :rtype: tuple
+        """
+        text = unicode(text or "")
+
+        if label in self.NUMERIC_SORT_COLUMNS:
+            try:
+                return 0, float(text)
+            except ValueError:
+                pass
+
+        if text:
+            return 1, naturalSortKey(text)
+
+        return 2, ()
+
+    def sortKeys(self, column, items):
+        """
+        Return the sort keys for the given items in the given column.
+
+        The keys are cached per column label and are reused until the
+        data for the item changes. The text for the missing keys is read
+        from the shared item store in one scan of the column. The modified
+        column uses the modified time of the item when it has been set.
+
+        :type column: int
+        :type items: list[studioqt.CombinedWidgetItem]
+        :rtype: dict
+        """
+        label = self.labelFromColumn(column)
+        keys = self._sortKeys.setdefault(label, {})
+
+        missing = [item for item in items if item not in keys]
+
+        if missing:
+            store = itemStore()
+            rows = [item.storeRow() for item in missing]
+
+            texts = store.values(label, rows, None)
+            sortTexts = store.values(label, rows, None, role=store.SORT_TEXT)
+
+            if label == self.MTIME_COLUMN:
+                mtimes = store.mtimes(rows)
+            else:
+                mtimes = [None] * len(rows)
+
+            for item, text, sortText, mtime in zip(missing, texts, sortTexts, mtimes):
+                if mtime is None:
+                    keys[item] = self.sortKeyFromText(label, sortText or text)
+                else:
+                    keys[item] = 0, mtime
+
+        return keys
+
+    def clearSortKeys(self, item=None):
+        """
+        Clear the cached sort keys for the given item or for all items.
+
+        :type item: studioqt.CombinedWidgetItem or None
+        :rtype: None
+        """
+        if item is None:
+            self._sortKeys = {}
+        else:
+            for keys in self._sortKeys.values():
+                keys.pop(item, None)
+
+    def itemsSortedByColumn(self, column, order, items=None):
+        """
+        Return the items sorted by the given column and order.
+
+        :type column: int
+        :type order: QtCore.Qt.SortOrder
+        :type items: list[studioqt.CombinedWidgetItem] or None
+        :rtype: list[studioqt.CombinedWidgetItem]
+        """
+        if items is None:
+            items = self.items()
+
+        if column is None or column < 0:
+            return list(items)
+
+        keys = self.sortKeys(column, items)
+        reverse = order == QtCore.Qt.DescendingOrder
+
+        return sorted(items, key=keys.__getitem__, reverse=reverse)
 
     def createSortByMenu(self):
         """
@@ -910,18 +1288,96 @@ class CombinedTreeWidget(CombinedItemViewMixin, QtWidgets.QTreeWidget):
         :rtype: studioqt.CombinedWidgetItemGroup
         """
         groupItem = self.createGroupItem(text, children)
-        self.addTopLevelItem(groupItem)
+        self.addItems([groupItem])
         self._groupItems.append(groupItem)
+        self.combinedWidget().updateUniformItemSizes()
         return groupItem
 
-    def refreshGroupBy(self):
+    def takeItemsFromGroups(self, items):
         """
-        Refresh the grouping of the current group column.
+        Take the given items from the groups they belong to.
+
+        The groups are updated so that they hide when they are left
+        without any visible children.
 
+        :type items: list[studioqt.CombinedWidgetItem]
         :rtype: None
         """
-        for groupItem in self._groupItems:
-            groupItem.updateChildren()
+        items = set(items)
+        groupItems = set()
+
+        for item in items:
+            groupItem = self._groupFromItem.pop(item, None)
+            if groupItem is not None:
+                groupItems.add(groupItem)
+
+        for groupItem in groupItems:
+            children = groupItem.children()
+            groupItem.setChildren([c for c in children if c not in items])
+
+        self.updateGroupItemsHidden(groupItems)
+
+    def groupItems(self):
+        """
+        Return the group items that are currently in the tree.
+
+        :rtype: list[studioqt.CombinedWidgetItemGroup]
+        """
+        return self._groupItems
+
+    def refreshGroupBy(self, items=None):
+        """
+        Refresh the visibility of the group items.
+
+        When items are given only the groups containing those items
+        are updated.
+
+        :type items: list[studioqt.CombinedWidgetItem] or None
+        :rtype: None
+        """
+        if items is None:
+            groupItems = self._groupItems
+        else:
+            groupItems = set()
+            for item in items:
+                groupItem = self._groupFromItem.get(item)
+                if groupItem is not None:
+                    groupItems.add(groupItem)
+
+        self.updateGroupItemsHidden(groupItems)
+
+    def updateGroupItemsHidden(self, groupItems):
+        """
+        Hide the given group items that have no visible children.
+
+        The group items are shown and hidden in one batch each, so the
+        visible rows are only updated once for each.
+
+        :type groupItems: list[studioqt.CombinedWidgetItemGroup]
+        :rtype: None
+        """
+        hidden, shown = self._groupItemsHidden(groupItems)
+
+        self.setItemsHidden(hidden, True)
+        self.setItemsHidden(shown, False)
+
+    def _groupItemsHidden(self, groupItems):
+        """
+        Return the group items that should be hidden and shown.
+
+        :type groupItems: list[studioqt.CombinedWidgetItemGroup]
+        :rtype: (list[studioqt.CombinedWidgetItemGroup], list[studioqt.CombinedWidgetItemGroup])
+        """
+        hidden = []
+        shown = []
+
+        for groupItem in groupItems:
+            if groupItem.childrenHidden():
+                hidden.append(groupItem)
+            else:
+                shown.append(groupItem)
+
+        return hidden, shown
 
     def itemsGroupByColumn(self, groupColumn, groupOrder, items=None):
         """
@@ -941,8 +1397,7 @@ class CombinedTreeWidget(CombinedItemViewMixin, QtWidgets.QTreeWidget):
             groupColumn = self.columnFromLabel(groupColumn)
 
         if groupColumn:
-            reverse = groupOrder == QtCore.Qt.DescendingOrder
-            items_ = sorted(items, key=lambda item: item.text(groupColumn).lower(), reverse=reverse)
+            items_ = self.itemsSortedByColumn(groupColumn, groupOrder, items=items)
 
             for item in items_:
                 text = item.displayText(groupColumn)
@@ -978,48 +1433,72 @@ class CombinedTreeWidget(CombinedItemViewMixin, QtWidgets.QTreeWidget):
 
         self.sortByColumn(sortColumn, sortOrder, groupColumn=groupColumn, groupOrder=groupOrder)
 
-    def _groupByColumn(self, groupColumn, groupOrder):
+    def _groupByColumn(self, groupColumn, groupOrder, items=None):
         """
         Group the items on the data in the given column.
 
-        Note: The complexity of this method needs to be simplified!
+        The existing group items are reused. The group items that are no
+        longer needed are removed, the new group items are added and the
+        rows are then moved to their new order in one layout change.
 
         :type groupColumn: int
         :type groupOrder: int
+        :type items: list[studioqt.CombinedWidgetItem] or None
         :rtype: None
         """
         if isinstance(groupColumn, basestring):
-            column = self.columnFromLabel(groupColumn)
+            groupColumn = self.columnFromLabel(groupColumn)
 
-        self._groupItems = []
         self._groupColumn = groupColumn
 
-        groupItems = self.itemsGroupByColumn(groupColumn, groupOrder)
+        groupItems = self.itemsGroupByColumn(groupColumn, groupOrder, items=items)
 
-        selectedItems = self.selectedItems()
-        self.setSortingEnabled(False)
-        self.takeTopLevelItems()
+        oldGroupItems = {}
+        for groupItem in self._groupItems:
+            oldGroupItems.setdefault(groupItem.name(), groupItem)
 
-        for groupText in groupItems.keys():
+        self._groupItems = []
+        self._groupFromItem = {}
 
-            children = [item[0] for item in groupItems[groupText]]
+        order = []
+        newItems = []
 
-            if groupColumn is not None:
-                groupItem = self.addGroupItem(groupText, children)
+        for groupText, children in groupItems.items():
 
-            for item, isHidden in groupItems[groupText]:
-                self.addTopLevelItem(item)
-                item.setHidden(isHidden)
+            groupItem = None
 
             if groupColumn is not None:
-                groupItem.updateChildren()
+                groupItem = oldGroupItems.pop(groupText, None)
+
+                if groupItem is None:
+                    groupItem = self.createGroupItem(groupText, [])
+                    newItems.append(groupItem)
+
+                groupItem.setChildren([child for child, isHidden in children])
+
+                self._groupItems.append(groupItem)
+                order.append(groupItem)
+
+            for item, isHidden in children:
+                self._groupFromItem[item] = groupItem
+                order.append(item)
+
+        self.setSortingEnabled(False)
+
+        self.takeItems(list(oldGroupItems.values()))
+        self.addItems(newItems)
+
+        # The hidden state of the groups is set before the rows are
+        # sorted, so the proxy model updates the visible rows once and
+        # the selection moves with the items.
+        hidden, shown = self._groupItemsHidden(self._groupItems)
+
+        self._model.setItemsHidden(hidden, True)
+        self._model.setItemsHidden(shown, False)
 
-        if groupColumn is None:
-            for groupItem in self._groupItems:
-                groupItem.setHidden(True)
+        self._proxyModel.setItemOrder(order)
 
-        if selectedItems:
-            self.setItemsSelected(selectedItems, True)
+        self.combinedWidget().updateUniformItemSizes()
 
     def setValidGroupByColumns(self, columns):
         self._validGroupByColumns = columns
@@ -1100,7 +1579,7 @@ class CombinedTreeWidget(CombinedItemViewMixin, QtWidgets.QTreeWidget):
         :rtype: None
         """
         CombinedItemViewMixin.mouseMoveEvent(self, event)
-        QtWidgets.QTreeWidget.mouseMoveEvent(self, event)
+        QtWidgets.QTreeView.mouseMoveEvent(self, event)
 
     def mouseReleaseEvent(self, event):
         """
@@ -1110,5 +1589,5 @@ class CombinedTreeWidget(CombinedItemViewMixin, QtWidgets.QTreeWidget):
         :rtype: None
         """
         CombinedItemViewMixin.mouseReleaseEvent(self, event)
-        QtWidgets.QTreeWidget.mouseReleaseEvent(self, event)
+        QtWidgets.QTreeView.mouseReleaseEvent(self, event)
 
@@ -12,6 +12,7 @@
 # License along with this library. If not, see <http://www.gnu.org/licenses/>.
 
 import os
+import time
 import logging
 
 from studioqt import QtGui
@@ -47,6 +48,9 @@ class CombinedWidget(QtWidgets.QWidget):
     DEFAULT_MIN_LIST_SIZE = 15
     DEFAULT_MIN_ICON_SIZE = 50
 
+    TEXT_CACHE_LIMIT = 10000
+    BACKGROUND_PRIORITY = 100000
+
     itemClicked = QtCore.Signal(object)
     itemDoubleClicked = QtCore.Signal(object)
 
@@ -67,6 +71,23 @@ class CombinedWidget(QtWidgets.QWidget):
         self._zoomAmount = self.DEFAULT_ZOOM_AMOUNT
         self._isItemTextVisible = True
 
+        self._itemSizeHint = None
+        self._itemSizeHintKey = None
+        self._uniformItemSizes = True
+
+        self._itemsById = {}
+        self._idFromItem = {}
+
+        self._textWidths = {}
+        self._elidedTexts = {}
+        self._fontMetrics = {}
+
+        self._paintRect = None
+        self._paintStartTime = None
+        self._paintStats = {}
+        self._paintStatsVisible = False
+        self.resetPaintStats()
+
         self._treeWidget = CombinedTreeWidget(self)
 
         self._listView = CombinedListView(self)
@@ -108,6 +129,284 @@ class CombinedWidget(QtWidgets.QWidget):
         self.itemDropped = self._listView.itemDropped
         self.itemSelectionChanged = self._treeWidget.itemSelectionChanged
 
+        self.listView().verticalScrollBar().valueChanged.connect(self._scrolled)
+        self.treeWidget().verticalScrollBar().valueChanged.connect(self._scrolled)
+
+    def _scrolled(self):
+        """
+        Triggered when the user scrolls either of the views.
+
+        Cancels the thumbnails that were requested for the items that
+        are no longer visible. The visible items request them again
+        when they are painted.
+
+        :rtype: None
+        """
+        studioqt.imageLoader().clear(owner=self)
+
+    def updateItem(self, item):
+        """
+        Repaint the given item in both views.
+
+        The viewports are updated instead of the item rects, since
+        asking a view for the rect of an index forces any pending item
+        layout, which is costly for large models with varying row sizes.
+        Paint events are merged, so this repaints each view once.
+
+        :type item: studioqt.CombinedWidgetItem
+        :rtype: None
+        """
+        index = self.treeWidget().indexFromItem(item)
+
+        if index.isValid():
+            self.listView().viewport().update()
+            self.treeWidget().viewport().update()
+
+    def fontMetrics(self, font):
+        """
+        Return the cached font metrics for the given font.
+
+        :type font: QtGui.QFont
+        :rtype: QtGui.QFontMetricsF
+        """
+        key = font.key()
+        metrics = self._fontMetrics.get(key)
+
+        if metrics is None:
+            metrics = QtGui.QFontMetricsF(font)
+            self._fontMetrics[key] = metrics
+
+        return metrics
+
+    def textWidth(self, text, font):
+        """
+        Return the cached width of the given text for the given font.
+
+        :type text: str
+        :type font: QtGui.QFont
+        :rtype: float
+        """
+        key = (text, font.key())
+        width = self._textWidths.get(key)
+
+        if width is None:
+            if len(self._textWidths) >= self.TEXT_CACHE_LIMIT:
+                self._textWidths = {}
+
+            width = self.fontMetrics(font).width(text)
+            self._textWidths[key] = width
+
+        return width
+
+    def elidedText(self, text, width, font):
+        """
+        Return the cached elided text for the given width and font.
+
+        :type text: str
+        :type width: int
+        :type font: QtGui.QFont
+        :rtype: str
+        """
+        key = (text, width, font.key())
+        elidedText = self._elidedTexts.get(key)
+
+        if elidedText is None:
+            if len(self._elidedTexts) >= self.TEXT_CACHE_LIMIT:
+                self._elidedTexts = {}
+
+            metrics = self.fontMetrics(font)
+            elidedText = metrics.elidedText(text, QtCore.Qt.ElideRight, width)
+            self._elidedTexts[key] = elidedText
+
+        return elidedText
+
+    def clearTextCache(self):
+        """
+        Clear the cached font metrics, text widths and elided text.
+
+        :rtype: None
+        """
+        self._textWidths = {}
+        self._elidedTexts = {}
+        self._fontMetrics = {}
+
+    # -----------------------------------------------------------------------
+    # Support for paint stats
+    # -----------------------------------------------------------------------
+
+    def beginPaintFrame(self, rect):
+        """
+        Triggered by the views before the items are painted.
+
+        :type rect: QtCore.QRect
+        :rtype: None
+        """
+        self._paintRect = QtCore.QRect(rect)
+        self._paintStartTime = time.time()
+
+        self._paintStats["paintedCount"] = 0
+        self._paintStats["skippedCount"] = 0
+
+    def endPaintFrame(self):
+        """
+        Triggered by the views after the items have been painted.
+
+        :rtype: None
+        """
+        if self._paintStartTime is None:
+            return
+
+        frameTime = (time.time() - self._paintStartTime) * 1000
+        stats = self._paintStats
+
+        stats["frameCount"] += 1
+        stats["frameTime"] = frameTime
+        stats["totalFrameTime"] += frameTime
+        stats["maxFrameTime"] = max(stats["maxFrameTime"], frameTime)
+
+        self._paintRect = None
+        self._paintStartTime = None
+
+    def isRectExposed(self, rect):
+        """
+        Return True if the given rect needs painting in the current frame.
+
+        :type rect: QtCore.QRect
+        :rtype: bool
+        """
+        if self._paintRect is None:
+            return True
+
+        return self._paintRect.intersects(rect)
+
+    def thumbnailPriority(self):
+        """
+        Return the image loader priority for a thumbnail requested now.
+
+        Thumbnails requested while the items are painted are loaded in
+        the order the items are painted, so the visible rows at the top
+        of the view are loaded first. Thumbnails requested outside of a
+        paint frame are loaded after all the visible rows.
+
+        :rtype: int
+        """
+        if self._paintRect is None:
+            return self.BACKGROUND_PRIORITY
+
+        return self._paintStats["paintedCount"]
+
+    def itemPainted(self):
+        """
+        Triggered by the item delegate when an item has been painted.
+
+        :rtype: None
+        """
+        self._paintStats["paintedCount"] += 1
+
+    def itemSkipped(self):
+        """
+        Triggered by the item delegate when an off screen item is skipped.
+
+        :rtype: None
+        """
+        self._paintStats["skippedCount"] += 1
+
+    def paintStats(self):
+        """
+        Return the paint stats for the views.
+
+        The frame times are in milliseconds and the painted and skipped
+        counts are for the last frame.
+
+        :rtype: dict
+        """
+        stats = dict(self._paintStats)
+
+        if stats["frameCount"]:
+            averageFrameTime = stats["totalFrameTime"] / stats["frameCount"]
+        else:
+            averageFrameTime = 0
+
+        stats["averageFrameTime"] = averageFrameTime
+
+        return stats
+
+    def resetPaintStats(self):
+        """
+        Reset the paint stats for the views.
+
+        :rtype: None
+        """
+        self._paintStats = {
+            "frameCount": 0,
+            "frameTime": 0,
+            "maxFrameTime": 0,
+            "totalFrameTime": 0,
+            "paintedCount": 0,
+            "skippedCount": 0,
+        }
+
+    def isPaintStatsVisible(self):
+        """
+        Return True if the paint stats are drawn over the views.
+
+        :rtype: bool
+        """
+        return self._paintStatsVisible
+
+    def setPaintStatsVisible(self, value):
+        """
+        Set if the paint stats are drawn over the views.
+
+        :type value: bool
+        :rtype: None
+        """
+        self._paintStatsVisible = value
+        self.resetPaintStats()
+
+        self.listView().viewport().update()
+        self.treeWidget().viewport().update()
+
+    def paintStatsText(self):
+        """
+        Return the paint stats as text for the debug overlay.
+
+        :rtype: str
+        """
+        stats = self.paintStats()
+
+        return "Frame: {frameTime:.1f}ms  Avg: {averageFrameTime:.1f}ms  " \
+               "Max: {maxFrameTime:.1f}ms  Painted: {paintedCount}  " \
+               "Skipped: {skippedCount}".format(**stats)
+
+    def paintPaintStats(self, painter, rect):
+        """
+        Draw the paint stats over the given rect of a view.
+
+        :type painter: QtGui.QPainter
+        :type rect: QtCore.QRect
+        :rtype: None
+        """
+        text = self.paintStatsText()
+
+        font = QtGui.QFont(self.font())
+        font.setPixelSize(11 * self.dpi())
+
+        height = 18 * self.dpi()
+        rect = QtCore.QRect(rect.x(), rect.bottom() - height, rect.width(), height)
+
+        painter.save()
+        try:
+            painter.setPen(QtGui.QPen(QtCore.Qt.NoPen))
+            painter.setBrush(QtGui.QBrush(QtGui.QColor(0, 0, 0, 150)))
+            painter.drawRect(rect)
+
+            painter.setFont(font)
+            painter.setPen(QtGui.QPen(QtGui.QColor(255, 255, 255)))
+            painter.drawText(rect.adjusted(5, 0, -5, 0), QtCore.Qt.AlignVCenter, text)
+        finally:
+            painter.restore()
+
     def _sortIndicatorChanged(self):
         """
         Triggered when the sort indicator changes.
@@ -241,7 +540,7 @@ class CombinedWidget(QtWidgets.QWidget):
         """
         Ensures that the item is visible.
 
-        :type item: QtWidgets.QTreeWidgetItem
+        :type item: studioqt.CombinedWidgetItem
         :rtype: None
         """
         if self.isTableView():
@@ -290,7 +589,7 @@ class CombinedWidget(QtWidgets.QWidget):
         if self.isIconView():
             return self.listView().itemAt(pos)
         else:
-            return self.treeView().itemAt(pos)
+            return self.treeWidget().itemAt(pos)
 
     def insertItems(self, items, itemAt=None):
         """
@@ -337,6 +636,7 @@ class CombinedWidget(QtWidgets.QWidget):
         Calls self.treeWidget().clear()
         """
         self.treeWidget().clear()
+        self.clearItemIds()
 
     def refresh(self):
         """
@@ -367,10 +667,10 @@ class CombinedWidget(QtWidgets.QWidget):
 
     def itemFromIndex(self, index):
         """
-        Return a pointer to the QTreeWidgetItem assocated with the given index.
+        Return a pointer to the item associated with the given index.
 
         :type index: QtCore.QModelIndex
-        :rtype: QtWidgets.QTreeWidgetItem
+        :rtype: studioqt.CombinedWidgetItem
         """
         return self._treeWidget.itemFromIndex(index)
 
@@ -430,6 +730,80 @@ class CombinedWidget(QtWidgets.QWidget):
         """
         return self.DEFAULT_TEXT_HEIGHT * self.dpi()
 
+    def itemSizeHint(self):
+        """
+        Return the size of an item for the current icon size.
+
+        The size is only calculated again when the zoom amount, dpi or
+        the text visibility has changed.
+
+        :rtype: QtCore.QSize
+        """
+        iconSize = self.iconSize()
+        isTextVisible = self.isItemTextVisible()
+        textHeight = self.itemTextHeight()
+
+        key = (iconSize.width(), iconSize.height(), isTextVisible, textHeight)
+
+        if key != self._itemSizeHintKey:
+            if isTextVisible:
+                w = iconSize.width()
+                h = iconSize.width() + textHeight
+                size = QtCore.QSize(w, h)
+            else:
+                size = QtCore.QSize(iconSize)
+
+            self._itemSizeHint = size
+            self._itemSizeHintKey = key
+
+        return self._itemSizeHint
+
+    def uniformItemSizes(self):
+        """
+        Return True if the uniform item size mode is enabled.
+
+        :rtype: bool
+        """
+        return self._uniformItemSizes
+
+    def setUniformItemSizes(self, value):
+        """
+        Set if all items share the same size when not grouped.
+
+        When enabled the views do not ask each item for its size hint,
+        so layout and scrolling only depend on the visible items.
+
+        :type value: bool
+        :rtype: None
+        """
+        self._uniformItemSizes = value
+        self.updateUniformItemSizes()
+
+    def isUniformItemSizes(self):
+        """
+        Return True if the views are currently using uniform item sizes.
+
+        Uniform item sizes are not used while the items are grouped, as
+        the group items have a different size.
+
+        :rtype: bool
+        """
+        return self._uniformItemSizes and not self.treeWidget().groupItems()
+
+    def updateUniformItemSizes(self):
+        """
+        Update the uniform item size mode of the views.
+
+        :rtype: None
+        """
+        value = self.isUniformItemSizes()
+
+        if self._listView.uniformItemSizes() != value:
+            self._listView.setUniformItemSizes(value)
+
+        if self._treeWidget.uniformRowHeights() != value:
+            self._treeWidget.setUniformRowHeights(value)
+
     def itemDelegate(self):
         """
         Return the item delegate for the views.
@@ -648,39 +1022,41 @@ class CombinedWidget(QtWidgets.QWidget):
         """
         data = {}
 
-        for item in self.items():
-            key = item.id()
+        for key, item in self._itemsById.items():
+            values = data.setdefault(key, {})
 
             for columnLabel in columnLabels:
-                column = self.treeWidget().columnFromLabel(columnLabel)
-                value = item.data(column, QtCore.Qt.EditRole)
-
-                data.setdefault(key, {})
-                data[key].setdefault(columnLabel, value)
+                value = item.data(columnLabel, QtCore.Qt.EditRole)
+                values.setdefault(columnLabel, value)
 
         return data
 
-    def setItemData(self, data):
+    def setItemData(self, data, sortEnabled=True):
         """
         Set the item data for all the current items.
 
+        Only the items in the given data are updated and the items are
+        sorted once if any of the values have changed.
+
         :type data: dict
+        :type sortEnabled: bool
         :rtype: None
         """
-        for item in self.items():
-            key = item.id()
-
-            if key in data:
+        changed = False
 
-                for column in data[key]:
-                    value = data[key].get(column)
+        for key, values in data.items():
+            item = self._itemsById.get(key)
 
-                    if value is not None:
-                        item.setText(column, value)
+            if item is None:
+                continue
 
-                item.updateData()
+            for columnLabel, value in values.items():
+                if value is not None and item.text(columnLabel) != value:
+                    item.setText(columnLabel, value)
+                    changed = True
 
-        self.refreshSortBy()
+        if changed and sortEnabled:
+            self.refreshSortBy()
 
     def updateColumns(self):
         """
@@ -688,7 +1064,8 @@ class CombinedWidget(QtWidgets.QWidget):
 
         :rtype: None
         """
-        self.treeWidget().updateHeaderLabels()
+        labels = self.columnLabels() + self.columnLabelsFromItems()
+        self.setColumnLabels(labels)
 
     def columnLabels(self):
         """
@@ -744,10 +1121,12 @@ class CombinedWidget(QtWidgets.QWidget):
         :type items: list[studioqt.CombinedWidgetItem]
         :rtype: None
         """
-        self._treeWidget.addTopLevelItems(items)
+        self._treeWidget.addItems(items)
         for item in items:
             item.updateData()
 
+        self.addItemIds(items)
+
     def addItem(self, item):
         """
         Add the item to the tree widget.
@@ -757,6 +1136,104 @@ class CombinedWidget(QtWidgets.QWidget):
         """
         self.addItems([item])
 
+    def removeItems(self, items):
+        """
+        Remove the given items from the combined widget.
+
+        :type items: list[studioqt.CombinedWidgetItem]
+        :rtype: None
+        """
+        treeWidget = self.treeWidget()
+
+        treeWidget.takeItems(items)
+        treeWidget.takeItemsFromGroups(items)
+        self.removeItemIds(items)
+
+    def removeItem(self, item):
+        """
+        Remove the given item from the combined widget.
+
+        :type item: studioqt.CombinedWidgetItem
+        :rtype: None
+        """
+        self.removeItems([item])
+
+    # ------------------------------------------------------------------------
+    # Support for finding items by id.
+    # ------------------------------------------------------------------------
+
+    def addItemIds(self, items):
+        """
+        Add the given items to the id lookup.
+
+        :type items: list[studioqt.CombinedWidgetItem]
+        :rtype: None
+        """
+        for item in items:
+            self.updateItemId(item)
+
+    def removeItemIds(self, items):
+        """
+        Remove the given items from the id lookup.
+
+        :type items: list[studioqt.CombinedWidgetItem]
+        :rtype: None
+        """
+        for item in items:
+            key = self._idFromItem.pop(item, None)
+            if self._itemsById.get(key) is item:
+                del self._itemsById[key]
+
+    def clearItemIds(self):
+        """
+        Clear the id lookup for all items.
+
+        :rtype: None
+        """
+        self._itemsById = {}
+        self._idFromItem = {}
+
+    def updateItemId(self, item):
+        """
+        Update the id lookup for the given item.
+
+        This should be called when the id of an item has changed.
+
+        :type item: studioqt.CombinedWidgetItem
+        :rtype: None
+        """
+        self.removeItemIds([item])
+
+        key = item.id()
+        if key:
+            self._itemsById[key] = item
+            self._idFromItem[item] = key
+
+    def itemFromId(self, key):
+        """
+        Return the item for the given id.
+
+        :type key: str
+        :rtype: studioqt.CombinedWidgetItem or None
+        """
+        return self._itemsById.get(key)
+
+    def itemsFromIds(self, keys):
+        """
+        Return the items for the given ids.
+
+        :type keys: list[str]
+        :rtype: list[studioqt.CombinedWidgetItem]
+        """
+        items = []
+
+        for key in keys:
+            item = self._itemsById.get(key)
+            if item is not None:
+                items.append(item)
+
+        return items
+
     def columnLabelsFromItems(self):
         """
         Return the column labels from all the items.
@@ -785,13 +1262,15 @@ class CombinedWidget(QtWidgets.QWidget):
         if sortEnabled:
             settings = self.treeWidget().sortBySettings()
 
-        self.treeWidget().clear()
-        self.treeWidget().addTopLevelItems(items)
+        self.treeWidget().setItems(items)
+
+        self.clearItemIds()
+        self.addItemIds(items)
 
         self.setColumnLabels(self.columnLabelsFromItems())
 
         if data:
-            self.setItemData(data)
+            self.setItemData(data, sortEnabled=not sortEnabled)
 
         if sortEnabled:
             self.treeWidget().setSortBySettings(settings)
@@ -882,11 +1361,19 @@ class CombinedWidget(QtWidgets.QWidget):
         """
         return self._treeWidget.model()
 
+    def proxyModel(self):
+        """
+        Return the sort and filter model that is shown by the views.
+
+        :rtype: QAbstractProxyModel
+        """
+        return self._treeWidget.proxyModel()
+
     def indexFromItem(self, item):
         """
         Return the QModelIndex assocated with the given item.
 
-        :type item: QtWidgets.QTreeWidgetItem.
+        :type item: studioqt.CombinedWidgetItem
         :rtype: QtCore.QModelIndex
         """
         return self._treeWidget.indexFromItem(item)
@@ -903,7 +1390,7 @@ class CombinedWidget(QtWidgets.QWidget):
         """
         Return the last selected non-hidden item.
 
-        :rtype: QtWidgets.QTreeWidgetItem
+        :rtype: studioqt.CombinedWidgetItem
         """
         return self._treeWidget.selectedItem()
 
@@ -911,7 +1398,7 @@ class CombinedWidget(QtWidgets.QWidget):
         """
         Return a list of all selected non-hidden items.
 
-        :rtype: list[QtWidgets.QTreeWidgetItem]
+        :rtype: list[studioqt.CombinedWidgetItem]
         """
         return self._treeWidget.selectedItems()
 
@@ -919,7 +1406,7 @@ class CombinedWidget(QtWidgets.QWidget):
         """
         Set the visibility of given item.
 
-        :type item: QtWidgets.QTreeWidgetItem
+        :type item: studioqt.CombinedWidgetItem
         :type value: bool
         :rtype: None
         """
@@ -929,12 +1416,58 @@ class CombinedWidget(QtWidgets.QWidget):
         """
         Set the visibility of given items.
 
-        :type items: list[QtWidgets.QTreeWidgetItem]
+        Only the items that need to change are updated and the proxy
+        model updates the visible rows once.
+
+        :type items: list[studioqt.CombinedWidgetItem]
         :type value: bool
-        :rtype: None
+        :rtype: list[studioqt.CombinedWidgetItem]
         """
-        for item in items:
-            self.setItemHidden(item, value)
+        changed = self.model().setItemsHidden(items, value)
+
+        if changed:
+            self.proxyModel().invalidateFilter()
+
+        return changed
+
+    def setVisibleItems(self, items):
+        """
+        Show only the given items and hide all the other items.
+
+        The visibility is compared against the current state so that only
+        the items that have changed are toggled and the visible rows are
+        updated once at the end. Returns the items that have changed.
+
+        :type items: list[studioqt.CombinedWidgetItem]
+        :rtype: list[studioqt.CombinedWidgetItem]
+        """
+        items = set(items)
+        model = self.model()
+
+        showItems = []
+        hideItems = []
+
+        for item in model.items():
+            if isinstance(item, studioqt.CombinedWidgetItemGroup):
+                continue
+
+            isHidden = model.isItemHidden(item)
+
+            if item in items:
+                if isHidden:
+                    showItems.append(item)
+            elif not isHidden:
+                hideItems.append(item)
+
+        model.setItemsHidden(showItems, False)
+        model.setItemsHidden(hideItems, True)
+
+        changed = showItems + hideItems
+
+        if changed:
+            self.proxyModel().invalidateFilter()
+
+        return changed
 
     def selectedPaths(self):
         """
@@ -942,11 +1475,7 @@ class CombinedWidget(QtWidgets.QWidget):
 
         :rtype: list[str]
         """
-        paths = []
-        for item in self.selectedItems():
-            path = item.url().toLocalFile()
-            paths.append(path)
-        return paths
+        return [item.id() for item in self.selectedItems()]
 
     def selectPaths(self, paths):
         """
@@ -955,10 +1484,8 @@ class CombinedWidget(QtWidgets.QWidget):
         :type paths: list[str]
         :rtype: None
         """
-        for item in self.items():
-            path = item.url().toLocalFile()
-            if path in paths:
-                item.setSelected(True)
+        items = self.itemsFromIds(paths)
+        self.treeWidget().setItemsSelected(items, True, scrollTo=False)
 
     def isIconView(self):
         """
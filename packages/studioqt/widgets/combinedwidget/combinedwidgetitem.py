@@ -15,47 +15,36 @@ import os
 import math
 import logging
 
+from functools import partial
+
 from studioqt import QtGui
 from studioqt import QtCore
 from studioqt import QtWidgets
 
 import studioqt
 
+from .combineditemstore import itemStore
+
 logger = logging.getLogger(__name__)
 
+# Most items set the same columns in the same order, so the items
+# share one tuple for each distinct column order.
+_textColumnOrders = {}
+
 
 class GlobalSignals(QtCore.QObject):
     """"""
     blendChanged = QtCore.Signal(float)
 
 
-class IconThread(QtCore.QThread):
-    """
-    A convenience class for loading an icon in a thread.
-    """
-
-    triggered = QtCore.Signal(object)
-
-    def __init__(self, path, *args):
-        QtCore.QThread.__init__(self, *args)
-
-        self._path = path
-
-    def run(self):
-        """
-        The starting point for the thread.
-
-        :rtype: None 
-        """
-        if self._path:
-            image = QtGui.QImage(str(self._path))
-            self.triggered.emit(image)
-
-
-class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
+class CombinedWidgetItem(object):
     """
     Combined Widget items are used to hold rows of information for a
     combined widget.
+
+    The items are plain objects and not Qt items. The text is kept in
+    the shared item store and the item model of the tree widget reads
+    it by the column label.
     """
     MAX_ICON_SIZE = 256
 
@@ -63,32 +52,74 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
     DEFAULT_PLAYHEAD_COLOR = QtGui.QColor(255, 255, 255, 220)
 
     THUMBNAIL_COLUMN = 0
-    ENABLE_THUMBNAIL_THREAD = False  # Still in development/testing
+    ENABLE_THUMBNAIL_THREAD = True
 
     _globalSignals = GlobalSignals()
     blendChanged = _globalSignals.blendChanged
 
-    def __init__(self, *args):
-        QtWidgets.QTreeWidgetItem.__init__(self, *args)
+    # Large libraries create an item for every file, so the attributes
+    # are kept in slots instead of a dict for each item.
+    __slots__ = (
+        "_url",
+        "_path",
+        "_size",
+        "_rect",
+        "textColumnOrder",
+        "_store",
+        "_row",
+        "_treeWidget",
+        "_icon",
+        "_fonts",
+        "_pixmap",
+        "_pixmapRect",
+        "_iconRect",
+        "_iconRectKey",
+        "_iconPath",
+        "_thumbnailKey",
+        "_thumbnailCallbacks",
+        "_underMouse",
+        "_searchText",
+        "_infoWidget",
+        "_groupColumn",
+        "_mimeText",
+        "_combinedWidget",
+        "_stretchToWidget",
+        "_dragEnabled",
+        "_imageSequence",
+        "_imageSequencePath",
+        "_blendValue",
+        "_blendPreviousValue",
+        "_blendPosition",
+        "_blendingEnabled",
+    )
+
+    def __init__(self):
 
         self._url = None
         self._path = None
         self._size = None
         self._rect = None
-        self.textColumnOrder = []
+        self.textColumnOrder = ()
+
+        # The text is kept in the shared item store and the item only
+        # keeps its row. The icons, fonts and pixmaps are rarely set so
+        # their dicts are only created when needed.
+        self._store = itemStore()
+        self._row = self._store.addRow()
 
-        self._text = {}
-        self._sortText = {}
-        self._displayText = {}
+        self._treeWidget = None
 
-        self._icon = {}
-        self._fonts = {}
-        self._pixmap = {}
-        self._thread = None
+        self._icon = None
+        self._fonts = None
+        self._pixmap = None
         self._pixmapRect = None
 
+        self._iconRect = None
+        self._iconRectKey = None
+
         self._iconPath = ""
-        self._thumbnailIcon = None
+        self._thumbnailKey = None
+        self._thumbnailCallbacks = None
 
         self._underMouse = False
         self._searchText = None
@@ -116,11 +147,22 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
 
     def __del__(self):
         """
-        Make sure the sequence is stopped when deleted.
+        Make sure the sequence is stopped and the row in the item store
+        is released when deleted.
 
         :rtype: None
         """
         self.stop()
+        self._store.removeRow(self._row)
+        self._row = None
+
+    def storeRow(self):
+        """
+        Return the row of the item in the shared item store.
+
+        :rtype: int
+        """
+        return self._row
 
     def toJson(self):
         """
@@ -128,7 +170,58 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
 
         :rtype: dict[]
         """
-        return self._text
+        return dict(self._store.items(self._row))
+
+    def treeWidget(self):
+        """
+        Return the tree widget that contains the item.
+
+        :rtype: studioqt.CombinedTreeWidget or None
+        """
+        return self._treeWidget
+
+    def setTreeWidget(self, treeWidget):
+        """
+        Set the tree widget that contains the item.
+
+        This is called by the tree widget when the item is added or
+        removed.
+
+        :type treeWidget: studioqt.CombinedTreeWidget or None
+        :rtype: None
+        """
+        self._treeWidget = treeWidget
+
+    def labelFromColumn(self, column):
+        """
+        Return the column label for the given column.
+
+        Labels are returned as they are. The column number is returned
+        when the item is not in a tree widget.
+
+        :type column: int or str
+        :rtype: str or int
+        """
+        if isinstance(column, basestring):
+            return column
+
+        treeWidget = self.treeWidget()
+        if treeWidget:
+            return treeWidget.labelFromColumn(column)
+
+        return column
+
+    def columnCount(self):
+        """
+        Return the number of columns of the tree widget.
+
+        :rtype: int
+        """
+        treeWidget = self.treeWidget()
+        if treeWidget:
+            return treeWidget.columnCount()
+
+        return 0
 
     def mimeText(self):
         """
@@ -154,9 +247,44 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
         :type value: bool
         :rtype: None
         """
-        QtWidgets.QTreeWidgetItem.setHidden(self, value)
-        row = self.treeWidget().indexFromItem(self).row()
-        self.combinedWidget().listView().setRowHidden(row, value)
+        treeWidget = self.treeWidget()
+        if treeWidget:
+            treeWidget.setItemsHidden([self], value)
+
+    def isHidden(self):
+        """
+        Return True if the item is hidden.
+
+        :rtype: bool
+        """
+        treeWidget = self.treeWidget()
+        if treeWidget:
+            return treeWidget.isItemHidden(self)
+
+        return False
+
+    def setSelected(self, value):
+        """
+        Set the selected state of the item.
+
+        :type value: bool
+        :rtype: None
+        """
+        treeWidget = self.treeWidget()
+        if treeWidget:
+            treeWidget.setItemSelected(self, value)
+
+    def isSelected(self):
+        """
+        Return True if the item is selected.
+
+        :rtype: bool
+        """
+        treeWidget = self.treeWidget()
+        if treeWidget:
+            return treeWidget.isItemSelected(self)
+
+        return False
 
     def setDragEnabled(self, value):
         """
@@ -177,17 +305,55 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
 
     def setData(self, column, role, value):
         """
-        Reimplemented to set the search text to dirty.
-
         Set the value for the item's column and role to the given value.
 
+        Only the display and edit roles are supported and both set the
+        text for the column.
+
         :type column: int or str
         :type role: int
-        :type value: QtCore.QVariant
+        :type value: object
         :rtype: None
         """
-        self._searchText = None
-        QtWidgets.QTreeWidgetItem.setData(self, column, role, value)
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            self.setText(column, value)
+
+    def _dataChanged(self):
+        """
+        Triggered when the text or sort data for the item has changed.
+
+        Clears the search text and the cached sort keys for the item and
+        lets the item model know that the item needs repainting.
+
+        :rtype: None
+        """
+        self.clearSearchText()
+
+        treeWidget = self.treeWidget()
+        if treeWidget:
+            treeWidget.clearSortKeys(self)
+            treeWidget.model().itemChanged(self)
+
+    def setModifiedTime(self, mtime):
+        """
+        Set the modified time in seconds used for sorting by modified.
+
+        The time is kept as a float in the item store instead of as
+        sort text for the column.
+
+        :type mtime: float or None
+        :rtype: None
+        """
+        self._store.setMtime(self._row, mtime)
+        self._dataChanged()
+
+    def modifiedTime(self):
+        """
+        Return the modified time in seconds or None if it was not set.
+
+        :rtype: float or None
+        """
+        return self._store.mtime(self._row)
 
     def setIcon(self, column, icon, color=None):
         """
@@ -210,31 +376,38 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
             else:
                 icon = QtGui.QIcon(icon)
 
-        if isinstance(column, basestring):
-            self._icon[column] = icon
-        else:
-            self._pixmap[column] = None
-            QtWidgets.QTreeWidgetItem.setIcon(self, column, icon)
+        if self._icon is None:
+            self._icon = {}
+
+        self._icon[self.labelFromColumn(column)] = icon
+        self._pixmap = None
+
+        combinedWidget = self.combinedWidget()
+        if combinedWidget:
+            combinedWidget.updateItem(self)
 
     def data(self, column, role, **kwargs):
         """
-        Reimplemented to add support for setting the sort data.
+        Return the data for the given column and role.
 
-        :type column: int
+        The display role returns the sort text and the edit role returns
+        the text for the column.
+
+        :type column: int or str
         :type role: int
         :type kwargs: dict
         :rtype: object
         """
         if role == QtCore.Qt.DisplayRole:
+            return self.sortText(column)
 
-            text = self.sortText(column)
-            if not text:
-                text = QtWidgets.QTreeWidgetItem.data(self, column, role)
+        elif role == QtCore.Qt.EditRole:
+            return self.text(column)
 
-        else:
-            text = QtWidgets.QTreeWidgetItem.data(self, column, role)
+        elif role == QtCore.Qt.DecorationRole:
+            return self.icon(column)
 
-        return text
+        return None
 
     def setName(self, text):
         """
@@ -262,12 +435,15 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
         :type value: str
         :rtype: None
         """
-        self.textColumnOrder.append(column)
+        column = self.labelFromColumn(column)
 
-        if isinstance(column, basestring):
-            self._text[column] = value
-        else:
-            QtWidgets.QTreeWidgetItem.setText(self, column, unicode(value))
+        if column not in self.textColumnOrder:
+            if isinstance(column, basestring):
+                order = self.textColumnOrder + (column,)
+                self.textColumnOrder = _textColumnOrders.setdefault(order, order)
+
+        self._store.setValue(self._row, column, value)
+        self._dataChanged()
 
     def text(self, column):
         """
@@ -276,12 +452,11 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
         :type column: int or str
         :rtype: str
         """
-        if isinstance(column, basestring):
-            text = self._sortText.get(column)
-            if not text:
-                text = self._text.get(column, "")
-        else:
-            text = QtWidgets.QTreeWidgetItem.text(self, column)
+        column = self.labelFromColumn(column)
+
+        text = self._store.value(self._row, column, None, role=self._store.SORT_TEXT)
+        if not text:
+            text = self._store.value(self._row, column)
 
         return text
 
@@ -289,26 +464,26 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
         """
         Set the sort data for the given column.
 
-        :type column: int
+        :type column: int or str
         :int value: str
         :rtype: None
         """
-        self._sortText[column] = value
+        column = self.labelFromColumn(column)
+        self._store.setValue(self._row, column, value, role=self._store.SORT_TEXT)
+        self._dataChanged()
 
     def sortText(self, column):
         """
         Return the sort data for the given column.
 
-        :type column: int
+        :type column: int or str
         :rtype: str
         """
+        column = self.labelFromColumn(column)
 
-        if isinstance(column, int):
-            column = self.treeWidget().labelFromColumn(column)
-
-        text = self._sortText.get(column, None)
+        text = self._store.value(self._row, column, None, role=self._store.SORT_TEXT)
         if not text:
-            text = self._text.get(column, "")
+            text = self._store.value(self._row, column)
 
         return text
 
@@ -316,22 +491,15 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
         """
         Return the data to be displayed for the given column.
 
-        :type column: int
+        :type column: int or str
         :rtype: str
         """
         if isinstance(column, basestring):
-            text = self._text.get(column, "")
+            text = self._store.value(self._row, column)
 
         else:
-            # Check the text before the display role data
-            label = self.treeWidget().labelFromColumn(column)
-            text = self._text.get(label, "")
-
-            if not text:
-                text = QtWidgets.QTreeWidgetItem.data(
-                    self, column,
-                    QtCore.Qt.DisplayRole
-                )
+            label = self.labelFromColumn(column)
+            text = self._store.value(self._row, label)
 
             if text:
                 text = unicode(text)
@@ -355,29 +523,26 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
 
         :rtype: None 
         """
-        self._pixmap = {}
-        self._thumbnailIcon = None
+        self._pixmap = None
+        self._thumbnailKey = None
+        self._thumbnailCallbacks = None
 
     def updateData(self):
         """
-        Update the text data to the corresponding column.
+        Add a column to the tree widget for any text the item has.
+
+        The text itself is read from the item store by the item model.
 
         :rtype: None
         """
         treeWidget = self.treeWidget()
 
-        for label in self._text:
-            column = treeWidget.columnFromLabel(label)
-
-            if column < 0:
-                treeWidget.addHeaderLabel(label)
-
-            text = self._text[label]
-            self.setText(column, text)
+        if treeWidget:
+            for label in self.textColumnOrder:
+                if treeWidget.columnFromLabel(label) < 0:
+                    treeWidget.addHeaderLabel(label)
 
-        for label in self._icon:
-            column = treeWidget.columnFromLabel(label)
-            self.setIcon(column, self._icon[label])
+            self._dataChanged()
 
     def dpi(self):
         """
@@ -402,13 +567,9 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
         """
         Takes this item from the tree.
         """
-        tree = self.treeWidget()
-        parent = self.parent()
-
-        if parent:
-            parent.takeChild(parent.indexOfChild(self))
-        else:
-            tree.takeTopLevelItem(tree.indexOfTopLevelItem(self))
+        treeWidget = self.treeWidget()
+        if treeWidget:
+            treeWidget.takeItems([self])
 
     def selectionChanged(self):
         """
@@ -439,6 +600,14 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
 
         return combinedWidget
 
+    def id(self):
+        """
+        Return the unique id for the item.
+
+        :rtype: str
+        """
+        return self.url().toLocalFile()
+
     def url(self):
         """
         Return the url object for the given item.
@@ -465,15 +634,30 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
         :rtype: str
         """
         if not self._searchText:
+            treeWidget = self.treeWidget()
+
+            if treeWidget:
+                labels = treeWidget.headerLabels()
+            else:
+                labels = self.textColumnOrder
+
             searchText = []
-            for column in range(self.columnCount()):
-                text = self.data(column, QtCore.Qt.DisplayRole)
+            for label in labels:
+                text = self.sortText(label)
                 if text:
                     searchText.append(unicode(text))
             self._searchText = " ".join(searchText)
 
         return self._searchText
 
+    def clearSearchText(self):
+        """
+        Clear the cached search text so that it is created again.
+
+        :rtype: None
+        """
+        self._searchText = None
+
     def setStretchToWidget(self, widget):
         """
         Set the width of the item to the width of the given widget.
@@ -520,14 +704,7 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
         if self._size:
             return self._size
         else:
-            iconSize = self.combinedWidget().iconSize()
-
-            if self.isTextVisible():
-                w = iconSize.width()
-                h = iconSize.width() + self.textHeight()
-                iconSize = QtCore.QSize(w, h)
-
-            return iconSize
+            return QtCore.QSize(self.combinedWidget().itemSizeHint())
 
     def setPixmap(self, column, pixmap):
         """
@@ -537,6 +714,8 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
         :type pixmap: QtWidgets.QPixmap
         :rtype: None
         """
+        if self._pixmap is None:
+            self._pixmap = {}
         self._pixmap[column] = pixmap
 
     def thumbnailPath(self):
@@ -547,51 +726,203 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
         """
         return ""
 
-    def _thumbnailFromImage(self, image):
+    def thumbnailSize(self):
+        """
+        Return the size the thumbnail is decoded and cached at.
+
+        The icon size of the widget already includes the dpi and is
+        rounded up to the sizes of the thumbnail cache, so that zooming
+        only reloads the thumbnails when it crosses one of those sizes.
+
+        :rtype: QtCore.QSize
+        """
+        size = self.MAX_ICON_SIZE
+
+        combinedWidget = self.combinedWidget()
+        if combinedWidget:
+            iconSize = combinedWidget.iconSize()
+            size = max(iconSize.width(), iconSize.height())
+
+        size = studioqt.thumbnailCache().bucket(size)
+
+        return QtCore.QSize(size, size)
+
+    def thumbnailKey(self, mtime, size=None):
+        """
+        Return the pixmap cache key for the thumbnail at the given size.
+
+        The current thumbnail size is used when no size is given.
+
+        :type mtime: float or None
+        :type size: QtCore.QSize or None
+        :rtype: tuple
+        """
+        size = size or self.thumbnailSize()
+        size = (size.width(), size.height())
+
+        return self.thumbnailPath(), mtime, size, self.dpi()
+
+    def _pixmapFromImage(self, image, size=None):
+        """
+        Return a pixmap for the given thumbnail image.
+
+        The default thumbnail pixmap is returned for a null image.
+
+        :type image: QtGui.QImage
+        :type size: QtCore.QSize or None
+        :rtype: QtGui.QPixmap
+        """
+        if image.isNull():
+            color = self.textColor()
+            return studioqt.resource.pixmap("thumbnail", color=color)
+
+        pixmap = QtGui.QPixmap.fromImage(image)
+
+        size = size or self.thumbnailSize()
+        if pixmap.width() > size.width() or pixmap.height() > size.height():
+            pixmap = pixmap.scaled(
+                size,
+                QtCore.Qt.KeepAspectRatio,
+                QtCore.Qt.SmoothTransformation,
+            )
+
+        return pixmap
+
+    def setThumbnailImage(self, image, mtime=None, size=None):
+        """
+        Set the thumbnail from the given image decoded at the given size.
+
+        The pixmap is stored in the shared pixmap cache and the item
+        only keeps the key.
+
+        :type image: QtGui.QImage
+        :type mtime: float or None
+        :type size: QtCore.QSize or None
+        :rtype: QtGui.QPixmap
+        """
+        pixmap = self._pixmapFromImage(image, size)
+
+        self._thumbnailKey = self.thumbnailKey(mtime, size)
+        studioqt.pixmapCache().insert(self._thumbnailKey, pixmap)
+
+        return pixmap
+
+    def _thumbnailFromImage(self, size, image):
         """
         Called after the given image object has finished loading.
 
+        The image is cached for the size it was requested at, which
+        can differ from the current size if the item has been resized
+        while the image was loading. The image is ignored if the item
+        has been removed from the widget while it was loading.
+
+        :type size: QtCore.QSize
         :type image: QtGui.QImage
-        :rtype: None  
+        :rtype: None
         """
-        pixmap = QtGui.QPixmap()
-        pixmap.convertFromImage(image)
-        icon = QtGui.QIcon(pixmap)
+        combinedWidget = self.combinedWidget()
+        if not combinedWidget:
+            return
 
-        self._thumbnailIcon = icon
-        self.combinedWidget().update()
+        mtime = studioqt.imageLoader().mtime(self.thumbnailPath())
+        self.setThumbnailImage(image, mtime, size)
 
-    def thumbnailIcon(self):
+        combinedWidget.updateItem(self)
+
+    def thumbnailPixmap(self):
         """
-        Return the thumbnail icon.
+        Return the thumbnail pixmap from the shared pixmap cache.
 
-        :rtype: QtGui.QIcon
+        When the thumbnail thread is enabled the image is requested from
+        the shared image loader and None is returned until it has loaded.
+
+        :rtype: QtGui.QPixmap or None
         """
-        thumbnailPath = self.thumbnailPath()
+        pixmap = None
+        placeholder = None
 
-        if not os.path.exists(thumbnailPath):
-            color = self.textColor()
-            thumbnailPath = studioqt.resource.icon("thumbnail", color=color)
+        if self._thumbnailKey:
+            cache = studioqt.pixmapCache()
+            key = self.thumbnailKey(self._thumbnailKey[1])
+
+            pixmap = cache.find(key)
+
+            if pixmap is not None:
+                self._thumbnailKey = key
+            elif key != self._thumbnailKey:
+                # Show the thumbnail at the previous size until it has loaded
+                placeholder = cache.find(self._thumbnailKey)
+
+        if pixmap is None:
+            thumbnailPath = self.thumbnailPath()
+            thumbnailSize = self.thumbnailSize()
+
+            size = max(thumbnailSize.width(), thumbnailSize.height())
+
+            if self.ENABLE_THUMBNAIL_THREAD:
+                requestKey = (thumbnailPath, size)
 
-        if not self._thumbnailIcon:
+                # Keep one callback per request so it is only added once
+                if self._thumbnailCallbacks is None:
+                    self._thumbnailCallbacks = {}
 
-            if self.ENABLE_THUMBNAIL_THREAD and not self._thread:
-                self._thread = IconThread(thumbnailPath)
-                self._thread.triggered.connect(self._thumbnailFromImage)
-                self._thread.start()
+                callback = self._thumbnailCallbacks.get(requestKey)
+
+                if not callback:
+                    callback = partial(self._thumbnailFromImage, thumbnailSize)
+                    self._thumbnailCallbacks[requestKey] = callback
+
+                combinedWidget = self.combinedWidget()
+
+                if combinedWidget:
+                    priority = combinedWidget.thumbnailPriority()
+                else:
+                    priority = studioqt.CombinedWidget.BACKGROUND_PRIORITY
+
+                studioqt.imageLoader().request(
+                    requestKey,
+                    thumbnailPath,
+                    callback=callback,
+                    priority=priority,
+                    owner=combinedWidget,
+                    size=size,
+                )
             else:
-                self._thumbnailIcon = QtGui.QIcon(thumbnailPath)
+                try:
+                    mtime = os.path.getmtime(thumbnailPath)
+                except (OSError, TypeError):
+                    mtime = None
+
+                image = studioqt.imageloader.readThumbnail(thumbnailPath, mtime, size)
+                pixmap = self.setThumbnailImage(image, mtime, thumbnailSize)
+
+        return pixmap or placeholder
 
-        return self._thumbnailIcon
+    def thumbnailIcon(self):
+        """
+        Return the thumbnail icon.
+
+        :rtype: QtGui.QIcon or None
+        """
+        pixmap = self.thumbnailPixmap()
+
+        if pixmap is not None:
+            return QtGui.QIcon(pixmap)
 
     def icon(self, column):
         """
         Overriding the icon method to add support for the thumbnail icon.
 
-        :type column: int
+        :type column: int or str
         :rtype: QtGui.QIcon
         """
-        icon = QtWidgets.QTreeWidgetItem.icon(self, column)
+        icon = None
+
+        if self._icon:
+            icon = self._icon.get(self.labelFromColumn(column))
+
+        if isinstance(icon, QtGui.QPixmap):
+            icon = QtGui.QIcon(icon)
 
         if not icon and column == self.THUMBNAIL_COLUMN:
             icon = self.thumbnailIcon()
@@ -602,19 +933,36 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
         """
         Return the pixmap for the given column.
 
+        The thumbnail pixmap is returned from the shared pixmap cache
+        when no icon has been set for the thumbnail column.
+
         :type column: int
         :rtype: QtWidgets.QPixmap
         """
+        pixmap = None
+
+        if self._pixmap:
+            pixmap = self._pixmap.get(column)
+
+        if not pixmap:
+
+            icon = None
+            if self._icon:
+                icon = self._icon.get(self.labelFromColumn(column))
 
-        if not self._pixmap.get(column):
+            if isinstance(icon, QtGui.QPixmap):
+                pixmap = icon
 
-            icon = self.icon(column)
-            if icon:
+            elif icon:
                 size = QtCore.QSize(self.MAX_ICON_SIZE, self.MAX_ICON_SIZE)
                 iconSize = icon.actualSize(size)
-                self._pixmap[column] = icon.pixmap(iconSize)
+                pixmap = icon.pixmap(iconSize)
+                self.setPixmap(column, pixmap)
 
-        return self._pixmap.get(column)
+            elif column == self.THUMBNAIL_COLUMN:
+                return self.thumbnailPixmap()
+
+        return pixmap
 
     def padding(self):
         """
@@ -650,7 +998,7 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
         if self.combinedWidget().isIconView():
             return QtCore.Qt.AlignCenter
         else:
-            return QtWidgets.QTreeWidgetItem.textAlignment(self, column)
+            return QtCore.Qt.AlignLeft
 
     # -----------------------------------------------------------------------
     # Support for mouse and key events
@@ -831,7 +1179,7 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
         :type index: QtCore.QModelIndex
         :rtype: None
         """
-        QtWidgets.QTreeWidget.drawRow(
+        QtWidgets.QTreeView.drawRow(
             self.treeWidget(),
             painter,
             option,
@@ -900,28 +1248,63 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
         :rtype: QtCore.QRect
         """
         padding = self.padding()
-        rect = self.visualRect(option)
-        width = rect.width()
-        height = rect.height()
+        visualRect = self.visualRect(option)
 
+        textHeight = 0
         if self.isTextVisible() and self.combinedWidget().isIconView():
-            height -= self.textHeight()
+            textHeight = self.textHeight()
 
-        width -= padding
-        height -= padding
+        key = (visualRect.width(), visualRect.height(), padding, textHeight)
 
-        rect.setWidth(width)
-        rect.setHeight(height)
+        # The icon rect only changes when the icon size or padding changes
+        if key != self._iconRectKey:
+            width = visualRect.width() - padding
+            height = visualRect.height() - textHeight - padding
 
-        x = 0
-        x += float(padding) / 2
-        x += float((width - rect.width())) / 2
+            rect = QtCore.QRect(0, 0, width, height)
 
-        y = float((height - rect.height())) / 2
-        y += float(padding) / 2
+            x = float(padding) / 2
+            y = float(padding) / 2
 
-        rect.translate(x, y)
-        return rect
+            rect.translate(x, y)
+
+            self._iconRect = rect
+            self._iconRectKey = key
+
+        return self._iconRect.translated(visualRect.topLeft())
+
+    def scaledPixmap(self, pixmap, size):
+        """
+        Return the given pixmap scaled to fit within the given size.
+
+        The scaled pixmaps are kept in the shared pixmap cache so that
+        they are only scaled again when the pixmap or the size changes.
+
+        :type pixmap: QtGui.QPixmap
+        :type size: QtCore.QSize
+        :rtype: QtGui.QPixmap
+        """
+        if pixmap.width() == size.width() and pixmap.height() <= size.height():
+            return pixmap
+
+        if pixmap.height() == size.height() and pixmap.width() <= size.width():
+            return pixmap
+
+        cache = studioqt.pixmapCache()
+        key = ("scaled", pixmap.cacheKey(), size.width(), size.height())
+
+        scaledPixmap = cache.find(key)
+
+        if scaledPixmap is None:
+            scaledPixmap = pixmap.scaled(
+                size.width(),
+                size.height(),
+                QtCore.Qt.KeepAspectRatio,
+                QtCore.Qt.SmoothTransformation,
+            )
+            cache.insert(key, scaledPixmap)
+
+        return scaledPixmap
 
     def paintIcon(self, painter, option, index, align=None):
         """
@@ -938,13 +1321,7 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
             return
 
         rect = self.iconRect(option)
-
-        pixmap = pixmap.scaled(
-            rect.width(),
-            rect.height(),
-            QtCore.Qt.KeepAspectRatio,
-            QtCore.Qt.SmoothTransformation,
-        )
+        pixmap = self.scaledPixmap(pixmap, rect.size())
 
         pixmapRect = QtCore.QRect(rect)
         pixmapRect.setWidth(pixmap.width())
@@ -1015,9 +1392,12 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
         :type column: int
         :rtype: QtWidgets.QFont
         """
-        default = QtWidgets.QTreeWidgetItem.font(self, column)
+        default = QtGui.QFont()
+
+        font = default
 
-        font = self._fonts.get(column, default)
+        if self._fonts:
+            font = self._fonts.get(column, default)
 
         font.setPixelSize(self.fontSize() * self.dpi())
         return font
@@ -1030,6 +1410,8 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
         :type font: QtWidgets.QFont
         :rtype: Noen
         """
+        if self._fonts is None:
+            self._fonts = {}
         self._fonts[column] = font
 
     def paintText(self, painter, option, index):
@@ -1048,12 +1430,16 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
         self._paintText(painter, option, column)
 
     def textWidth(self, column):
-        text = self.displayText(column)
+        """
+        Return the width of the text in the given column.
 
+        :type column: int
+        :rtype: float
+        """
+        text = self.displayText(column)
         font = self.font(column)
-        metrics = QtGui.QFontMetricsF(font)
-        textWidth = metrics.width(text)
-        return textWidth
+
+        return self.combinedWidget().textWidth(text, font)
 
     def _paintText(self, painter, option, column):
 
@@ -1082,22 +1468,23 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
         visualRect.setWidth(width - padding)
         visualRect.setHeight(height - padding)
 
+        combinedWidget = self.combinedWidget()
+
         font = self.font(column)
         align = self.textAlignment(column)
-        metrics = QtGui.QFontMetricsF(font)
 
         if text:
-            textWidth = metrics.width(text)
+            textWidth = combinedWidget.textWidth(text, font)
         else:
             textWidth = 1
 
         # # Check if the current text fits within the rect.
         if textWidth > visualRect.width() - padding:
             visualWidth = visualRect.width()
-            text = metrics.elidedText(text, QtCore.Qt.ElideRight, visualWidth)
+            text = combinedWidget.elidedText(text, visualWidth, font)
             align = QtCore.Qt.AlignLeft
 
-        if self.combinedWidget().isIconView():
+        if combinedWidget.isIconView():
             align = align | QtCore.Qt.AlignBottom
         else:
             align = align | QtCore.Qt.AlignVCenter
@@ -1233,6 +1620,9 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
                     self.updateFrame()
 
     def resetImageSequence(self):
+        if isinstance(self._imageSequence, studioqt.ImageSequence):
+            self._imageSequence.close()
+
         self._imageSequence = None
 
     def imageSequence(self):
@@ -1282,7 +1672,7 @@ class CombinedWidgetItem(QtWidgets.QTreeWidgetItem):
             movie.setCacheMode(QtGui.QMovie.CacheAll)
             movie.frameChanged.connect(self._frameChanged)
 
-        elif os.path.isdir(path):
+        elif studioqt.imageSequenceExists(path):
 
             if not self.imageSequence():
                 movie = studioqt.ImageSequence(path)
@@ -22,8 +22,10 @@ class CombinedWidgetItemGroup(studioqt.CombinedWidgetItem):
 
     DEFAULT_FONT_SIZE = 24
 
-    def __init__(self, *args):
-        studioqt.CombinedWidgetItem.__init__(self, *args)
+    __slots__ = ("_children",)
+
+    def __init__(self):
+        studioqt.CombinedWidgetItem.__init__(self)
 
         self._children = []
 
@@ -79,7 +81,7 @@ class CombinedWidgetItemGroup(studioqt.CombinedWidgetItem):
 
         :type column: int
         """
-        return QtWidgets.QTreeWidgetItem.textAlignment(self, column)
+        return QtCore.Qt.AlignLeft
 
     def sizeHint(self, column=0):
         """
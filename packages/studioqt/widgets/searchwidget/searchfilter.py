@@ -51,6 +51,7 @@ class SearchFilter(QtCore.QObject):
         QtCore.QObject.__init__(self)
 
         self._matches = 0
+        self._groups = []
         self._pattern = None
         self._resolvedPattern = None
         self._spaceOperator = spaceOperator
@@ -99,6 +100,25 @@ class SearchFilter(QtCore.QObject):
         :rtype: None
         """
         self._resolvedPattern = resolvedPattern
+        self._groups = self.groupsFromPattern(resolvedPattern)
+
+    def groupsFromPattern(self, pattern):
+        """
+        Return the labels for each OR group in the given resolved pattern.
+
+        The pattern is split once when it changes instead of for every
+        text that is matched.
+
+        :type pattern: str
+        :rtype: list[list[str]]
+        """
+        groups = []
+
+        for group in pattern.split(self.Operator.OR):
+            labels = [label.lower() for label in group.split(self.Operator.AND)]
+            groups.append(labels)
+
+        return groups
 
     def spaceOperator(self):
         """
@@ -187,16 +207,14 @@ class SearchFilter(QtCore.QObject):
         match = False
         matches = 0
 
-        pattern = self.resolvedPattern()
-        groups = pattern.split(self.Operator.OR)
+        text = text.lower()
 
-        for group in groups:
+        for labels in self._groups:
 
             match = True
-            labels = [label.lower() for label in group.split(self.Operator.AND)]
 
             for label in labels:
-                if label not in text.lower():
+                if label not in text:
                     matches += 1
                     match = False
                     break
@@ -11,6 +11,8 @@
 
 import logging
 
+from collections import OrderedDict
+
 from studioqt import QtGui
 from studioqt import QtCore
 from studioqt import QtWidgets
@@ -64,6 +66,46 @@ def pathsToDict(paths, root="", split=None):
     return results
 
 
+def pathsToNodes(paths, root="", split=None):
+    """
+    Return the item path, parent path and text for each node in the paths.
+
+    The nodes are the same as the items created from pathsToDict and are
+    returned parents first with the children sorted by their text.
+
+    Example:
+
+    paths = ["/fruit/apple", "/fruit/orange"]
+    print pathsToNodes(paths)
+    # Result: {"fruit": (None, "fruit"),
+    #          "fruit/apple": ("fruit", "apple"),
+    #          "fruit/orange": ("fruit", "orange")}
+
+    :type paths: list[str]
+    :type root: str
+    :type split: str
+
+    :rtype: OrderedDict
+    """
+    split = split or SPLIT_TOKEN
+    data = pathsToDict(paths, root=root, split=split)
+
+    nodes = OrderedDict()
+
+    def _recursive(parentPath, children):
+        for text, val in sorted(children.iteritems()):
+            path = split.join([parentPath, text])
+            nodes[path] = (parentPath, text)
+            _recursive(path, val)
+
+    for key in data:
+        path = split.join([key])
+        nodes[path] = (None, key)
+        _recursive(path, data[key])
+
+    return nodes
+
+
 class TreeWidget(QtWidgets.QTreeWidget):
 
     itemDropped = QtCore.Signal(object)
@@ -76,7 +118,13 @@ class TreeWidget(QtWidgets.QTreeWidget):
         self._dpi = 1
         self._items = []
         self._locked = False
+        self._itemsByPath = {}
 
+        self._split = SPLIT_TOKEN
+        self._loadedPaths = set()
+        self._childPathsFunc = None
+
+        self.itemExpanded.connect(self._itemExpanded)
         self.itemExpanded.connect(self.update)
         self.itemCollapsed.connect(self.update)
 
@@ -218,10 +266,243 @@ class TreeWidget(QtWidgets.QTreeWidget):
         :type path: str
         :rtype: NavigationWidgetItem
         """
+        item = self._itemsByPath.get(path)
+        if item is not None:
+            return item
+
         for item in self.items():
             if path == item.path():
                 return item
 
+    def clear(self):
+        """
+        Reimplemented to clear the path to item map.
+
+        :rtype: None
+        """
+        QtWidgets.QTreeWidget.clear(self)
+        self._itemsByPath = {}
+        self._loadedPaths = set()
+
+    # -----------------------------------------------------------------------
+    # Support for lazy loading the child items
+    # -----------------------------------------------------------------------
+
+    def isLazy(self):
+        """
+        Return True if the child items are loaded when first needed.
+
+        :rtype: bool
+        """
+        return self._childPathsFunc is not None
+
+    def childPathsFunc(self):
+        """
+        Return the function used for lazy loading the child paths.
+
+        :rtype: func or None
+        """
+        return self._childPathsFunc
+
+    def setChildPathsFunc(self, func):
+        """
+        Set the function used for lazy loading the child paths.
+
+        The function is called with the path of an item the first time
+        it is expanded or one of its children is selected. It must return
+        a dict of the child paths and their settings. Set the function to
+        None to disable lazy loading.
+
+        :type func: func or None
+        :rtype: None
+        """
+        self._childPathsFunc = func
+
+    def loadedPaths(self):
+        """
+        Return the paths whose children have been loaded.
+
+        :rtype: list[str]
+        """
+        return sorted(self._loadedPaths)
+
+    def setLoadedPaths(self, paths):
+        """
+        Set the paths whose children have already been loaded.
+
+        The items that have not been loaded show an expand indicator
+        until they are expanded.
+
+        :type paths: list[str]
+        :rtype: None
+        """
+        self._loadedPaths = set(paths)
+
+        for path, item in self._itemsByPath.items():
+            self.updateChildIndicator(item)
+
+    def isPathLoaded(self, path):
+        """
+        Return True if the children for the given path have been loaded.
+
+        :type path: str
+        :rtype: bool
+        """
+        return path in self._loadedPaths
+
+    def updateChildIndicator(self, item):
+        """
+        Show the expand indicator for the items that have not been loaded.
+
+        :type item: TreeWidgetItem
+        :rtype: None
+        """
+        if self.isLazy() and not self.isPathLoaded(item.path()):
+            policy = QtWidgets.QTreeWidgetItem.ShowIndicator
+        else:
+            policy = QtWidgets.QTreeWidgetItem.DontShowIndicatorWhenChildless
+
+        item.setChildIndicatorPolicy(policy)
+
+    def _itemExpanded(self, item):
+        """
+        Triggered when an item has been expanded.
+
+        :type item: TreeWidgetItem
+        :rtype: None
+        """
+        if self.isLazy():
+            self.loadChildren(item)
+
+    def loadChildren(self, item):
+        """
+        Load the child items for the given item if not already loaded.
+
+        :type item: TreeWidgetItem
+        :rtype: None
+        """
+        path = item.path()
+
+        if not self.isLazy() or self.isPathLoaded(path):
+            return
+
+        self._loadedPaths.add(path)
+
+        paths = self._childPathsFunc(path) or {}
+        split = self._split
+
+        for childPath in sorted(paths):
+            if childPath in self._itemsByPath:
+                continue
+
+            text = childPath.split(split)[-1]
+            child = self.createItem(childPath, text, parent=item)
+
+            settings = paths.get(childPath)
+            if settings:
+                child.setSettings(settings)
+
+            self.updateChildIndicator(child)
+            child.update()
+
+        self.updateChildIndicator(item)
+
+    def loadPath(self, path):
+        """
+        Load the items down to the given path and return its item.
+
+        Only the children of the parents of the path are loaded.
+
+        :type path: str
+        :rtype: TreeWidgetItem or None
+        """
+        item = self._itemsByPath.get(path)
+
+        if item is not None or not self.isLazy():
+            return item
+
+        split = self._split
+        parents = []
+        parentPath = path
+
+        # Find the closest parent that has an item
+        while split in parentPath:
+            parentPath = parentPath.rsplit(split, 1)[0]
+            parents.insert(0, parentPath)
+
+            if parentPath in self._itemsByPath:
+                break
+        else:
+            return None
+
+        for parentPath in parents:
+            parent = self._itemsByPath.get(parentPath)
+
+            if parent is None:
+                return None
+
+            self.loadChildren(parent)
+
+        return self._itemsByPath.get(path)
+
+    def createItem(self, path, text, parent=None):
+        """
+        Create a new item for the given path and add it to the path map.
+
+        The item is inserted in the order of the text when a parent is
+        given, otherwise it is added as a top level item.
+
+        :type path: str
+        :type text: str
+        :type parent: TreeWidgetItem or None
+        :rtype: TreeWidgetItem
+        """
+        item = TreeWidgetItem()
+        item.setText(0, unicode(text))
+        item.setPath(path)
+
+        if parent is None:
+            self.addTopLevelItem(item)
+        else:
+            index = parent.childCount()
+
+            for i in range(parent.childCount()):
+                if parent.child(i).text(0) > item.text(0):
+                    index = i
+                    break
+
+            parent.insertChild(index, item)
+
+        self._itemsByPath[path] = item
+
+        return item
+
+    def removeItem(self, item):
+        """
+        Remove the given item and its children from the tree.
+
+        :type item: TreeWidgetItem
+        :rtype: None
+        """
+        parent = item.parent()
+
+        if parent:
+            parent.removeChild(item)
+        else:
+            self.takeTopLevelItem(self.indexOfTopLevelItem(item))
+
+        items = [item]
+
+        while items:
+            item = items.pop()
+
+            if self._itemsByPath.get(item.path()) is item:
+                del self._itemsByPath[item.path()]
+                self._loadedPaths.discard(item.path())
+
+            for i in range(item.childCount()):
+                items.append(item.child(i))
+
     def settings(self):
         """
         Return a dictionary of the settings for this widget.
@@ -277,8 +558,12 @@ class TreeWidget(QtWidgets.QTreeWidget):
         :type settings: dict
         :rtype: None
         """
-        item = self.itemFromPath(path)
+        item = self.loadPath(path) or self.itemFromPath(path)
+
         if item and settings:
+            if settings.get("expanded") and self.isLazy():
+                self.loadChildren(item)
+
             item.setSettings(settings)
 
     def showContextMenu(self, position):
@@ -369,6 +654,10 @@ class TreeWidget(QtWidgets.QTreeWidget):
         :rtype: None
         """
         paths = self.normPaths(paths)
+
+        for path in paths:
+            self.loadPath(path)
+
         items = self.items()
         for item in items:
             if item.path() in paths:
@@ -425,6 +714,77 @@ class TreeWidget(QtWidgets.QTreeWidget):
 
         self.setSettings(settings)
 
+    def updatePaths(self, paths, root="", split=None):
+        """
+        Update the items to the given paths.
+
+        Only the items for the paths that have been added or removed are
+        created or deleted. The existing items keep their expanded and
+        selected state.
+
+        :type paths: list[str] or dict
+        :type root: str
+        :type split: str or None
+        :rtype: None
+        """
+        self._split = split or SPLIT_TOKEN
+
+        nodes = pathsToNodes(paths, root=root, split=split)
+        selectedPaths = self.selectedPaths()
+
+        self.blockSignals(True)
+
+        try:
+            removedItems = []
+
+            for path, item in self._itemsByPath.items():
+                parent = item.parent()
+                parentPath = parent.path() if parent else None
+
+                if path not in nodes or nodes[path][0] != parentPath:
+                    removedItems.append(item)
+
+            # Remove the parents first as they also remove their children
+            removedItems.sort(key=lambda item: len(item.parents()))
+
+            for item in removedItems:
+                if self._itemsByPath.get(item.path()) is item:
+                    self.removeItem(item)
+
+            newItems = []
+            newPaths = set()
+
+            for path, (parentPath, text) in nodes.items():
+                if path not in self._itemsByPath:
+                    parent = self._itemsByPath.get(parentPath)
+                    item = self.createItem(path, text, parent=parent)
+                    newItems.append(item)
+                    newPaths.add(path)
+
+            if isinstance(paths, dict):
+                for path, settings in paths.items():
+                    item = self._itemsByPath.get(path)
+
+                    if item is None or not settings:
+                        continue
+
+                    if path not in newPaths:
+                        settings = dict(settings)
+                        settings["selected"] = item.isSelected()
+                        settings["expanded"] = item.isExpanded()
+
+                    item.setSettings(settings)
+
+            for item in newItems:
+                self.updateChildIndicator(item)
+                item.update()
+
+        finally:
+            self.blockSignals(False)
+
+        if selectedPaths != self.selectedPaths():
+            self.itemSelectionChanged.emit()
+
     def addPaths(self, paths, root="", split=None):
         """
         Set the given items as a flat list.
@@ -460,6 +820,8 @@ class TreeWidget(QtWidgets.QTreeWidget):
             item.setText(0, unicode(key))
             item.setPath(path)
 
+            self._itemsByPath[path] = item
+
             def _recursive(parent, children, split=None):
                 for text, val in sorted(children.iteritems()):
 
@@ -472,6 +834,8 @@ class TreeWidget(QtWidgets.QTreeWidget):
 
                     parent.addChild(child)
 
+                    self._itemsByPath[path] = child
+
                     _recursive(child, val, split=split)
 
             _recursive(item, data[key], split=split)
@@ -0,0 +1,156 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+import shutil
+import tempfile
+import unittest
+
+from studioqt import QtWidgets
+
+import studiolibrary
+
+
+class TestDatabase(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create a database with a few paths in a temp directory.
+        """
+        self.app = QtWidgets.QApplication.instance()
+
+        if not self.app:
+            self.app = QtWidgets.QApplication([])
+
+        self.tempDir = studiolibrary.normPath(tempfile.mkdtemp())
+
+        self.root = self.tempDir + "/library"
+
+        self.pose = self.root + "/pose.pose"
+        self.anim = self.root + "/anim.anim"
+        self.trashed = self.root + "/trash/old.pose"
+
+        path = self.root + "/.studiolibrary/database.json"
+        self.database = studiolibrary.Database(path)
+        self.database.addPaths([self.pose, self.anim])
+
+    def tearDown(self):
+        """
+        Remove the temp directory.
+        """
+        shutil.rmtree(self.tempDir, ignore_errors=True)
+
+    def test_trash_paths(self):
+        """
+        Test that trashed paths are marked and returned.
+        """
+        self.database.trashPaths([self.pose, self.trashed])
+
+        data = self.database.read()
+
+        self.assertTrue(self.database.isTrashed(self.pose, data))
+        self.assertTrue(self.database.isTrashed(self.trashed, data))
+        self.assertFalse(self.database.isTrashed(self.anim, data))
+
+        paths = self.database.trashedPaths()
+        self.assertEqual(sorted(paths), sorted([self.pose, self.trashed]))
+
+    def test_trashed_paths_from_data(self):
+        """
+        Test that the trashed paths can be found in already read data.
+        """
+        self.database.trashPaths([self.pose])
+
+        data = self.database.read()
+        self.database.untrashPaths([self.pose])
+
+        self.assertEqual(list(self.database.trashedPaths(data)), [self.pose])
+        self.assertEqual(self.database.trashedPaths(), {})
+
+    def test_untrash_paths(self):
+        """
+        Test that untrashing removes the trashed mark and the trash size.
+        """
+        self.database.trashPaths([self.pose, self.anim])
+        self.database.setTrashSizes({self.pose: 1024, self.anim: 2048})
+        self.database.untrashPaths([self.pose])
+
+        data = self.database.read()
+        key = studiolibrary.Database.TRASH_SIZE_KEY
+
+        self.assertFalse(self.database.isTrashed(self.pose, data))
+        self.assertNotIn(key, data[self.pose])
+        self.assertTrue(self.database.isTrashed(self.anim, data))
+        self.assertEqual(data[self.anim][key], 2048)
+
+    def test_untrash_missing_paths(self):
+        """
+        Test that untrashing paths that are not in the database is a no-op.
+        """
+        self.database.untrashPaths([self.trashed])
+
+        data = self.database.read()
+
+        self.assertNotIn(self.trashed, data)
+        self.assertEqual(sorted(data), sorted([self.pose, self.anim]))
+
+    def test_set_trash_sizes(self):
+        """
+        Test that trash sizes are only set for paths in the database.
+        """
+        self.database.trashPaths([self.pose])
+        self.database.setTrashSizes({self.pose: 1024, self.trashed: 2048})
+
+        data = self.database.read()
+        key = studiolibrary.Database.TRASH_SIZE_KEY
+
+        self.assertEqual(data[self.pose][key], 1024)
+        self.assertNotIn(self.trashed, data)
+
+    def test_rename_trashed_path(self):
+        """
+        Test that renaming a trashed path keeps the trashed mark.
+        """
+        self.database.trashPaths([self.pose])
+        self.database.renamePaths([(self.pose, self.trashed)])
+
+        data = self.database.read()
+
+        self.assertNotIn(self.pose, data)
+        self.assertTrue(self.database.isTrashed(self.trashed, data))
+
+
+def testSuite():
+    """
+    Return the test suite for this module.
+
+    :rtype: unittest.TestSuite
+    """
+    suite = unittest.TestSuite()
+    s = unittest.makeSuite(TestDatabase, 'test')
+    suite.addTest(s)
+    return suite
+
+
+def run():
+    """
+    Call from within Maya to run all valid tests.
+
+    Example:
+
+        import studiolibrary.tests.test_database
+        reload(studiolibrary.tests.test_database)
+        studiolibrary.tests.test_database.run()
+    """
+    tests = unittest.TextTestRunner()
+    tests.run(testSuite())
+
@@ -0,0 +1,367 @@
+# Copyright 2017 by Kurt Rathjen. All Rights Reserved.
+#
+# This library is free software: you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation, either
+# version 3 of the License, or (at your option) any later version.
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the GNU
+# Lesser General Public License for more details.
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import time
+import shutil
+import tempfile
+import unittest
+
+from studioqt import QtWidgets
+
+import studiolibrary
+
+
+class FailingFileQueue(studiolibrary.FileQueue):
+    """
+    A file queue that fails after copying the thumbnail.
+    """
+
+    def copyFile(self, src, dst, callback=None):
+        studiolibrary.FileQueue.copyFile(self, src, dst, callback)
+
+        if src.endswith("thumbnail.jpg"):
+            raise IOError("Cannot copy the thumbnail")
+
+
+class TestFileQueue(unittest.TestCase):
+
+    def setUp(self):
+        """
+        Create an item folder with a few files in a temp directory.
+        """
+        self.app = QtWidgets.QApplication.instance()
+
+        if not self.app:
+            self.app = QtWidgets.QApplication([])
+
+        self.tempDir = studiolibrary.normPath(tempfile.mkdtemp())
+
+        self.src = self.tempDir + "/src/pose.pose"
+        self.dst = self.tempDir + "/dst/pose.pose"
+
+        self.files = {
+            "pose.json": "{}" * 1000,
+            "thumbnail.jpg": "x" * 5000,
+            "sequence/image.0001.jpg": "y" * 3000,
+        }
+
+        for name, data in self.files.items():
+            path = os.path.join(self.src, name)
+
+            if not os.path.isdir(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+
+            with open(path, "wb") as f:
+                f.write(data)
+
+        self.results = {}
+
+    def tearDown(self):
+        """
+        Remove the temp directory.
+        """
+        shutil.rmtree(self.tempDir)
+
+    def connect(self, queue):
+        """
+        Record the signals emitted by the given queue.
+
+        :type queue: studiolibrary.FileQueue
+        :rtype: None
+        """
+        def _finished(jobs):
+            self.results["finished"] = jobs
+
+        def _cancelled():
+            self.results["cancelled"] = True
+
+        def _failed(error):
+            self.results["failed"] = error
+
+        queue.finished.connect(_finished)
+        queue.cancelled.connect(_cancelled)
+        queue.failed.connect(_failed)
+
+    def wait(self, queue):
+        """
+        Process the events until the given queue has finished.
+
+        :type queue: studiolibrary.FileQueue
+        :rtype: None
+        """
+        timeout = time.time() + 10
+
+        while queue.isRunning() and time.time() < timeout:
+            self.app.processEvents()
+            time.sleep(0.01)
+
+        self.assertFalse(queue.isRunning())
+
+    def assertFiles(self, path):
+        """
+        Assert the given path contains the files of the item.
+
+        :type path: str
+        :rtype: None
+        """
+        for name, data in self.files.items():
+            with open(os.path.join(path, name), "rb") as f:
+                self.assertEqual(data, f.read())
+
+    def test_copy(self):
+        """
+        Test copying an item folder in the threads.
+        """
+        queue = studiolibrary.FileQueue(threadCount=2)
+        queue.add(self.src, self.dst)
+
+        self.connect(queue)
+        queue.start()
+        self.wait(queue)
+
+        self.assertEqual([(queue.COPY, self.src, self.dst)], self.results["finished"])
+        self.assertFiles(self.src)
+        self.assertFiles(self.dst)
+
+        byteCount = sum(len(data) for data in self.files.values())
+        progress = queue.progress()
+
+        self.assertEqual(3, progress["fileCount"])
+        self.assertEqual(byteCount, progress["byteCount"])
+        self.assertEqual(byteCount, queue.sizes()[self.dst])
+
+    def test_move(self):
+        """
+        Test moving an item folder on the same device.
+        """
+        queue = studiolibrary.FileQueue()
+        queue.add(self.src, self.dst, queue.MOVE)
+
+        self.connect(queue)
+        queue.start()
+        self.wait(queue)
+
+        self.assertEqual([(queue.MOVE, self.src, self.dst)], self.results["finished"])
+        self.assertEqual(studiolibrary.MOVE_RENAME, queue.strategies()[self.src])
+        self.assertFalse(os.path.exists(self.src))
+        self.assertFiles(self.dst)
+
+    def test_move_rename_error(self):
+        """
+        Test a failed rename on the same device is not copied instead.
+        """
+        dst = self.src + "/sub/pose.pose"
+
+        queue = studiolibrary.FileQueue()
+        queue.add(self.src, dst, queue.MOVE)
+
+        self.assertRaises(studiolibrary.MovePathError, queue.start)
+
+        self.assertFalse(queue.isRunning())
+        self.assertFalse(os.path.exists(self.src + "/sub"))
+        self.assertFiles(self.src)
+
+    def test_existing_destination(self):
+        """
+        Test adding a destination that exists with and without unique paths.
+        """
+        os.makedirs(self.dst)
+
+        queue = studiolibrary.FileQueue()
+
+        self.assertRaises(
+            studiolibrary.MovePathError,
+            queue.add,
+            self.src,
+            self.dst,
+        )
+
+        queue.add(self.src, self.dst, unique=True)
+
+        self.connect(queue)
+        queue.start()
+        self.wait(queue)
+
+        dst = self.results["finished"][0][2]
+
+        self.assertNotEqual(self.dst, dst)
+        self.assertEqual([], os.listdir(self.dst))
+        self.assertFiles(dst)
+
+    def test_wait(self):
+        """
+        Test waiting for a copy emits the finished signal before returning.
+        """
+        queue = studiolibrary.FileQueue(threadCount=2)
+        queue.add(self.src, self.dst)
+
+        self.connect(queue)
+        queue.start()
+        queue.wait()
+
+        self.assertFalse(queue.isRunning())
+        self.assertEqual([(queue.COPY, self.src, self.dst)], self.results["finished"])
+        self.assertFiles(self.dst)
+
+    def test_cancel(self):
+        """
+        Test cancelling a copy removes the copied files and folders.
+        """
+        queue = studiolibrary.FileQueue()
+        queue.add(self.src, self.dst)
+
+        self.connect(queue)
+        queue.start()
+        queue.cancel()
+        self.wait(queue)
+
+        self.assertTrue(self.results.get("cancelled"))
+        self.assertFalse("finished" in self.results)
+        self.assertFalse(os.path.exists(os.path.dirname(self.dst)))
+        self.assertFiles(self.src)
+
+    def test_rollback(self):
+        """
+        Test a failed copy removes the copies and renames the moves back.
+        """
+        src2 = self.tempDir + "/src/pose2.pose"
+        dst2 = self.tempDir + "/dst/pose2.pose"
+
+        shutil.copytree(self.src, src2)
+
+        queue = FailingFileQueue(threadCount=1)
+        queue.add(src2, dst2, queue.MOVE)
+        queue.add(self.src, self.dst + "2")
+
+        self.connect(queue)
+        queue.start()
+        self.wait(queue)
+
+        self.assertTrue(isinstance(self.results.get("failed"), IOError))
+        self.assertFalse(os.path.exists(os.path.dirname(self.dst)))
+        self.assertFiles(self.src)
+        self.assertFiles(src2)
+
+    def test_make_dirs(self):
+        """
+        Test creating the directories for a path without a parent.
+        """
+        queue = studiolibrary.FileQueue()
+
+        path = self.tempDir + "/dst/a/b"
+        queue.makeDirs(path)
+
+        self.assertTrue(os.path.isdir(path))
+        self.assertRaises(studiolibrary.MovePathError, queue.makeDirs, "")
+
+        queue.rollback()
+        self.assertFalse(os.path.exists(self.tempDir + "/dst"))
+
+    def test_link_per_job(self):
+        """
+        Test that only the jobs added with a link flag are linked.
+        """
+        queue = studiolibrary.FileQueue()
+        queue.add(self.src, self.dst, link=True)
+        queue.add(self.src, self.dst + "2")
+
+        self.connect(queue)
+        queue.start()
+        self.wait(queue)
+
+        self.assertFiles(self.dst)
+        self.assertFiles(self.dst + "2")
+        self.assertEqual(3, sum(queue.linkStats().values()))
+
+    def test_link_devices(self):
+        """
+        Test the reflink support is remembered for the devices.
+        """
+        queue = studiolibrary.FileQueue()
+        queue.add(self.src, self.dst, link=True)
+
+        self.connect(queue)
+        queue.start()
+        self.wait(queue)
+
+        device = os.stat(self.src).st_dev
+        supported = studiolibrary.cmds._reflinkDevices[(device, device)]
+        strategies = queue.linkStats()
+
+        self.assertEqual(supported, studiolibrary.LINK_REFLINK in strategies)
+        self.assertEqual(3, sum(strategies.values()))
+
+    def test_link_unique_file(self):
+        """
+        Test linking a file over the placeholder of a unique path.
+        """
+        self.assertFalse(studiolibrary.isHardlinkPath("sequence/image.jpg"))
+
+        src = os.path.join(self.src, "thumbnail.jpg")
+        dst = self.tempDir + "/dst/thumbnail.jpg"
+
+        os.makedirs(os.path.dirname(dst))
+        open(dst, "wb").close()
+
+        enabled = studiolibrary.cmds.HARDLINK_ENABLED
+        patterns = studiolibrary.cmds.HARDLINK_PATTERNS
+
+        studiolibrary.cmds.HARDLINK_ENABLED = True
+        studiolibrary.cmds.HARDLINK_PATTERNS = ["*.jpg"]
+
+        try:
+            queue = studiolibrary.FileQueue()
+            queue.add(src, dst, unique=True, link=True)
+
+            self.connect(queue)
+            queue.start()
+            self.wait(queue)
+        finally:
+            studiolibrary.cmds.HARDLINK_ENABLED = enabled
+            studiolibrary.cmds.HARDLINK_PATTERNS = patterns
+
+        path = self.results["finished"][0][2]
+        strategies = queue.linkStats()
+
+        self.assertNotEqual(dst, path)
+        self.assertFalse(studiolibrary.LINK_COPY in strategies)
+
+        with open(path, "rb") as f:
+            self.assertEqual(self.files["thumbnail.jpg"], f.read())
+
+
+def testSuite():
+    """
+    Return the test suite for this module.
+
+    :rtype: unittest.TestSuite
+    """
+    suite = unittest.TestSuite()
+    s = unittest.makeSuite(TestFileQueue, 'test')
+    suite.addTest(s)
+    return suite
+
+
+def run():
+    """
+    Call from within Maya to run all valid tests.
+
+    Example:
+
+        import studiolibrary.tests.test_filequeue
+        reload(studiolibrary.tests.test_filequeue)
+        studiolibrary.tests.test_filequeue.run()
+    """
+    tests = unittest.TextTestRunner()
+    tests.run(testSuite())